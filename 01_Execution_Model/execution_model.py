@@ -5,36 +5,49 @@ Demonstrates:
   • Top-to-bottom execution (rerun on every interaction)
   • st.rerun()  → programmatic rerun
   • @st.fragment → independent partial reruns
+  • common.profiler → what each rerun costs, per section and per fragment
+  • common.fragment_scheduler → live tiles on st.fragment(run_every=…) with adaptive polling
 """
 
-import streamlit as st
+import math
+import sys
 import time
 from datetime import datetime
+from pathlib import Path
+
+import streamlit as st
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root → `common`
+from common.fragment_scheduler import get_scheduler
+from common.profiler import begin_rerun, profiled, render_panel, section
 
 st.set_page_config(page_title="Topic 01 · Execution Model", page_icon="⚡")
+begin_rerun()
 st.title("⚡ Topic 01 — Execution Model & Performance")
 
 # ── 1. Top-to-bottom Execution ──────────────────────────────────────────────
-st.header("1 · Top-to-bottom Execution")
-st.info("Every time you interact with any widget, the **entire** script reruns from top to bottom.")
+with section("1 · Top-to-bottom"):
+    st.header("1 · Top-to-bottom Execution")
+    st.info("Every time you interact with any widget, the **entire** script reruns from top to bottom.")
 
-# This timestamp changes on every rerun, proving the full re-execution
-st.write(f"🕐 Script last ran at: **{datetime.now().strftime('%H:%M:%S.%f')[:-3]}**")
+    # This timestamp changes on every rerun, proving the full re-execution
+    st.write(f"🕐 Script last ran at: **{datetime.now().strftime('%H:%M:%S.%f')[:-3]}**")
 
-if "rerun_count" not in st.session_state:
-    st.session_state.rerun_count = 0
-st.session_state.rerun_count += 1
-st.metric("Total Reruns (this session)", st.session_state.rerun_count)
+    if "rerun_count" not in st.session_state:
+        st.session_state.rerun_count = 0
+    st.session_state.rerun_count += 1
+    st.metric("Total Reruns (this session)", st.session_state.rerun_count)
 
 st.markdown("---")
 
 # ── 2. st.rerun() ───────────────────────────────────────────────────────────
-st.header("2 · `st.rerun()`")
-st.write("Click the button below to force a **programmatic rerun**.")
+with section("2 · st.rerun()"):
+    st.header("2 · `st.rerun()`")
+    st.write("Click the button below to force a **programmatic rerun**.")
 
-if st.button("🔄 Force Rerun"):
-    st.session_state.rerun_count += 1  # will be counted again on rerun
-    st.rerun()
+    if st.button("🔄 Force Rerun"):
+        st.session_state.rerun_count += 1  # will be counted again on rerun
+        st.rerun()
 
 st.markdown("---")
 
@@ -48,6 +61,7 @@ st.write(
 
 
 @st.fragment
+@profiled("3 · live_fragment")
 def live_fragment():
     """This block reruns on its own when widgets inside it change."""
     st.subheader("🧩 Fragment Section")
@@ -58,5 +72,59 @@ def live_fragment():
 
 live_fragment()
 
+st.markdown("---")
+
+# ── 4. Live tiles with an adaptive scheduler ────────────────────────────────
+st.header("4 · Live Tiles — `st.fragment(run_every=…)`")
+st.write(
+    "These tiles poll their data sources **without rerunning the script** (watch the "
+    "timestamp in section 1). One ticking fragment serves all of them; a tile whose "
+    "data hasn't changed backs off its polling interval, and tightens again as soon "
+    "as it changes. The fragment ticks at the shortest interval, so it only slows "
+    "down once every tile has backed off."
+)
+
+
+def poll_active_users() -> int:
+    """Changes on every poll."""
+    return int(1200 + 80 * math.sin(time.time() / 7) + (time.time() * 13) % 17)
+
+
+def poll_queue_depth() -> int:
+    """Changes every 20 seconds."""
+    return int(time.time() // 20) % 7 * 3
+
+
+def poll_deploy_status() -> str:
+    """Never changes."""
+    return "✅ healthy"
+
+
+scheduler = get_scheduler("execution_model_tiles", tick=1.0)
+scheduler.register(
+    "users", poll=poll_active_users, render=lambda v: st.metric("Active Users", f"{v:,}"),
+    max_interval=4,
+)
+scheduler.register(
+    "queue", poll=poll_queue_depth, render=lambda v: st.metric("Queue Depth", v),
+    max_interval=16,
+)
+scheduler.register(
+    "deploy", poll=poll_deploy_status, render=lambda v: st.metric("Deploy", v),
+    max_interval=32,
+)
+scheduler.run()
+
+st.markdown("---")
+
+# ── 5. Profiling reruns ─────────────────────────────────────────────────────
+st.header("5 · What does a rerun cost?")
+st.write(
+    "Each section above is wrapped in `common.profiler.section()` and the fragment in "
+    "`@profiled`. Wall time, CPU time and allocations are kept per session; open the "
+    "panel for p50/p95 per section, a histogram, and a JSON-lines export."
+)
+render_panel()
+
 st.markdown("---")
 st.caption("End of Topic 01 · Execution Model & Performance")
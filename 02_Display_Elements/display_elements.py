@@ -5,15 +5,33 @@ Demonstrates:
   • st.write()
   • st.title(), st.header(), st.subheader()
   • st.markdown()
-  • st.dataframe()
+  • st.dataframe(), and common.paged_grid for tables too big to send whole
   • st.metric()
   • st.json()
-  • st.plotly_chart() / st.altair_chart()
+  • st.plotly_chart() / st.altair_chart(), in common.lazy_tabs (only the open tab runs)
+  • common.memo.memo_section → heavy objects rebuilt only when their inputs change
+  • common.metrics → KPI cards served from pre-aggregated, incrementally updated totals
+  • common.large_charts → big scatters sampled or binned server-side, specs cached
+  • common.plotly_cache → each distinct Plotly figure built once per process
 """
 
+import sys
+import time
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root → `common`
+from common.large_charts import scatter_spec
+from common.lazy_import import lazy_import
+from common.lazy_tabs import lazy_tabs
+from common.memo import memo_section
+from common.metrics import metric_card
+from common.paged_grid import PagedTable, paged_dataframe
+from common.plotly_cache import cached_figure
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 st.set_page_config(page_title="Topic 02 · Display Elements", page_icon="📄", layout="wide")
 st.title("📄 Topic 02 — Display Elements")
@@ -59,20 +77,51 @@ st.markdown("---")
 
 # ── 4. st.dataframe() ───────────────────────────────────────────────────────
 st.header("4 · `st.dataframe()` — Interactive Table")
-df = pd.DataFrame(
-    np.random.randn(10, 4),
-    columns=["Revenue", "Profit", "Users", "Growth"],
+# Built once per session; unrelated widget interactions reuse the same frame.
+df = memo_section(
+    "random_kpis",
+    build=lambda: pd.DataFrame(
+        np.random.randn(10, 4),
+        columns=["Revenue", "Profit", "Users", "Growth"],
+    ),
 )
 st.dataframe(df, use_container_width=True)
 
+st.subheader("Large tables — server-side pages")
+st.write(
+    "`st.dataframe` sends every cell to the browser. `paged_dataframe` keeps the "
+    "frame in Python and sends one page; sorting uses a cached per-column index "
+    "and filtering runs in Arrow, so turning a page only reruns the grid."
+)
+
+
+@st.cache_resource
+def large_table() -> PagedTable:
+    """1M demo orders, converted to Arrow once per process and shared by every session."""
+    return PagedTable.from_pandas(
+        pd.DataFrame(
+            {
+                "order_id": np.arange(1_000_000),
+                "region": np.random.choice(["North", "South", "East", "West"], 1_000_000),
+                "amount": np.random.gamma(2.0, 40.0, 1_000_000).round(2),
+                "units": np.random.randint(1, 20, 1_000_000),
+            }
+        )
+    )
+
+
+paged_dataframe(large_table(), key="large_table")
+
 st.markdown("---")
 
 # ── 5. st.metric() ──────────────────────────────────────────────────────────
 st.header("5 · `st.metric()` — KPI Cards")
+# Values come from the shared KPI store: 30-day windows vs. the 30 days before,
+# aggregated once per process and read in O(1) on every rerun.
 col1, col2, col3 = st.columns(3)
-col1.metric("Total Revenue", "$12,450", "+8.2%")
-col2.metric("Active Users", "1,284", "-3.1%")
-col3.metric("Conversion", "4.7%", "+0.5%")
+metric_card("revenue", label="Total Revenue", container=col1)
+metric_card("users", label="Active Users", container=col2)
+metric_card("conversion", container=col3)
 
 st.markdown("---")
 
@@ -92,40 +141,83 @@ st.markdown("---")
 # ── 7. Charts ────────────────────────────────────────────────────────────────
 st.header("7 · Interactive Charts")
 
-tab1, tab2 = st.tabs(["📊 Plotly Chart", "📈 Altair Chart"])
 
-with tab1:
+MONTHLY_SALES = {"Jan": 120, "Feb": 200, "Mar": 150, "Apr": 250, "May": 180}
+
+
+def build_sales_bar(sales, *, title, color, template):
+    import plotly.express as px
+
+    fig = px.bar(
+        x=list(sales),
+        y=list(sales.values()),
+        labels={"x": "Month", "y": "Sales ($)"},
+        title=title,
+        color_discrete_sequence=[color],
+    )
+    fig.update_layout(template=template)
+    return fig
+
+
+def build_random_scatter(points: int) -> pd.DataFrame:
+    rng = np.random.default_rng(points)  # Seeded: the same size is the same data (and cache key)
+    return pd.DataFrame({"x": rng.standard_normal(points), "y": rng.standard_normal(points)})
+
+
+@st.cache_resource(max_entries=2)
+def random_scatter_source(points: int) -> pd.DataFrame:
+    # One frame per size for the whole process, not per session: up to 10M rows, only ever read.
+    return build_random_scatter(points)
+
+
+def sales_bar_figure():
+    # Built once per process for this data + styling, shared by all sessions.
+    return cached_figure("sales_bar", build_sales_bar, MONTHLY_SALES,
+                         title="Monthly Sales — Plotly", color="#7c5cfc", template="plotly_dark")
+
+
+def random_scatter_spec(source: pd.DataFrame, points: int):
+    # Large inputs are sampled or binned on the server; the spec and its Arrow
+    # payload are built once per (data, encoding) and reused on every rerun.
+    return scatter_spec(source, "x", "y", title="Random Scatter — Altair", data_key=("random_scatter", points))
+
+
+def plotly_tab():
     try:
-        import plotly.express as px
-
-        fig = px.bar(
-            x=["Jan", "Feb", "Mar", "Apr", "May"],
-            y=[120, 200, 150, 250, 180],
-            labels={"x": "Month", "y": "Sales ($)"},
-            title="Monthly Sales — Plotly",
-            color_discrete_sequence=["#7c5cfc"],
-        )
-        fig.update_layout(template="plotly_dark")
-        st.plotly_chart(fig, use_container_width=True)
+        sales_bar = sales_bar_figure()
+        st.plotly_chart(sales_bar.figure, use_container_width=True)
     except ImportError:
         st.warning("Install plotly: `pip install plotly`")
 
-with tab2:
-    try:
-        import altair as alt
 
-        source = pd.DataFrame(
-            {"x": np.random.randn(200), "y": np.random.randn(200)}
-        )
-        chart = (
-            alt.Chart(source)
-            .mark_circle(size=60, opacity=0.6)
-            .encode(x="x", y="y", color=alt.value("#00e5a0"))
-            .properties(title="Random Scatter — Altair", width="container", height=350)
+def altair_tab():
+    points = st.select_slider("Points", [200, 50_000, 1_000_000, 10_000_000], value=200,
+                              format_func=lambda n: f"{n:,}")
+    source = random_scatter_source(points)
+    try:
+        start = time.perf_counter()
+        spec, payload = random_scatter_spec(source, points)
+        elapsed = time.perf_counter() - start
+        st.vega_lite_chart(spec, use_container_width=True)
+        st.caption(
+            f"{payload.rows:,} points → {payload.mode} ({len(payload.frame):,} rows, "
+            f"{len(payload.arrow) / 1024:,.0f} KiB) · {elapsed * 1000:.1f} ms this run"
         )
-        st.altair_chart(chart, use_container_width=True)
     except ImportError:
         st.warning("Install altair: `pip install altair`")
 
+
+# Only the open tab runs, chart library import included. Once the visitor
+# interacts with the page, the other tab is warmed on a background thread so
+# switching to it doesn't pay the import either; a cold load never does.
+lazy_tabs(
+    {"📊 Plotly Chart": plotly_tab, "📈 Altair Chart": altair_tab},
+    key="chart_tabs",
+    prefetch={
+        "📊 Plotly Chart": sales_bar_figure,
+        "📈 Altair Chart": lambda: random_scatter_spec(build_random_scatter(200), 200),
+    },
+)
+
 st.markdown("---")
 st.caption("End of Topic 02 · Display Elements")
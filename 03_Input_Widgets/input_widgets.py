@@ -5,14 +5,31 @@ Demonstrates:
   • st.text_input(), st.text_area()
   • st.selectbox(), st.multiselect()
   • st.slider(), st.number_input()
-  • st.file_uploader()
+  • st.file_uploader() with chunked, streaming CSV ingest
   • st.button()
   • st.download_button()
   • st.chat_input()
 """
 
+import sys
+import time
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root → `common`
+from common.csv_ingest import (
+    CsvIngest,
+    IngestResult,
+    iter_csv_chunks,
+    load_parsed,
+    parse_key,
+    store_parsed,
+)
+from common.lazy_import import lazy_import
+from common.paged_grid import paged_dataframe
+
+pd = lazy_import("pandas")
 
 st.set_page_config(page_title="Topic 03 · Input Widgets", page_icon="🎛️")
 st.title("🎛️ Topic 03 — Input Widgets")
@@ -73,10 +90,58 @@ st.markdown("---")
 st.header("4 · `st.file_uploader()`")
 
 uploaded = st.file_uploader("Upload a CSV file", type=["csv"])
+keep_label = st.radio(
+    "Keep in memory",
+    ["Sample (10,000 rows)", "Aggregates only", "Everything"],
+    horizontal=True,
+    help="Large files are read in chunks either way; only 'Everything' holds all rows.",
+)
+keep = {"Sample (10,000 rows)": "sample", "Aggregates only": "aggregate", "Everything": "all"}[keep_label]
+
 if uploaded is not None:
-    df = pd.read_csv(uploaded)
-    st.write(f"📄 **{uploaded.name}** — {df.shape[0]} rows × {df.shape[1]} cols")
-    st.dataframe(df.head(), use_container_width=True)
+    # Reruns reuse this session's result; a new upload first checks the parse
+    # cache, keyed by the file's content hash + options (shared by all users).
+    ingest_key = (uploaded.file_id, keep)
+    result = st.session_state.get("csv_ingest")
+    if result is None or result[0] != ingest_key:
+        cache_key = parse_key(uploaded.getbuffer(), keep=keep, sample_rows=10_000)
+        ingested = load_parsed(cache_key)
+        if ingested is None:
+            head_slot = st.empty()
+            with st.status(f"Reading **{uploaded.name}** in chunks…", expanded=True) as status:
+                progress = st.progress(0.0)
+                stats_slot = st.empty()
+                ingest = CsvIngest(keep=keep, sample_rows=10_000)
+                last_paint = 0.0
+                for chunk, fraction in iter_csv_chunks(uploaded, chunk_rows=100_000):
+                    ingest.add(chunk)
+                    if ingest.chunks == 1:
+                        head_slot.dataframe(ingest.head, use_container_width=True)  # Head right away
+                    if time.perf_counter() - last_paint > 0.25 or fraction >= 1.0:
+                        progress.progress(fraction, text=f"{ingest.rows:,} rows · {fraction:.0%} of {uploaded.size / 2**20:,.1f} MB")
+                        stats_slot.dataframe(ingest.stats(), hide_index=True, use_container_width=True)
+                        last_paint = time.perf_counter()
+                status.update(
+                    label=f"Read {ingest.rows:,} rows in {ingest.chunks} chunks ({ingest.seconds:.1f}s)",
+                    state="complete",
+                    expanded=False,
+                )
+            head_slot.empty()
+            ingested = store_parsed(cache_key, IngestResult.from_ingest(ingest))
+        result = (ingest_key, ingested, cache_key)
+        st.session_state.csv_ingest = result
+    ingested, table_key = result[1], result[2]
+
+    st.write(f"📄 **{uploaded.name}** — {ingested.rows:,} rows × {ingested.columns} cols")
+    # Kept rows stay server-side; the grid sends one sortable, filterable page.
+    paged_dataframe(ingested.frame if ingested.frame is not None else ingested.head, key="upload_grid",
+                    table_key=table_key)
+    with st.expander("Column stats"):
+        st.dataframe(ingested.stats, hide_index=True, use_container_width=True)
+    if ingested.cached:
+        st.caption(f"⚡ Same file parsed before — loaded from the parse cache in {ingested.seconds * 1000:.0f} ms.")
+    if ingested.frame is not None and ingested.keep == "sample":
+        st.caption(f"Holding a uniform sample of {len(ingested.frame):,} rows in memory.")
 
 st.markdown("---")
 
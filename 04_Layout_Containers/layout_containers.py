@@ -4,14 +4,28 @@ Topic 04 — Layout & Containers
 Demonstrates:
   • st.sidebar
   • st.columns()
-  • st.tabs()
+  • st.tabs(), in common.lazy_tabs (only the open tab runs)
   • st.expander()
   • st.container(), st.empty()
   • @st.dialog
+  • common.downsample → charts get only the points their pixels can show
+  • common.metrics → KPI cards served from pre-aggregated, incrementally updated totals
 """
 
-import streamlit as st
+import sys
 import time
+from pathlib import Path
+
+import streamlit as st
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root → `common`
+from common.downsample import downsample_frame
+from common.lazy_import import lazy_import
+from common.lazy_tabs import lazy_tabs
+from common.metrics import metric_card
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 st.set_page_config(page_title="Topic 04 · Layout & Containers", page_icon="🗂️", layout="wide")
 st.title("🗂️ Topic 04 — Layout & Containers")
@@ -28,34 +42,53 @@ st.header("1 · `st.columns()` — Side-by-Side Layout")
 col1, col2, col3 = st.columns(3)
 with col1:
     st.subheader("📊 Column 1")
-    st.metric("Revenue", "$10,200", "+12%")
+    metric_card("revenue")
 with col2:
     st.subheader("👥 Column 2")
-    st.metric("Users", "3,452", "+5%")
+    metric_card("users")
 with col3:
     st.subheader("⚡ Column 3")
-    st.metric("Uptime", "99.9%", "+0.1%")
+    metric_card("uptime")
 
 st.markdown("---")
 
 # ── 3. Tabs ─────────────────────────────────────────────────────────────────
 st.header("2 · `st.tabs()` — Tab Panels")
 
-tab1, tab2, tab3 = st.tabs(["🏠 Overview", "📈 Analytics", "⚙️ Settings"])
 
-with tab1:
+def overview_tab():
     st.subheader("Overview")
     st.write("Welcome to the overview panel. This is the default landing tab.")
 
-with tab2:
+
+@st.cache_resource
+def analytics_chart():
+    """500k per-minute readings, downsampled once per process and shared by every session."""
+    rng = np.random.default_rng(4)
+    series = pd.DataFrame(
+        {"data": np.cumsum(rng.standard_normal(500_000)) + 50},
+        index=pd.date_range("2025-01-01", periods=500_000, freq="min"),
+    )
+    # 500k points would all be serialized; ~2 per pixel column is all a chart can show.
+    return downsample_frame(series, width_px=1200)
+
+
+def analytics_tab():
     st.subheader("Analytics")
     st.write("Charts and analytics would go here.")
-    st.line_chart({"data": [10, 30, 20, 50, 40, 60, 55]})
+    st.line_chart(analytics_chart())
 
-with tab3:
+
+def settings_tab():
     st.subheader("Settings")
-    st.toggle("Enable notifications", value=True)
-    st.toggle("Dark mode", value=False)
+    # A closed tab's widgets aren't rendered, so their values are kept outside widget state.
+    for label, name, default in (("Enable notifications", "notifications", True), ("Dark mode", "dark_mode", False)):
+        st.session_state[name] = st.toggle(label, value=st.session_state.get(name, default))
+
+
+# Only the selected tab's body runs; the 500k-point series isn't built until Analytics is opened.
+lazy_tabs({"🏠 Overview": overview_tab, "📈 Analytics": analytics_tab, "⚙️ Settings": settings_tab},
+          key="panel_tabs")
 
 st.markdown("---")
 
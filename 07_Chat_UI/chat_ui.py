@@ -4,12 +4,21 @@ Topic 07 — Chat UI
 Demonstrates:
   • st.chat_message() → chat bubble container
   • st.chat_input()   → sticky chat input widget
+  • st.write_stream()  → token-by-token replies from a generator backend
   
 Implements a simple echo-bot that stores conversation history in session state.
 """
 
+import sys
+from pathlib import Path
+
 import streamlit as st
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root → `common`
+from common.chat_history import render_history
+from common.llm_backend import FakeLLM, stream_reply
+from common.message_store import MessageStore
+
 st.set_page_config(page_title="Topic 07 · Chat UI", page_icon="💬")
 st.title("💬 Topic 07 — Chat UI")
 
@@ -22,14 +31,13 @@ st.markdown("---")
 
 # ── Initialize chat history ─────────────────────────────────────────────────
 if "messages" not in st.session_state:
-    st.session_state.messages = [
+    st.session_state.messages = MessageStore([
         {"role": "assistant", "content": "Hi there! 👋 I'm an echo bot. Type anything and I'll repeat it back!"}
-    ]
+    ])
 
 # ── Display chat history ────────────────────────────────────────────────────
-for msg in st.session_state.messages:
-    with st.chat_message(msg["role"]):
-        st.markdown(msg["content"])
+# Only the latest messages are live bubbles; older ones load on demand.
+render_history(st.session_state.messages)
 
 # ── Handle new user input ───────────────────────────────────────────────────
 prompt = st.chat_input("Type your message…")
@@ -40,8 +48,12 @@ if prompt:
         st.markdown(prompt)
     st.session_state.messages.append({"role": "user", "content": prompt})
 
-    # Echo-bot response
-    response = f"🔁 You said: **{prompt}**"
+    # Echo-bot response, streamed token by token like a real model would
+    echo_bot = FakeLLM(lambda p: f"🔁 You said: **{p}**", first_token_latency=0.2)
     with st.chat_message("assistant"):
-        st.markdown(response)
+        response = stream_reply(echo_bot, prompt, st.session_state.messages)
+        metrics = st.session_state.response_metrics[-1]
+        st.caption(
+            f"TTFT {metrics['ttft_s'] * 1000:.0f} ms · {metrics['tokens_per_s']:.1f} tokens/s"
+        )
     st.session_state.messages.append({"role": "assistant", "content": response})
@@ -2,9 +2,37 @@
 Topic 85 — Multipage Apps · Analytics Page
 """
 
+import sys
+import time
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root → `common`
+from common.downsample import downsample_frame
+from common.lazy_import import lazy_import
+from common.metrics import demo_orders, metric_card, metrics_engine
+from common.stream_buffer import SeriesRing, live_line_chart
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+CHART_WIDTH_PX = 800  # Centered layout; sets how many points are worth sending
+FEED_WINDOW = 600  # Points kept (and charted) per live feed
+
+
+@st.cache_resource(show_spinner="Loading trend data…")
+def load_trend():
+    """~2M per-minute readings per product, shared by every session."""
+    rng = np.random.default_rng(85)
+    index = pd.date_range("2022-01-01", periods=2_000_000, freq="min")
+    steps = rng.standard_normal((len(index), 3)) * 0.05
+    daily = np.sin(np.arange(len(index)) * 2 * np.pi / 1440)[:, None] * [0.5, 0.8, 0.3]
+    return pd.DataFrame(
+        np.cumsum(steps, axis=0) + daily + [10, 20, 15],
+        index=index,
+        columns=["Product A", "Product B", "Product C"],
+    )
 
 st.title("📈 Analytics Page")
 st.write("This is a separate page in the multipage app. Each page runs independently.")
@@ -14,19 +42,72 @@ st.markdown("---")
 # Sample analytics dashboard
 st.subheader("Monthly Performance")
 
+engine = metrics_engine()
 col1, col2, col3 = st.columns(3)
-col1.metric("Revenue", "$8,420", "+12.3%")
-col2.metric("Users", "2,150", "+7.8%")
-col3.metric("Retention", "68%", "-2.1%")
+metric_card("revenue", engine=engine, container=col1)
+metric_card("users", engine=engine, container=col2)
+metric_card("retention", engine=engine, container=col3)
+
+# New events are folded into the running totals; no card rescans the table.
+if st.button("➕ Ingest 1,000 new orders"):
+    batch = demo_orders(1_000, end=pd.Timestamp.now(), days=1, seed=engine.rows("orders"))
+    start = time.perf_counter()
+    engine.ingest("orders", batch)
+    st.session_state.last_ingest_ms = (time.perf_counter() - start) * 1000
+    st.rerun()
+if "last_ingest_ms" in st.session_state:
+    st.caption(f"{engine.rows('orders'):,} orders aggregated · last batch folded in "
+               f"{st.session_state.last_ingest_ms:.1f} ms")
 
 st.markdown("---")
 
 st.subheader("Trend Chart")
-chart_data = pd.DataFrame(
-    np.random.randn(30, 3) + [10, 20, 15],
-    columns=["Product A", "Product B", "Product C"],
+trend = load_trend()
+first, last = trend.index[0].to_pydatetime(), trend.index[-1].to_pydatetime()
+zoom = st.slider("Zoom", first, last, (first, last), format="YYYY-MM-DD HH:mm")
+method = st.radio("Downsampling", ["minmax", "lttb"], horizontal=True,
+                  format_func={"minmax": "Min/Max per pixel", "lttb": "LTTB"}.get)
+
+# Only what fits the chart's pixels is sent; cached per zoom range + method.
+start = time.perf_counter()
+chart_data = downsample_frame(
+    trend, width_px=CHART_WIDTH_PX, method=method, x_range=zoom, series_key="trend"
 )
+elapsed = time.perf_counter() - start
 st.line_chart(chart_data)
+in_range = trend.index.searchsorted(zoom[1], "right") - trend.index.searchsorted(zoom[0])
+st.caption(
+    f"{in_range * trend.shape[1]:,} points in range → {chart_data.size:,} sent "
+    f"({elapsed * 1000:.1f} ms)"
+)
+
+st.markdown("---")
+
+st.subheader("Live Feed")
+
+
+def poll_feed(ring: SeriesRing, hz: float) -> None:
+    """Simulated sensor: one random-walk reading per product every 1/hz seconds since the last one."""
+    now = np.datetime64(time.time_ns(), "ns")
+    step = np.timedelta64(int(1e9 / hz), "ns")
+    last, last_values = ring.last() or (now - FEED_WINDOW * step, np.array([10.0, 20.0, 15.0]))
+    count = int((now - last) // step)
+    if count <= 0:
+        return
+    ts = last + step * np.arange(1, count + 1)
+    ring.extend(ts, last_values + np.cumsum(np.random.standard_normal((count, 3)) * 0.05, axis=0))
+
+
+feed_col, live_col = st.columns([3, 1])
+hz = feed_col.radio("Update rate", [1.0, 10.0], horizontal=True, format_func=lambda r: f"{r:g} Hz")
+live = live_col.toggle("Live", value=False)
+# One ring per session and rate; each tick sends the bounded window, not the whole history.
+if st.session_state.get("feed_hz") != hz:
+    st.session_state.feed_hz = hz
+    st.session_state.feed = SeriesRing(["Product A", "Product B", "Product C"], FEED_WINDOW)
+    poll_feed(st.session_state.feed, hz)
+live_line_chart(st.session_state.feed, lambda ring: poll_feed(ring, hz),
+                key="feed_stats", interval=1 / hz, live=live)
 
 st.markdown("---")
 st.caption("Topic 85 · Analytics Page — Multipage Demo")
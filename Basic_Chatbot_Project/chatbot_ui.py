@@ -1,5 +1,16 @@
-import streamlit as st
+import sys
 import uuid
+from pathlib import Path
+
+import streamlit as st
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root → `common`
+from common.chat_history import render_history, reset_history
+from common.context_window import context_for, reset_context
+from common.llm_backend import FakeLLM, stream_reply
+from common.response_cache import ResponseCache, conversation_hash
+from common.thread_store import PersistentThread, ThreadDeletedError, ThreadStore, ThreadWriteError
+from common.tiered_cache import DEFAULT_CACHE_ROOT
 
 # --- PAGE CONFIG ---
 st.set_page_config(
@@ -23,12 +34,72 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# --- SESSION STATE INITIALIZATION ---
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+# --- PERSISTENT THREADS ---
+@st.cache_resource
+def get_thread_store():
+    """One SQLite (WAL) thread log shared by every session of this app."""
+    return ThreadStore(DEFAULT_CACHE_ROOT / "chat_threads.db")
+
+
+@st.cache_resource
+def get_response_cache():
+    """Replies shared by all sessions, keyed by model + conversation + normalized prompt."""
+    return ResponseCache(max_entries=2048, ttl=3600)
+
+
+def browser_owner():
+    """This browser's owner key; only threads started under it are listed or opened."""
+    # Kept in the URL next to ?thread=, so a reload or reconnect keeps its chats
+    if "owner" not in st.session_state:
+        st.session_state.owner = st.query_params.get("owner") or uuid.uuid4().hex
+        st.query_params["owner"] = st.session_state.owner
+    return st.session_state.owner
+
+
+def open_thread(thread_id):
+    """Switch this session to `thread_id`; only its most recent page is read."""
+    store, owner = get_thread_store(), browser_owner()
+    # Stale ?thread= link, or someone else's thread: start over
+    if store.is_deleted(thread_id) or not store.can_access(thread_id, owner):
+        thread_id = str(uuid.uuid4())
+    st.session_state.session_id = thread_id
+    st.session_state.messages = PersistentThread(store, thread_id, owner=owner)
+    st.query_params["thread"] = thread_id  # A reload or reconnect reopens this thread
+    reset_history()
+    reset_context()
+    st.session_state.pop("last_context", None)
+
+
+def save_message(message):
+    """Append `message` to this session's thread."""
+    try:
+        st.session_state.messages.append(message)
+    except ThreadDeletedError:  # Deleted from another tab: carry on in a new thread
+        open_thread(str(uuid.uuid4()))
+        st.session_state.messages.append(message)
+    except ThreadWriteError:  # Earlier messages weren't saved: reload what was, then carry on
+        open_thread(st.session_state.session_id)
+        st.warning("Some earlier messages in this chat couldn't be saved.")
+        st.session_state.messages.append(message)
+
+
+# Context budget (tokens) per model. Scaled down from the real context sizes
+# so the sliding window and rolling summary are visible in a short demo.
+CONTEXT_BUDGETS = {
+    "GPT-5.3 Codex": 2048,
+    "Claude 4.5 Sonnet": 2048,
+    "Gemini 3.6 Pro": 4096,
+    "Llama 4 Maverick": 1024,
+    "DeepSeek R1": 1024,
+    "Grok 4.20": 1536,
+}
 
+# --- SESSION STATE INITIALIZATION ---
 if "session_id" not in st.session_state:
-    st.session_state.session_id = str(uuid.uuid4())
+    open_thread(st.query_params.get("thread") or str(uuid.uuid4()))
+
+if "response_metrics" not in st.session_state:
+    st.session_state.response_metrics = []
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -38,16 +109,49 @@ with st.sidebar:
     # LLM Selection
     llm_choice = st.selectbox(
         "Choose LLM Model",
-        options=[
-            "GPT-5.3 Codex", 
-            "Claude 4.5 Sonnet", 
-            "Gemini 3.6 Pro", 
-            "Llama 4 Maverick", 
-            "DeepSeek R1", 
-            "Grok 4.20"
-        ],
+        options=list(CONTEXT_BUDGETS),
         help="Select the latest AI brain for this conversation."
     )
+
+    # Simulated backend latency (stand-in until a real model is wired up)
+    with st.expander("⏱ Backend latency"):
+        first_token_ms = st.slider("First token (ms)", 0, 2000, 350, step=50)
+        token_ms = st.slider("Per token (ms)", 0, 200, 30, step=5)
+
+    # Response cache: exact prompt matches, optionally near-duplicates too
+    with st.expander("⚡ Response cache"):
+        match_similar = st.toggle(
+            "Also match similar prompts",
+            help="Character n-gram cosine similarity against cached prompts "
+                 "with the same model and conversation.",
+        )
+        # Per session: passed to each lookup, the shared cache itself is not changed
+        threshold = st.slider("Similarity threshold", 0.5, 0.99, 0.8, step=0.01,
+                              disabled=not match_similar, key="cache_threshold")
+        cache_stats = get_response_cache().stats()
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Hit rate", f"{cache_stats.hit_rate:.0%}")
+        c2.metric("Exact", cache_stats.exact_hits)
+        c3.metric("Similar", cache_stats.similar_hits)
+        st.caption(f"{cache_stats.misses} misses · {cache_stats.entries} cached replies")
+
+    if st.session_state.response_metrics:
+        last = st.session_state.response_metrics[-1]
+        m1, m2 = st.columns(2)
+        m1.metric("Time to first token", f"{last['ttft_s'] * 1000:.0f} ms")
+        m2.metric("Tokens / sec", f"{last['tokens_per_s']:.1f}")
+
+    if "last_context" in st.session_state:
+        ctx = st.session_state.last_context
+        st.progress(
+            min(ctx.tokens / ctx.budget, 1.0),
+            text=f"Context: {ctx.tokens:,} / {ctx.budget:,} tokens · {ctx.window} messages",
+        )
+        if ctx.summarized or ctx.pending:
+            st.caption(
+                f"{ctx.summarized} earlier messages summarized"
+                + (f" ({ctx.pending} still being summarized)" if ctx.pending else "")
+            )
     
     st.divider()
     
@@ -55,15 +159,35 @@ with st.sidebar:
     col1, col2 = st.columns(2)
     with col1:
         if st.button("➕ New Chat", use_container_width=True):
-            st.session_state.messages = []
-            st.session_state.session_id = str(uuid.uuid4())
+            open_thread(str(uuid.uuid4()))
+            st.session_state.response_metrics = []
             st.rerun()
             
     with col2:
         if st.button("🗑️ Delete Chat", use_container_width=True):
-            st.session_state.messages = []
+            get_thread_store().delete(st.session_state.session_id, owner=browser_owner())
+            open_thread(str(uuid.uuid4()))
+            st.session_state.response_metrics = []
             st.warning("Chat history cleared.")
             st.rerun()
+
+    # This browser's recent threads (survive browser disconnects and server-side session loss)
+    recent = [
+        t for t in get_thread_store().recent_threads(browser_owner(), limit=8)
+        if t.thread_id != st.session_state.session_id
+    ]
+    if recent:
+        st.subheader("🕘 Recent chats")
+        for thread in recent:
+            label = thread.title or "Untitled chat"
+            if st.button(
+                f"{label[:32]}{'…' if len(label) > 32 else ''} · {thread.message_count}",
+                key=f"thread_{thread.thread_id}",
+                use_container_width=True,
+            ):
+                open_thread(thread.thread_id)
+                st.session_state.response_metrics = []
+                st.rerun()
             
     st.divider()
     st.caption(f"Session ID: {st.session_state.session_id[:8]}")
@@ -73,10 +197,8 @@ with st.sidebar:
 st.title("🤖 Pro-Chat AI")
 st.markdown("---")
 
-# Display chat history
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
+# Display chat history (recent messages live, older ones paged in on demand)
+render_history(st.session_state.messages)
 
 # Bottom sticky input area
 # Note: st.chat_input is the modern, premium way for chatbot inputs in Streamlit
@@ -86,15 +208,45 @@ if prompt := st.chat_input("How can I help you today?"):
         st.markdown(prompt)
     
     # Store user message
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    
-    # Generate bot response placeholder
+    save_message({"role": "user", "content": prompt})
+
+    # Only what fits this model's budget is sent: recent turns + a rolling summary
+    context = context_for(
+        st.session_state.messages, model=llm_choice, budget=CONTEXT_BUDGETS[llm_choice]
+    )
+    st.session_state.last_context = context
+
+    # Same model + same conversation so far + same (normalized) prompt → reuse the reply
+    cache = get_response_cache()
+    conversation = conversation_hash(context.messages[:-1])
+    cached = cache.get(llm_choice, conversation, prompt, similar=match_similar, threshold=threshold)
+
     with st.chat_message("assistant"):
-        response_text = f"Hello! You are using **{llm_choice}**. Your message was: '{prompt}'. This is a frontend demo."
-        st.markdown(response_text)
-        
+        if cached is not None:
+            response_text = cached.text
+            st.markdown(response_text)
+            st.caption(
+                "⚡ Cached reply"
+                if cached.tier == "exact"
+                else f"⚡ Cached reply for a similar prompt ({cached.similarity:.2f}): “{cached.prompt}”"
+            )
+        else:
+            # Stream the bot response token by token
+            backend = FakeLLM(
+                lambda p: f"Hello! You are using **{llm_choice}**. Your message was: '{p}'. This is a frontend demo.",
+                first_token_latency=first_token_ms / 1000,
+                token_latency=token_ms / 1000,
+            )
+            response_text = stream_reply(backend, prompt, context.messages)
+            cache.put(llm_choice, conversation, prompt, response_text)
+            metrics = st.session_state.response_metrics[-1]
+            st.caption(
+                f"TTFT {metrics['ttft_s'] * 1000:.0f} ms · {metrics['tokens_per_s']:.1f} tokens/s"
+            )
+
+
     # Store assistant message
-    st.session_state.messages.append({"role": "assistant", "content": response_text})
+    save_message({"role": "assistant", "content": response_text})
 
 # Custom message for empty state
 if not st.session_state.messages:
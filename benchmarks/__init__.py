@@ -0,0 +1,5 @@
+"""
+Micro-benchmarks for the helpers in ``common/``.
+=================================================
+Run from the repository root, e.g. ``python -m benchmarks.bench_zero_copy``.
+"""
@@ -0,0 +1,96 @@
+"""
+Serial vs. coalesced predictions
+=================================
+Throughput and latency of a shared model under 1, 10 and 100 concurrent
+sessions, each sending single-text predictions:
+
+  • serial     → every session calls ``model.predict(text)`` itself
+  • coalesced  → every session calls a shared ``MicroBatcher(model.predict_batch)``
+
+The stand-in model has what real inference has: a fixed cost per forward pass
+plus a small cost per item, and one device (a lock) shared by all callers.
+
+    python -m benchmarks.bench_batching [--requests 20] [--overhead-ms 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks._util import print_table
+from common.batching import MicroBatcher
+
+
+class DeviceBoundModel:
+    """``predict_batch`` costs ``overhead + per_item × len(batch)`` on one device."""
+
+    def __init__(self, overhead: float, per_item: float):
+        self.overhead = overhead
+        self.per_item = per_item
+        self._device = threading.Lock()
+
+    def predict_batch(self, texts: list[str]) -> list[str]:
+        with self._device:
+            time.sleep(self.overhead + self.per_item * len(texts))
+        return ["positive" if len(t) % 2 == 0 else "negative" for t in texts]
+
+    def predict(self, text: str) -> str:
+        return self.predict_batch([text])[0]
+
+
+def run_sessions(call, sessions: int, requests: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions + 1)
+
+    def session(i: int) -> None:
+        barrier.wait()
+        for r in range(requests):
+            start = time.perf_counter()
+            call(f"session {i} request {r}")
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=20, help="requests per session")
+    parser.add_argument("--overhead-ms", type=float, default=2.0)
+    parser.add_argument("--per-item-us", type=float, default=20.0)
+    args = parser.parse_args()
+
+    model = DeviceBoundModel(args.overhead_ms / 1e3, args.per_item_us / 1e6)
+    rows = []
+    for sessions in (1, 10, 100):
+        batcher = MicroBatcher(model.predict_batch, max_batch=64, max_wait=0.005)
+        for label, call in (("serial", model.predict), ("coalesced", batcher)):
+            elapsed, latencies = run_sessions(call, sessions, args.requests)
+            latencies.sort()
+            rows.append([
+                sessions,
+                label,
+                f"{len(latencies) / elapsed:,.0f}",
+                f"{statistics.median(latencies) * 1e3:.1f}",
+                f"{latencies[int(len(latencies) * 0.95) - 1] * 1e3:.1f}",
+                f"{batcher.stats().mean_batch:.1f}" if call is batcher else "1.0",
+            ])
+
+    print(f"{args.requests} requests per session, forward pass = "
+          f"{args.overhead_ms} ms + {args.per_item_us} µs/item\n")
+    print_table(["sessions", "mode", "req/s", "p50 ms", "p95 ms", "mean batch"], rows)
+
+
+if __name__ == "__main__":
+    main()
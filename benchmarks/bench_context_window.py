@@ -0,0 +1,71 @@
+"""
+Context assembly per turn: re-tokenize everything vs. ``ContextWindow``
+========================================================================
+Grows one conversation to ``--turns`` messages and, at a few checkpoints,
+times building the context for the next model call:
+
+  • full        → tokenize every message, then walk back from the newest
+                  until the budget is full (what "send the history" costs)
+  • incremental → ``ContextWindow.build``: cached counts, forward-only window,
+                  summary folded in off the request path
+
+    python -m benchmarks.bench_context_window [--turns 20000] [--budget 4096]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from benchmarks._util import print_table, time_call
+from common.context_window import ContextWindow, TokenCounter, count_tokens
+from common.message_store import MessageStore
+
+WORDS = "model token prompt reply window budget summary context stream cache".split()
+
+
+def full_assembly(messages: MessageStore, budget: int) -> list[dict[str, str]]:
+    counts = [count_tokens(m["content"]) for m in messages]
+    used, start = 0, len(messages)
+    while start > 0 and used + counts[start - 1] <= budget:
+        start -= 1
+        used += counts[start]
+    return [m.as_dict() for m in messages[start:]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--turns", type=int, default=20_000)
+    parser.add_argument("--budget", type=int, default=4096)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    checkpoints = {100, 1_000, 5_000, 10_000, args.turns}
+    messages = MessageStore()
+    window = ContextWindow(TokenCounter(), args.budget, reserve=256)
+    limit = args.budget - 256 - window.summary_tokens_max
+    rows = []
+    for turn in range(1, args.turns + 1):
+        role = "user" if turn % 2 else "assistant"
+        words = rng.randint(8, 20) if role == "user" else rng.randint(40, 120)
+        text = " ".join(rng.choice(WORDS) for _ in range(words))
+        messages.append({"role": role, "content": text})
+        if turn not in checkpoints:
+            window.build(messages)
+            continue
+        window.wait()
+        window.build(messages)  # Collect the summary so the timed turn is steady-state
+        messages.append({"role": "user", "content": "and one more question"})
+        new = count_tokens("and one more question")
+        incremental, _ = time_call(lambda: window.build(messages), repeat=1)
+        full, _ = time_call(lambda: full_assembly(messages, limit), repeat=3)
+        rows.append([f"{turn:,}", new, f"{full / 1e3:,.2f}", f"{incremental:,.0f}",
+                     f"{full / incremental:,.0f}×"])
+        window.wait()
+
+    print(f"budget {args.budget:,} tokens; one new user message per timed turn\n")
+    print_table(["messages", "new tokens", "full ms", "incremental µs", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
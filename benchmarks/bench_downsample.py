@@ -0,0 +1,67 @@
+"""
+Downsampling time vs. series length
+====================================
+Times ``minmax_indices`` and ``lttb_indices`` (with and without the min/max
+preselection) on random walks of 10k … 10M points, reducing each to a
+``--width``-pixel chart, and compares the Arrow payload ``st.line_chart``
+would send for the raw and the downsampled series.
+
+    python -m benchmarks.bench_downsample [--width 1000] [--max-n 10000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks._util import print_table, time_call
+from common.downsample import lttb_indices, minmax_indices, points_for_width
+
+
+def arrow_bytes(df: pd.DataFrame) -> int:
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(df)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--max-n", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rows = []
+    n = 10_000
+    while n <= args.max_n:
+        y = np.cumsum(rng.standard_normal(n))
+        x = np.arange(n, dtype=np.float64)
+        repeat = max(3, min(50, 20_000_000 // n))
+        mm, _ = time_call(lambda: minmax_indices(y, points_for_width(args.width, "minmax")), repeat)
+        fast, _ = time_call(lambda: lttb_indices(x, y, points_for_width(args.width, "lttb")), repeat)
+        exact = "—"
+        if n <= 1_000_000:  # The plain pass is a Python loop over buckets of n / width points
+            t, _ = time_call(lambda: lttb_indices(x, y, args.width, preselect=False), 3)
+            exact = f"{t / 1e3:,.1f}"
+        kept = minmax_indices(y, points_for_width(args.width, "minmax"))
+        frame = pd.DataFrame({"y": y}, index=pd.RangeIndex(n))
+        rows.append([
+            f"{n:,}", f"{mm / 1e3:,.2f}", f"{fast / 1e3:,.2f}", exact,
+            f"{arrow_bytes(frame) / 1024:,.0f}", f"{arrow_bytes(frame.iloc[kept]) / 1024:,.0f}",
+        ])
+        n *= 10
+
+    print(f"chart width {args.width}px → {points_for_width(args.width, 'minmax'):,} min/max "
+          f"points or {points_for_width(args.width, 'lttb'):,} LTTB points\n")
+    print_table(
+        ["points", "minmax ms", "LTTB ms", "LTTB exact ms", "raw KiB", "sent KiB"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Fixed-interval vs. adaptive fragment polling
+=============================================
+CPU spent per simulated session over ``--minutes`` of wall-clock time
+(driven by a simulated clock, so it runs in well under a minute), counting
+both the polls and the fragment reruns themselves:
+
+  • fixed     → every tile polls and redraws every ``--tick`` seconds (one
+                ``run_every`` fragment per tile)
+  • adaptive  → ``FragmentScheduler``'s logic: unchanged data backs a tile's
+                interval off up to ``--max-interval``; one fragment reruns
+                every shortest tile interval, polls the due tiles and redraws
+                all of them; a change of that interval costs one full rerun
+                (counted, and charged as one more redraw of every tile; the
+                rest of the page it reruns is not included)
+
+Each poll builds and hashes a ``--rows``-row frame, standing in for a query.
+Each redraw of a tile builds its ``st.metric`` and ``st.caption`` elements
+(bare mode: the protos are built, nothing is sent).
+Scenarios: ``idle`` (data never changes), ``mixed`` (one tile in four changes
+every poll) and ``busy`` (every tile changes every poll).
+
+    python -m benchmarks.bench_fragment_scheduler [--tiles 8] [--minutes 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from benchmarks._util import print_table
+from common.cache_keys import content_hash
+from common.fragment_scheduler import AdaptiveSchedule, Tile
+
+
+def make_source(rows: int, changing: bool):
+    base = np.random.default_rng(0).standard_normal((rows, 4))
+    counter = [0]
+
+    def poll() -> pd.DataFrame:
+        if changing:
+            counter[0] += 1
+        return pd.DataFrame(base + counter[0], columns=list("abcd"))
+
+    return poll
+
+
+def render(tile: Tile) -> None:
+    st.metric(tile.name, f"{float(tile.value.iat[0, 0]):.2f}")
+    st.caption(f"every {tile.interval:g}s · {tile.polls} polls")
+
+
+def run(mode: str, scenario: str, args: argparse.Namespace) -> tuple[float, int, int, int]:
+    changing = {
+        "idle": [False] * args.tiles,
+        "mixed": [i % 4 == 0 for i in range(args.tiles)],
+        "busy": [True] * args.tiles,
+    }[scenario]
+    schedule = AdaptiveSchedule()
+    for i, changes in enumerate(changing):
+        schedule.add(Tile(
+            f"tile{i}", make_source(args.rows, changes), render=lambda v: None,
+            min_interval=args.tick,
+            max_interval=args.tick if mode == "fixed" else args.max_interval,
+        ))
+
+    fragment_runs = polls = full_reruns = 0
+    cpu = time.process_time()
+    end = args.minutes * 60
+    if mode == "fixed":
+        for step in range(int(end / args.tick)):
+            # One fragment per tile, each polling and redrawing every tick.
+            for tile in schedule.poll_due(step * args.tick):
+                render(tile)
+                fragment_runs += 1
+                polls += 1
+    else:
+        now, run_every = 0.0, schedule.run_every(args.tick)
+        while now < end:
+            polls += len(schedule.poll_due(now))
+            for tile in schedule.tiles.values():  # One fragment redraws every tile
+                render(tile)
+            fragment_runs += 1
+            if schedule.run_every(args.tick) != run_every:
+                run_every = schedule.run_every(args.tick)
+                full_reruns += 1
+                for tile in schedule.tiles.values():
+                    render(tile)
+            now += run_every
+    return time.process_time() - cpu, polls, fragment_runs, full_reruns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tiles", type=int, default=8)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--tick", type=float, default=1.0)
+    parser.add_argument("--max-interval", type=float, default=32.0)
+    parser.add_argument("--rows", type=int, default=5_000)
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)  # Bare mode warnings
+
+    rows = []
+    for scenario in ("idle", "mixed", "busy"):
+        results = {mode: run(mode, scenario, args) for mode in ("fixed", "adaptive")}
+        for mode, (cpu, polls, runs, full) in results.items():
+            saving = 1 - cpu / results["fixed"][0] if mode == "adaptive" else 0.0
+            rows.append([scenario, mode, f"{cpu * 1e3:,.0f}", f"{polls:,}", f"{runs:,}", f"{full:,}",
+                         f"{saving:.0%}" if mode == "adaptive" else ""])
+
+    print(f"{args.tiles} tiles · {args.minutes:g} simulated minutes · tick {args.tick:g}s · "
+          f"poll = {args.rows:,}-row frame + hash; CPU includes redraws\n")
+    print_table(["scenario", "mode", "CPU ms", "polls", "fragment runs", "full reruns", "saving"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Scatter of N points: inline Altair vs. ``scatter_spec``
+========================================================
+For random scatters of 10k … 10M points, compares what one chart costs the
+server and how much data it sends:
+
+  • altair      → ``alt.Chart(df).mark_circle()`` converted the way
+                  ``st.altair_chart`` does it (spec + every point as Arrow)
+  • cold        → ``scatter_spec`` on new data: reduce (sample / bin),
+                  serialize, compile the spec
+  • rerun       → ``scatter_spec`` again with the same ``data_key`` (cache hit)
+
+    python -m benchmarks.bench_large_charts [--max-n 10000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import altair as alt
+import numpy as np
+import pandas as pd
+from streamlit.elements.vega_charts import _convert_altair_to_vega_lite_spec
+
+from benchmarks._util import print_table, time_call
+from common.large_charts import scatter_spec
+
+
+def altair_inline(df: pd.DataFrame) -> int:
+    spec = _convert_altair_to_vega_lite_spec(alt.Chart(df).mark_circle().encode(x="x:Q", y="y:Q"))
+    return sum(len(v) for v in spec["datasets"].values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--max-n", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rows = []
+    n = 10_000
+    while n <= args.max_n:
+        df = pd.DataFrame({"x": rng.standard_normal(n), "y": rng.standard_normal(n)})
+        inline_us, _ = time_call(lambda: altair_inline(df), 3)
+        inline_bytes = altair_inline(df)
+        cold_us, _ = time_call(lambda: scatter_spec(df, "x", "y", data_key=("bench", n)), 1)
+        rerun_us, _ = time_call(lambda: scatter_spec(df, "x", "y", data_key=("bench", n)), 100)
+        _, payload = scatter_spec(df, "x", "y", data_key=("bench", n))
+        rows.append([
+            f"{n:,}", f"{inline_us / 1e3:,.0f}", f"{inline_bytes / 2**20:,.2f}",
+            payload.mode, f"{cold_us / 1e3:,.0f}", f"{rerun_us / 1e3:,.2f}",
+            f"{len(payload.arrow) / 2**20:,.2f}",
+        ])
+        n *= 10
+
+    print_table(["points", "altair ms", "altair MiB", "mode", "cold ms", "rerun ms", "sent MiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
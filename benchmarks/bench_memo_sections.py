@@ -0,0 +1,63 @@
+"""
+Script time per rerun with and without ``memo_section``
+========================================================
+Runs the topic pages that use it headlessly with
+``streamlit.testing.v1.AppTest`` and times repeated reruns of the same
+session (what every widget interaction costs), once with ``LABS_MEMO_SECTIONS=0`` and once with memoization on.
+The first run of each session is a warm-up and isn't counted.
+
+    python -m benchmarks.bench_memo_sections [--reruns 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import statistics
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks._util import print_table
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGES = [  # Pages that keep per-session objects in memo_section
+    "02_Display_Elements/display_elements.py",
+]
+
+
+def rerun_times(page: str, reruns: int, memo: bool) -> list[float]:
+    os.environ["LABS_MEMO_SECTIONS"] = "1" if memo else "0"
+    at = AppTest.from_file(str(ROOT / page), default_timeout=60)
+    at.run()
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - start) * 1e3)
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--reruns", type=int, default=30)
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    rows = []
+    for page in PAGES:
+        off = statistics.median(rerun_times(page, args.reruns, memo=False))
+        on = statistics.median(rerun_times(page, args.reruns, memo=True))
+        rows.append([page, f"{off:.1f}", f"{on:.1f}", f"{off - on:.1f}", f"{1 - on / off:.0%}"])
+    os.environ.pop("LABS_MEMO_SECTIONS", None)
+
+    print(f"median of {args.reruns} reruns per session (AppTest, includes harness overhead)\n")
+    print_table(["page", "memo off ms", "memo on ms", "saved ms", "saving"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Chat history memory: list of dicts vs. ``MessageStore``
+========================================================
+Builds ``--sessions`` independent histories of ``--messages`` turns (short
+user prompts, longer assistant replies) in each representation and measures
+the Python heap they retain with ``tracemalloc``, then extrapolates to
+``--target-sessions`` (default 1,000 sessions × 10k messages, which would be
+~10M messages — too many to allocate twice on a laptop).
+
+    python -m benchmarks.bench_message_store [--sessions 20] [--messages 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from benchmarks._util import print_table
+from common.message_store import MessageStore
+
+WORDS = (
+    "streamlit cache session model token prompt reply chart frame layout widget "
+    "rerun fragment state data user assistant context window budget stream"
+).split()
+
+
+def make_turns(n: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    turns = []
+    for i in range(n):
+        role = "user" if i % 2 == 0 else "assistant"
+        words = rng.randint(5, 15) if role == "user" else rng.randint(40, 90)
+        turns.append((role, " ".join(rng.choice(WORDS) for _ in range(words))))
+    return turns
+
+
+def build_dicts(turns: list[tuple[str, str]]) -> list[dict[str, str]]:
+    return [{"role": role, "content": text} for role, text in turns]
+
+
+def build_store(turns: list[tuple[str, str]]) -> MessageStore:
+    store = MessageStore()
+    for role, text in turns:
+        store.append({"role": role, "content": text})
+    return store
+
+
+def retained_bytes(build, sessions: list[list[tuple[str, str]]]) -> int:
+    """Heap retained by the built histories, including any message text they keep."""
+    gc.collect()
+    tracemalloc.start()
+    # Private string copies per session, as real sessions have. Whatever the
+    # history doesn't keep a reference to is freed before measuring.
+    private = [[(role, text.encode().decode()) for role, text in turns] for turns in sessions]
+    held = [build(turns) for turns in private]
+    del private
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return retained
+
+
+def timings(build, sessions: list[list[tuple[str, str]]]) -> tuple[float, float]:
+    start = time.perf_counter()
+    held = [build(turns) for turns in sessions]
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for history in held:
+        for message in history:
+            message["content"]
+    return build_s, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--target-sessions", type=int, default=1_000)
+    args = parser.parse_args()
+
+    sessions = [make_turns(args.messages, seed) for seed in range(args.sessions)]
+    total = args.sessions * args.messages
+    rows = []
+    results = {}
+    for label, build in (("list[dict]", build_dicts), ("MessageStore", build_store)):
+        retained = retained_bytes(build, sessions)
+        build_s, iterate_s = timings(build, sessions)
+        results[label] = retained
+        per_message = retained / total
+        rows.append([
+            label,
+            f"{per_message:,.0f}",
+            f"{retained / args.sessions / 2**20:,.2f}",
+            f"{per_message * args.messages * args.target_sessions / 2**30:,.2f}",
+            f"{build_s / total * 1e9:,.0f}",
+            f"{iterate_s / total * 1e9:,.0f}",
+        ])
+
+    print(f"{args.sessions} sessions × {args.messages:,} messages measured; "
+          f"extrapolated to {args.target_sessions:,} sessions\n")
+    print_table(
+        ["store", "bytes/msg", "MiB/session", f"GiB @ {args.target_sessions:,}",
+         "append ns/msg", "iterate ns/msg"],
+        rows,
+    )
+    saved = 1 - results["MessageStore"] / results["list[dict]"]
+    print(f"\nMessageStore retains {saved:.0%} less memory.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+KPI cards per rerun: pandas groupby vs. ``MetricsEngine``
+==========================================================
+For order tables of growing size, times what the four order KPIs (revenue,
+distinct users, conversion, retention; 30 days vs. the 30 days before) cost
+on every rerun:
+
+  • groupby → filter both windows and ``groupby(...).agg`` over the table
+  • engine  → ``MetricsEngine.value`` for each card (running totals)
+
+plus the engine's one-off load and the cost of folding in a batch of new rows.
+
+    python -m benchmarks.bench_metrics [--max-rows 10000000] [--batch 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._util import print_table, time_call
+from common.metrics import DEMO_METRICS, MetricsEngine, demo_orders
+
+ORDER_METRICS = [m.name for m in DEMO_METRICS if m.source == "orders"]
+
+
+def groupby_kpis(orders: pd.DataFrame) -> pd.DataFrame:
+    day = orders["ts"].dt.floor("D")
+    latest = day.max()
+    age = (latest - day).dt.days
+    window = pd.Series(np.where(age < 30, "current", np.where(age < 60, "previous", None)), index=orders.index)
+    return orders[window.notna()].groupby(window[window.notna()]).agg(
+        revenue=("amount", "sum"),
+        users=("user_id", "nunique"),
+        conversion=("converted", "mean"),
+        retention=("returning", "mean"),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--max-rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    args = parser.parse_args()
+
+    end = pd.Timestamp("2026-01-01")
+    rows = []
+    n = 100_000
+    while n <= args.max_rows:
+        orders = demo_orders(n, end=end)
+        engine = MetricsEngine(DEMO_METRICS)
+        start = time.perf_counter()
+        engine.ingest("orders", orders)
+        load = time.perf_counter() - start
+
+        expected = groupby_kpis(orders).loc["current"]
+        for name in ORDER_METRICS:  # Same numbers both ways
+            assert np.isclose(engine.value(name).value, expected[name]), name
+
+        repeat = max(3, min(20, 20_000_000 // n))
+        rerun_pandas, _ = time_call(lambda: groupby_kpis(orders), repeat)
+        rerun_engine, _ = time_call(lambda: [engine.value(name) for name in ORDER_METRICS], 1_000)
+        seeds = iter(range(1, 1_000))
+        ingest, _ = time_call(
+            lambda: engine.ingest("orders", demo_orders(args.batch, end=end, days=1, seed=next(seeds))), 20
+        )
+        rows.append([
+            f"{n:,}", f"{rerun_pandas / 1e3:,.1f}", f"{rerun_engine:,.0f}",
+            f"{rerun_pandas / rerun_engine:,.0f}×", f"{load:,.2f}", f"{ingest / 1e3:,.2f}",
+        ])
+        n *= 10
+
+    print(f"{len(ORDER_METRICS)} cards per rerun; ingest = {args.batch:,} new rows (incl. generating them)\n")
+    print_table(["rows", "groupby ms", "engine µs", "speedup", "engine load s", "ingest ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
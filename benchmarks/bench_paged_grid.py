@@ -0,0 +1,91 @@
+"""
+Page turns on a memory-mapped table
+====================================
+Writes an ``--rows``-row Arrow IPC file (default 50M rows), opens it with
+``PagedTable.open`` (memory-mapped, nothing read up front) and times:
+
+  • building a sort index (once per column + direction), and reloading it
+    from its ``.npy`` file in a fresh ``PagedTable``
+  • page turns at random pages: file order, sorted, and filtered + sorted
+    (the filter itself is evaluated once, then cached)
+
+    python -m benchmarks.bench_paged_grid [--rows 50000000] [--page-size 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+from benchmarks._util import print_table, rss_bytes, time_call
+from common.paged_grid import PagedTable
+
+
+def write_table(path: Path, rows: int, batch: int = 5_000_000) -> None:
+    rng = np.random.default_rng(0)
+    schema = pa.schema([("id", pa.int64()), ("amount", pa.float64()), ("units", pa.int32())])
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for start in range(0, rows, batch):
+            n = min(batch, rows - start)
+            writer.write_batch(pa.record_batch([
+                pa.array(np.arange(start, start + n)),
+                pa.array(rng.gamma(2.0, 40.0, n)),
+                pa.array(rng.integers(1, 20, n, dtype=np.int32)),
+            ], schema=schema))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, index_dir = Path(tmp) / "table.arrow", Path(tmp) / "indexes"
+        start = time.perf_counter()
+        write_table(path, args.rows)
+        print(f"wrote {args.rows:,} rows ({path.stat().st_size / 2**30:.2f} GiB) "
+              f"in {time.perf_counter() - start:.1f}s\n")
+
+        rss = rss_bytes()
+        start = time.perf_counter()
+        table = PagedTable.open(path, index_dir=index_dir)
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        table.sort_index("amount", ascending=False)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        PagedTable.open(path, index_dir=index_dir).sort_index("amount", ascending=False)
+        reloaded = time.perf_counter() - start
+        print(f"open (mmap): {opened * 1e3:.1f} ms, +{(rss_bytes() - rss) / 2**20:,.0f} MiB RSS "
+              "after sorting; sort index: built "
+              f"{built:.1f}s, reloaded from .npy {reloaded * 1e3:.1f} ms\n")
+
+        where = ("units", ">", "17")
+        table.positions(("amount", False), where)  # Evaluate + cache the filter once
+        rng = random.Random(0)
+        rows = []
+        for label, sort, filt in (
+            ("file order", None, None),
+            ("sorted by amount ↓", ("amount", False), None),
+            ("units > 17, sorted", ("amount", False), where),
+        ):
+            total = table.page(0, args.page_size, sort=sort, where=filt)[1]
+            pages = (total + args.page_size - 1) // args.page_size
+            p50, p95 = time_call(
+                lambda: table.page(rng.randrange(pages), args.page_size, sort=sort, where=filt),
+                repeat=args.turns,
+            )
+            rows.append([label, f"{total:,}", f"{p50 / 1e3:.2f}", f"{p95 / 1e3:.2f}"])
+        print_table(["view", "rows", "page p50 ms", "page p95 ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
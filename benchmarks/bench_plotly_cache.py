@@ -0,0 +1,124 @@
+"""
+Plotly figures: build every run vs. ``cached_figure``
+=====================================================
+Two parts:
+
+  • per figure  → build time (``plotly.express`` + template) for a few figure
+                  kinds, against a ``cached_figure`` hit; plus the
+                  serialization ``st.plotly_chart`` does on every call, which
+                  the cache doesn't save
+  • per page    → the Plotly topic pages run headlessly with AppTest, with
+                  ``LABS_FIGURE_CACHE=0`` and with the cache on: a fresh
+                  session's first run and the median rerun
+
+    python -m benchmarks.bench_plotly_cache [--reruns 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from benchmarks._util import print_table, time_call
+from common.plotly_cache import cached_figure
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGES = ["02_Display_Elements/display_elements.py"]  # Pages that draw Plotly figures
+
+
+def sales_bar(data, *, template):
+    import plotly.express as px
+
+    fig = px.bar(x=list(data), y=list(data.values()), title="Monthly Sales")
+    return fig.update_layout(template=template)
+
+
+def scatter(data, *, template):
+    import plotly.express as px
+
+    return px.scatter(data, x="x", y="y", color="group", template=template)
+
+
+def lines(data, *, template):
+    import plotly.express as px
+
+    return px.line(data, template=template)
+
+
+def page_times(page: str, reruns: int, cache: bool) -> tuple[float, float]:
+    os.environ["LABS_FIGURE_CACHE"] = "1" if cache else "0"
+    at = AppTest.from_file(str(ROOT / page), default_timeout=120)
+    at.run()  # Warm-up session: fills the process-wide cache when it's on
+    fresh = AppTest.from_file(str(ROOT / page), default_timeout=120)
+    start = time.perf_counter()
+    fresh.run()
+    first = (time.perf_counter() - start) * 1e3
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        fresh.run()
+        samples.append((time.perf_counter() - start) * 1e3)
+    if fresh.exception:
+        raise RuntimeError(f"{page}: {fresh.exception[0].message}")
+    return first, statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+    try:
+        import plotly.io as pio
+    except ImportError:
+        sys.exit("plotly is not installed: pip install plotly")
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    rng = np.random.default_rng(0)
+    figures = {
+        "bar (5 bars)": (sales_bar, {"Jan": 120, "Feb": 200, "Mar": 150, "Apr": 250, "May": 180}),
+        "scatter (10k points)": (scatter, pd.DataFrame({
+            "x": rng.standard_normal(10_000), "y": rng.standard_normal(10_000),
+            "group": rng.choice(["a", "b", "c"], 10_000),
+        })),
+        "lines (3 × 1k points)": (lines, pd.DataFrame(np.cumsum(rng.standard_normal((1_000, 3)), axis=0),
+                                                      columns=["a", "b", "c"])),
+    }
+    rows = []
+    for i, (label, (build, data)) in enumerate(figures.items()):
+        os.environ["LABS_FIGURE_CACHE"] = "0"
+        built = [cached_figure(label, build, data, template="plotly_dark") for _ in range(6)]
+        os.environ["LABS_FIGURE_CACHE"] = "1"
+        first, built = built[0], built[1:]
+        cached_figure(label, build, data, template="plotly_dark")
+        build_ms = statistics.median(e.build_ms for e in built)
+        hit_us, _ = time_call(lambda: cached_figure(label, build, data, template="plotly_dark"), 200)
+        figure = first.figure  # What st.plotly_chart does with it on every call
+        chart_us, _ = time_call(lambda: pio.to_json(figure.to_dict(), validate=False), 20)
+        rows.append([label, f"{first.build_ms:,.1f}" if i == 0 else "—", f"{build_ms:,.1f}",
+                     f"{hit_us:,.0f}", f"{chart_us / 1e3:,.2f}"])
+    print("per figure (first = first figure in the process, incl. template load)\n")
+    print_table(["figure", "first build ms", "build ms", "cache hit µs", "plotly_chart serialize ms (not cached)"],
+                rows)
+
+    rows = []
+    for page in PAGES:
+        first_off, rerun_off = page_times(page, args.reruns, cache=False)
+        first_on, rerun_on = page_times(page, args.reruns, cache=True)
+        rows.append([page, f"{first_off:,.0f}", f"{first_on:,.0f}", f"{rerun_off:,.1f}", f"{rerun_on:,.1f}",
+                     f"{rerun_off - rerun_on:,.1f}"])
+    os.environ.pop("LABS_FIGURE_CACHE", None)
+    print(f"\nper page (new session's first run; median of {args.reruns} reruns; AppTest overhead included)\n")
+    print_table(["page", "first off ms", "first on ms", "rerun off ms", "rerun on ms", "saved ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Page startup: time to first element, eager vs. deferred heavy imports
+=====================================================================
+Each page runs headlessly (AppTest) in a fresh interpreter, so nothing is
+imported yet, once with ``LABS_LAZY_IMPORTS=0`` (pandas/numpy/pyarrow imported
+up front, as before) and once with the ``common.lazy_import`` proxies:
+
+  • first element → wall time from the start of the run to the first element
+                    reaching the page (median of ``--repeat`` processes)
+  • imports       → one more run under ``python -X importtime``: total import
+                    time before the first element, and which heavy libraries
+                    (pandas, numpy, pyarrow, altair, plotly) it included
+
+    python -m benchmarks.bench_startup [--repeat 5] [--page 03_Input_Widgets/input_widgets.py]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGES = [  # The README entry points first, then the other pages that import heavy libraries
+    "03_Input_Widgets/input_widgets.py",
+    "Basic_Chatbot_Project/chatbot_ui.py",
+    "11_Multipage_Apps/multipage_app.py",
+    "01_Execution_Model/execution_model.py",
+    "02_Display_Elements/display_elements.py",
+    "04_Layout_Containers/layout_containers.py",
+    "06_Caching_Connections/caching_connections.py",
+    "07_Chat_UI/chat_ui.py",
+    "11_Multipage_Apps/pages/page_analytics.py",
+]
+HEAVY = ("numpy", "pandas", "pyarrow", "altair", "plotly")
+START, FIRST = "# bench_startup: run", "# bench_startup: first element"
+
+
+def child(page: str) -> None:
+    """Run ``page`` once; mark the run start and first element on stderr, print timings."""
+    import logging
+    import time
+
+    from streamlit.delta_generator import DeltaGenerator
+    from streamlit.testing.v1 import AppTest
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    enqueue = DeltaGenerator._enqueue
+    first: list[float] = []
+
+    def marked(self, *args, **kwargs):
+        if not first:
+            first.append(time.perf_counter())
+            os.write(2, f"{FIRST}\n".encode())  # Unbuffered, like -X importtime's own lines
+        return enqueue(self, *args, **kwargs)
+
+    DeltaGenerator._enqueue = marked
+    at = AppTest.from_file(str(ROOT / page), default_timeout=300)
+    os.write(2, f"{START}\n".encode())
+    start = time.perf_counter()
+    at.run()
+    end = time.perf_counter()
+    if at.exception:
+        sys.exit(f"{page}: {at.exception[0].message}")
+    print(json.dumps({"first_ms": (first[0] - start) * 1e3, "run_ms": (end - start) * 1e3}))
+
+
+def spawn(page: str, lazy: bool, importtime: bool = False) -> tuple[dict, str]:
+    env = dict(os.environ, LABS_LAZY_IMPORTS="1" if lazy else "0")
+    cmd = [sys.executable, *(["-X", "importtime"] if importtime else []), "-m", "benchmarks.bench_startup",
+           "--child", page]
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def imports_before_first(stderr: str) -> tuple[float, dict[str, float]]:
+    """Top-level import ms between the run start and the first element, and the ``HEAVY`` ones in it."""
+    section = stderr.split(START, 1)[-1].split(FIRST, 1)[0]
+    total, heavy = 0.0, {}
+    for line in section.splitlines():
+        # "import time:      self |  cumulative | [two spaces per nesting level]package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        ms = int(cumulative) / 1e3
+        if not name[1:].startswith(" "):
+            total += ms
+        if name.strip() in HEAVY:
+            heavy[name.strip()] = ms
+    return total, heavy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--page", action="append", help="Page to measure (repeatable; default: all)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    from benchmarks._util import print_table
+
+    rows, detail = [], []
+    for page in args.page or PAGES:
+        first, imports = {}, {}
+        for lazy in (False, True):
+            first[lazy] = statistics.median(spawn(page, lazy)[0]["first_ms"] for _ in range(args.repeat))
+            imports[lazy] = imports_before_first(spawn(page, lazy, importtime=True)[1])
+        rows.append([page, f"{first[False]:,.0f}", f"{first[True]:,.0f}", f"{first[False] - first[True]:,.0f}",
+                     f"{imports[False][0]:,.0f}", f"{imports[True][0]:,.0f}"])
+        detail.append([page, *(", ".join(f"{name} {ms:,.0f}" for name, ms in imports[lazy][1].items()) or "—"
+                               for lazy in (False, True))])
+
+    print(f"time to first element, ms (median of {args.repeat} fresh processes; AppTest overhead included)\n")
+    print_table(["page", "eager", "lazy", "saved", "imports eager", "imports lazy"], rows)
+    print("\nheavy libraries imported before the first element, ms (-X importtime, cumulative)\n")
+    print_table(["page", "eager", "lazy"], detail)
+
+
+if __name__ == "__main__":
+    main()
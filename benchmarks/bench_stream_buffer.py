@@ -0,0 +1,75 @@
+"""
+Live chart updates: full redraw vs. delta append
+=================================================
+Feeds a 3-series ``SeriesRing`` at 1 Hz and 10 Hz for ``--seconds`` of
+simulated time and, per update, measures what would go to the browser and
+how long it takes to produce (ring read + Arrow serialization, the same
+``convert_pandas_df_to_arrow_bytes`` ``st.line_chart`` uses):
+
+  • redraw → the whole window every update (what ``live_line_chart`` does)
+  • delta  → only the new rows, plus one full draw whenever a full ring of
+             appends has gone out (window wrapped); the floor an ``add_rows``
+             append would reach, which current Streamlit no longer offers
+
+    python -m benchmarks.bench_stream_buffer [--window 600] [--seconds 600]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+from benchmarks._util import print_table
+from common.stream_buffer import SeriesRing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--window", type=int, default=600)
+    parser.add_argument("--seconds", type=int, default=600)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for hz in (1, 10):
+        step = np.timedelta64(int(1e9 / hz), "ns")
+        ring = SeriesRing(["a", "b", "c"], args.window)
+        ring.extend(np.datetime64(0, "ns") + step * np.arange(args.window), rng.standard_normal((args.window, 3)))
+        _, cursor = ring.frame()
+        sent = {"redraw": 0, "delta": 0}
+        spent = {"redraw": 0.0, "delta": 0.0}
+        appended = 0
+        updates = args.seconds * hz
+        for i in range(updates):
+            ring.extend([np.datetime64(0, "ns") + step * (args.window + i)], rng.standard_normal((1, 3)))
+
+            start = time.perf_counter()
+            window, _ = ring.frame()
+            sent["redraw"] += len(convert_pandas_df_to_arrow_bytes(window))
+            spent["redraw"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            delta, cursor = ring.delta(cursor)
+            if delta is not None and appended + len(delta) <= ring.capacity:
+                appended += len(delta)
+            else:  # Resync
+                delta, cursor = ring.frame()
+                appended = 0
+            sent["delta"] += len(convert_pandas_df_to_arrow_bytes(delta))
+            spent["delta"] += time.perf_counter() - start
+
+        for mode in ("redraw", "delta"):
+            rows.append([
+                f"{hz} Hz", mode, f"{sent[mode] / args.seconds / 1024:,.1f}",
+                f"{sent[mode] / updates / 1024:,.2f}", f"{spent[mode] / updates * 1e3:,.3f}",
+            ])
+
+    print(f"window {args.window:,} points × 3 series, {args.seconds:,} s of updates\n")
+    print_table(["rate", "mode", "KiB/s sent", "KiB/update", "ms/update"], rows)
+
+
+if __name__ == "__main__":
+    main()
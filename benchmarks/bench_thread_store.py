@@ -0,0 +1,117 @@
+"""
+Chat persistence: commit per message vs. ``ThreadStore`` group commit
+======================================================================
+``--sessions`` concurrent sessions each append ``--turns`` messages to their
+own thread, as the chat page does after every reply:
+
+  • per-message → one INSERT + COMMIT per message on the caller's thread
+                  (WAL, ``synchronous=FULL``: an fsync each time)
+  • group       → ``ThreadStore.append`` (queue only; the writer commits every
+                  few ms as one transaction, ``synchronous=NORMAL``)
+
+Then times opening a long thread: reading every message vs. the newest page.
+
+    python -m benchmarks.bench_thread_store [--sessions 20] [--turns 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks._util import print_table, time_call
+from common.thread_store import SCHEMA, PersistentThread, ThreadStore
+
+
+def per_message_appender(database: Path):
+    conn = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+    conn.executescript(SCHEMA)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")
+    lock = threading.Lock()
+    seqs: dict[str, int] = {}
+
+    def append(thread_id: str, role: str, content: str) -> None:
+        with lock:
+            seq = seqs[thread_id] = seqs.get(thread_id, -1) + 1
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT INTO messages VALUES (?, ?, ?, ?, ?)",
+                (thread_id, seq, 0 if role == "user" else 1, content, time.time()),
+            )
+            conn.execute("COMMIT")
+
+    return append
+
+
+def run_sessions(append, sessions: int, turns: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions + 1)
+
+    def session(i: int) -> None:
+        barrier.wait()
+        mine = []
+        for t in range(turns):
+            role = "user" if t % 2 == 0 else "assistant"
+            start = time.perf_counter()
+            append(f"session-{i}", role, f"message {t} from session {i} " * 8)
+            mine.append(time.perf_counter() - start)
+            time.sleep(0.0005)  # A little think time between turns
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=200, help="messages per session")
+    parser.add_argument("--long-thread", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+        store = ThreadStore(Path(tmp) / "group.db")
+        for label, append in (
+            ("per-message", per_message_appender(Path(tmp) / "naive.db")),
+            ("group", store.append),
+        ):
+            elapsed, latencies = run_sessions(append, args.sessions, args.turns)
+            if append == store.append:
+                store.flush()
+            latencies.sort()
+            rows.append([
+                label,
+                f"{len(latencies) / elapsed:,.0f}",
+                f"{latencies[len(latencies) // 2] * 1e3:.3f}",
+                f"{latencies[int(len(latencies) * 0.99) - 1] * 1e3:.3f}",
+                f"{latencies[-1] * 1e3:.2f}",
+            ])
+        print(f"{args.sessions} sessions × {args.turns} appends "
+              f"({store.committed_rows:,} rows in {store.commits:,} group commits)\n")
+        print_table(["mode", "appends/s", "p50 ms", "p99 ms", "max ms"], rows)
+
+        for t in range(args.long_thread):
+            store.append("long", "user" if t % 2 == 0 else "assistant", f"turn {t} " * 20)
+        store.flush()
+        full, _ = time_call(lambda: store.load_page("long", 0, args.long_thread), repeat=10)
+        lazy, _ = time_call(lambda: PersistentThread(store, "long"), repeat=50)
+        print(f"\nOpening a {args.long_thread:,}-message thread: all messages "
+              f"{full / 1e3:.1f} ms, newest page (PersistentThread) {lazy / 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
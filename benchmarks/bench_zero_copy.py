@@ -0,0 +1,91 @@
+"""
+Copy vs. read-only shared cache hits
+=====================================
+Per-rerun latency and RSS growth for the ways a cached 5000×3 frame can be
+handed back to a script run:
+
+  • pickle      → what ``@st.cache_data`` does on every hit (unpickle a copy)
+  • copy        → ``tiered_cache()`` default (``DataFrame.copy()``)
+  • shared      → ``tiered_cache(shared=True)`` (shallow view, read-only buffers)
+
+RSS is measured while holding one returned frame per simulated session, which
+is what happens when many sessions keep their rerun result alive. Each mode
+runs in its own interpreter so freed memory from one mode can't hide the
+growth of the next.
+
+    python -m benchmarks.bench_zero_copy [--rows 5000] [--sessions 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._util import print_table, rss_bytes, time_call
+from common.tiered_cache import freeze_frame, shared_view
+
+
+MODES = {
+    "pickle": "pickle (st.cache_data)",
+    "copy": "copy (tiered default)",
+    "shared": "shared (tiered shared=True)",
+}
+
+
+def measure(mode: str, n_rows: int, sessions: int) -> dict[str, float]:
+    df = pd.DataFrame(
+        np.random.randn(n_rows, 3), columns=["Feature A", "Feature B", "Feature C"]
+    )
+    pickled = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+    frozen = freeze_frame(df)
+    fn = {
+        "pickle": lambda: pickle.loads(pickled),
+        "copy": frozen.copy,
+        "shared": lambda: shared_view(frozen),
+    }[mode]
+
+    median, p95 = time_call(fn, repeat=500)
+    gc.collect()
+    before = rss_bytes()
+    held = [fn() for _ in range(sessions)]
+    grown = rss_bytes() - before
+    del held
+    return {"median": median, "p95": p95, "rss": grown}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.rows, args.sessions)))
+        return
+
+    rows = []
+    for mode, label in MODES.items():
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_zero_copy", "--mode", mode,
+             "--rows", str(args.rows), "--sessions", str(args.sessions)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(out)
+        rows.append([label, f"{result['median']:.1f}", f"{result['p95']:.1f}",
+                     f"{result['rss'] / 2**20:.1f}"])
+
+    print(f"{args.rows}×3 float64 frame ({args.rows * 3 * 8 / 1024:.0f} KiB), "
+          f"{args.sessions} sessions holding a result\n")
+    print_table(["mode", "median µs/rerun", "p95 µs", "RSS +MiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
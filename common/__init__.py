@@ -0,0 +1,6 @@
+"""
+Shared helpers for the topic apps.
+===================================
+Import the submodules directly (e.g. ``from common.tiered_cache import tiered_cache``)
+so a page only pays for the helpers it actually uses.
+"""
@@ -0,0 +1,111 @@
+"""
+Micro-batching request coalescer
+=================================
+Many sessions calling a shared model one item at a time pay the per-call
+overhead (dispatch, padding, device sync) once per item. ``MicroBatcher``
+collects single-item requests from any thread for up to ``max_wait`` seconds
+or ``max_batch`` items, runs them through one ``batch_fn(list)`` call and
+hands each caller its own result.
+
+    batcher = MicroBatcher(model.predict_batch, max_batch=64, max_wait=0.005)
+    label = batcher("Streamlit is awesome!")     # blocks ≤ max_wait + batch time
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BatchStats:
+    """Counters reported by :meth:`MicroBatcher.stats`."""
+
+    batches: int = 0
+    items: int = 0
+    largest_batch: int = 0
+
+    @property
+    def mean_batch(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesces concurrent ``submit(item)`` calls into ``batch_fn(items)`` calls."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[T]], Sequence[R]],
+        *,
+        max_batch: int = 64,
+        max_wait: float = 0.005,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: queue.SimpleQueue[tuple[T, Future]] = queue.SimpleQueue()
+        self._stats = BatchStats()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, item: T) -> Future:
+        """Queue ``item``; the future resolves with its entry of the batch result."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item: T, timeout: float | None = None) -> R:
+        return self.submit(item).result(timeout)
+
+    def stats(self) -> BatchStats:
+        return BatchStats(**vars(self._stats))
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="micro-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]  # Sleep until there is work.
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[tuple[T, Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = self.batch_fn(items)
+            if len(results) != len(items):
+                raise ValueError(
+                    f"batch_fn returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        self._stats.batches += 1
+        self._stats.items += len(items)
+        self._stats.largest_batch = max(self._stats.largest_batch, len(items))
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,68 @@
+"""
+Cache keys
+===========
+A small, hashable description of "which result is this" that every cache in
+``common/`` agrees on: a namespace (usually the loader name) plus the call's
+arguments. ``digest()`` gives a stable file name for on-disk tiers.
+
+``content_hash()`` hashes the *data* itself (DataFrames, arrays, bytes, plain
+Python values) for caches that key on content rather than on call arguments.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+import sys
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Namespace + positional args + sorted keyword args."""
+
+    namespace: str
+    args: tuple[Hashable, ...] = ()
+    kwargs: tuple[tuple[str, Hashable], ...] = ()
+
+    @classmethod
+    def of(cls, namespace: str, *args: Any, **kwargs: Any) -> "CacheKey":
+        return cls(namespace, tuple(args), tuple(sorted(kwargs.items())))
+
+    def digest(self) -> str:
+        """Stable across processes (unlike ``hash()``), so usable as a file name."""
+        return key_digest(self)
+
+
+def key_digest(key: Hashable) -> str:
+    """Stable hex digest of any key with a deterministic ``repr``."""
+    return hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+
+
+def content_hash(value: Any) -> str:
+    """Stable hex digest of a value's content.
+
+    pandas objects are hashed row-wise with ``pd.util.hash_pandas_object``
+    (vectorized, no pickling); arrays by their raw bytes; anything else by its
+    pickle.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        h.update(value)
+        return h.hexdigest()
+
+    # Only a module that's already imported can have produced ``value``.
+    np, pd = sys.modules.get("numpy"), sys.modules.get("pandas")
+    if pd is not None and isinstance(value, pd.DataFrame):
+        h.update(repr((list(value.columns), list(value.dtypes.astype(str)))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif pd is not None and isinstance(value, (pd.Series, pd.Index)):
+        h.update(repr((value.name, str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif np is not None and isinstance(value, np.ndarray) and value.dtype != object:
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    else:
+        h.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    return h.hexdigest()
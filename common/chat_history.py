@@ -0,0 +1,72 @@
+"""
+Windowed chat history
+======================
+Rendering every message as its own ``st.chat_message`` re-sends the whole
+thread on every rerun. ``render_history`` keeps the per-rerun cost flat:
+
+  • only the most recent messages get live ``st.chat_message`` bubbles
+    (at least ``window``, rounded back to a block boundary)
+  • older messages are hidden behind a "Load older" pager; each loaded block
+    of ``block_size`` messages is one collapsed expander holding a single
+    pre-rendered markdown string
+  • blocks sit on fixed boundaries (0–49, 50–99, …), so their markdown is
+    cached per session by message range and never rebuilt as the chat grows
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import streamlit as st
+
+ROLE_LABELS = {"user": "🧑 **You**", "assistant": "🤖 **Assistant**"}
+
+
+def _block_markdown(messages: Sequence[Mapping[str, str]], start: int, stop: int) -> str:
+    return "\n\n---\n\n".join(
+        f"{ROLE_LABELS.get(m['role'], m['role'])}  \n{m['content']}"
+        for m in (messages[i] for i in range(start, stop))
+    )
+
+
+def render_history(
+    messages: Sequence[Mapping[str, str]],
+    *,
+    window: int = 30,
+    block_size: int = 50,
+    key: str = "chat_history",
+) -> None:
+    """Render the tail of ``messages`` live and older blocks on demand."""
+    state = st.session_state.setdefault(f"_{key}", {"older_blocks": 0, "blocks": {}})
+    total = len(messages)
+    live_start = max(total - window, 0) // block_size * block_size
+
+    loaded_start = max(live_start - state["older_blocks"] * block_size, 0)
+    if loaded_start > 0:
+        if st.button(
+            f"⬆️ Load older messages ({loaded_start:,} hidden)",
+            key=f"{key}_load_older",
+            use_container_width=True,
+        ):
+            state["older_blocks"] += 1
+            st.rerun()
+
+    for start in range(loaded_start, live_start, block_size):
+        stop = start + block_size
+        # Boundary messages guard against a reused range after "New Chat".
+        cache_key = (start, stop, messages[start]["content"], messages[stop - 1]["content"])
+        markdown = state["blocks"].get(cache_key)
+        if markdown is None:
+            markdown = state["blocks"][cache_key] = _block_markdown(messages, start, stop)
+        with st.expander(f"Messages {start + 1:,}–{stop:,}"):
+            st.markdown(markdown)
+
+    for i in range(live_start, total):
+        message = messages[i]
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+
+def reset_history(key: str = "chat_history") -> None:
+    """Forget loaded pages and cached blocks, e.g. when a new chat starts."""
+    st.session_state.pop(f"_{key}", None)
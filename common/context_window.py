@@ -0,0 +1,232 @@
+"""
+Token-budgeted context windows
+===============================
+What the chat page sends to a model each turn, without re-reading the whole
+thread:
+
+  • ``TokenCounter``  → token counts cached per message (``array("I")``); a
+                        turn only tokenizes the messages added since the last
+  • ``ContextWindow`` → the newest messages that fit a model's budget; the
+                        window's start only moves forward, so each turn costs
+                        O(new tokens) however long the thread gets
+  • rolling summary   → turns that slide out of the window are folded into a
+                        short summary on a background thread; a turn never
+                        waits for it, it uses the latest summary that is ready
+
+``context_for(messages, model=..., budget=...)`` keeps one counter per session
+and one window per model, so switching ``llm_choice`` switches budgets. A new
+window is placed by walking back from the newest message over the cached
+counts, and takes over the summary of the window used before it, so a switch
+doesn't re-read the thread from the start.
+"""
+
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Mapping, Sequence
+
+import streamlit as st
+
+from common.llm_backend import tokenize
+
+Summarizer = Callable[[str, list[Mapping[str, str]], int], str]
+
+_SUMMARIZER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="context-summary")
+
+
+def count_tokens(text: str) -> int:
+    """Tokens as the offline backend streams them (swap in a model tokenizer here)."""
+    return len(tokenize(text))
+
+
+def extractive_summary(previous: str, turns: list[Mapping[str, str]], max_tokens: int) -> str:
+    """One line per evicted turn (its opening words), oldest lines dropped past ``max_tokens``."""
+    lines = previous.splitlines()
+    for turn in turns:
+        words = turn["content"].split()
+        gist = " ".join(words[:16]) + (" …" if len(words) > 16 else "")
+        lines.append(f"- {turn['role']}: {gist}")
+    kept, used = [], 0
+    for line in reversed(lines):
+        used += count_tokens(line)
+        if used > max_tokens:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+
+class TokenCounter:
+    """Per-message token counts, extended incrementally as the thread grows."""
+
+    def __init__(self, count: Callable[[str], int] = count_tokens):
+        self.count = count
+        self.counts = array("I")
+
+    def sync(self, messages: Sequence[Mapping[str, str]]) -> int:
+        """Count messages added since the last call; returns the new tokens."""
+        if len(messages) < len(self.counts):  # A different (shorter) thread
+            self.counts = array("I")
+        new_tokens = 0
+        for i in range(len(self.counts), len(messages)):
+            n = self.count(messages[i]["content"])
+            self.counts.append(n)
+            new_tokens += n
+        return new_tokens
+
+
+@dataclass
+class Context:
+    messages: list[dict[str, str]]  # Ready for a chat API: summary (as system) + window
+    tokens: int
+    budget: int
+    window: int  # Messages sent verbatim
+    summarized: int  # Older messages folded into the summary
+    pending: int  # Evicted messages the summary hasn't caught up with yet
+    new_tokens: int  # Tokens counted this turn
+
+
+class ContextWindow:
+    """The newest messages that fit ``budget - reserve`` tokens, plus a rolling summary."""
+
+    def __init__(
+        self,
+        counter: TokenCounter,
+        budget: int,
+        *,
+        reserve: int = 256,
+        summary_share: float = 0.15,
+        summarize: Summarizer = extractive_summary,
+        seed: ContextWindow | None = None,
+    ):
+        self.counter = counter
+        self.budget = budget
+        self.reserve = reserve  # Left free for the reply
+        self.summary_tokens_max = int(budget * summary_share)
+        self.summarize = summarize
+        self._reset()
+        self._seed = seed  # Window over the same thread whose summary this one continues
+
+    def _reset(self) -> None:
+        self.start = 0  # First message in the window
+        self.end = 0  # One past the last message counted into the window
+        self.window_tokens = 0
+        self.summary = ""
+        self.summary_tokens = 0
+        self.summarized = 0
+        self._backlog: list[Mapping[str, str]] = []
+        self._job: Future | None = None
+        self._job_size = 0
+
+    def build(self, messages: Sequence[Mapping[str, str]]) -> Context:
+        new_tokens = self.counter.sync(messages)
+        counts = self.counter.counts
+        if len(counts) < self.end:  # Thread was replaced; start over
+            self._reset()
+            self._seed = None
+        self._collect_summary()
+
+        total = len(counts)
+        limit = self.budget - self.reserve - self.summary_tokens_max
+        if self.end == 0 and total:
+            self._start_at_tail(messages, limit)
+        self.window_tokens += sum(counts[self.end:total])
+        self.end = total
+        while self.start < total - 1 and self.window_tokens > limit:
+            self.window_tokens -= counts[self.start]
+            self._backlog.append(messages[self.start])
+            self.start += 1
+        self._schedule_summary()
+
+        records = [{"role": m["role"], "content": m["content"]}
+                   for m in (messages[i] for i in range(self.start, total))]
+        if self.summary:
+            records.insert(0, {
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n{self.summary}",
+            })
+        return Context(
+            messages=records,
+            tokens=self.window_tokens + self.summary_tokens,
+            budget=self.budget,
+            window=total - self.start,
+            summarized=self.summarized,
+            pending=self.start - self.summarized,
+            new_tokens=new_tokens,
+        )
+
+    def _start_at_tail(self, messages: Sequence[Mapping[str, str]], limit: int) -> None:
+        """Place a fresh window from the newest message back, using cached counts only."""
+        counts = self.counter.counts
+        total = len(counts)
+        start, tokens = total - 1, counts[total - 1]
+        while start > 0 and tokens + counts[start - 1] <= limit:
+            start -= 1
+            tokens += counts[start]
+        self.start, self.end, self.window_tokens = start, total, tokens
+
+        seed, self._seed = self._seed, None
+        covered = 0  # Messages already in the inherited summary
+        if seed is not None:
+            seed._collect_summary()
+            covered = seed.summarized
+            self.summary, self.summary_tokens = seed.summary, seed.summary_tokens
+            if self.summary_tokens > self.summary_tokens_max:  # Smaller budget: trim it to fit
+                self.summary = self.summarize(self.summary, [], self.summary_tokens_max)
+                self.summary_tokens = count_tokens(self.summary)
+        # Only turns between the summary and the window are read (and summarized).
+        self.summarized = min(covered, start)
+        self._backlog = [messages[i] for i in range(covered, start)]
+
+    def _collect_summary(self) -> None:
+        if self._job is None or not self._job.done():
+            return
+        job, self._job = self._job, None
+        try:
+            self.summary = job.result()
+        except Exception:  # Keep the previous summary; the turns stay lost to it
+            pass
+        else:
+            self.summary_tokens = count_tokens(self.summary)
+        self.summarized += self._job_size
+
+    def _schedule_summary(self) -> None:
+        if self._job is not None or not self._backlog:
+            return
+        turns, self._backlog = self._backlog, []
+        self._job_size = len(turns)
+        self._job = _SUMMARIZER.submit(self.summarize, self.summary, turns, self.summary_tokens_max)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until evicted turns are summarized (benchmarks and tests)."""
+        while self._job is not None or self._backlog:
+            if self._job is not None:
+                self._job.exception(timeout)
+            self._collect_summary()
+            self._schedule_summary()
+
+
+def context_for(
+    messages: Sequence[Mapping[str, str]],
+    *,
+    model: str,
+    budget: int,
+    reserve: int = 256,
+    key: str = "chat_context",
+) -> Context:
+    """Build this turn's context for ``model`` from the session's cached state."""
+    state = st.session_state.setdefault(f"_{key}", {"counter": TokenCounter(), "windows": {}})
+    window = state["windows"].get(model)
+    if window is None or window.budget != budget or window.reserve != reserve:
+        seed = window or state["windows"].get(state.get("last_model"))
+        window = state["windows"][model] = ContextWindow(
+            state["counter"], budget, reserve=reserve, seed=seed
+        )
+    state["last_model"] = model
+    return window.build(messages)
+
+
+def reset_context(key: str = "chat_context") -> None:
+    """Drop cached counts, windows and summaries, e.g. when another thread opens."""
+    st.session_state.pop(f"_{key}", None)
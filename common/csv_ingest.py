@@ -0,0 +1,219 @@
+"""
+Streaming CSV ingest
+=====================
+Reads an upload chunk by chunk (``pd.read_csv(chunksize=…)``) instead of
+materializing the whole file, so a 1 GB CSV shows its first rows at once and
+memory stays bounded by the chunk size:
+
+  • ``iter_csv_chunks`` → DataFrame chunks plus the fraction of bytes read
+  • ``CsvIngest``       → running row count and per-column stats (nulls,
+                          mean / std merged chunk by chunk, min / max) and
+                          what to keep of the rows:
+
+      keep="sample"     a uniform random sample of ``sample_rows`` rows
+                        (bottom-k on random keys, so it never grows)
+      keep="aggregate"  nothing but the head and the stats
+      keep="all"        every row (the old unbounded ``pd.read_csv``)
+
+pandas' chunked reader is used rather than pyarrow's streaming reader, which
+fixes each column's type from the first block and fails on later drift
+(e.g. an int column that turns float a million rows in).
+
+Finished results go into a parse cache keyed by the upload's *content* hash
+plus the parser options (``parse_key``), stored as Parquet through
+``TieredCache`` with byte-bounded memory and disk tiers, so the same file
+uploaded again, by anyone, skips parsing entirely.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import IO, Iterator, Literal
+
+from common.cache_keys import CacheKey, content_hash
+from common.lazy_import import lazy_import
+from common.tiered_cache import TieredCache, get_cache
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+Keep = Literal["sample", "aggregate", "all"]
+
+PARSE_CACHE_VERSION = 1  # Bump when CsvIngest's output changes
+
+
+def iter_csv_chunks(source: IO[bytes], *, chunk_rows: int = 100_000, **read_csv_kwargs) -> Iterator[tuple[pd.DataFrame, float]]:
+    """Yield ``(chunk, fraction_of_bytes_read)`` for a seekable binary file."""
+    source.seek(0, 2)
+    size = source.tell() or 1
+    source.seek(0)
+    with pd.read_csv(source, chunksize=chunk_rows, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            yield chunk, min(source.tell() / size, 1.0)
+
+
+class _Moments:
+    """count / mean / M2 merged per chunk (Chan et al.), plus min and max."""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        self.min, self.max = np.inf, -np.inf
+
+    def add(self, values: np.ndarray) -> None:
+        n = values.size
+        if not n:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+
+class CsvIngest:
+    """Accumulates chunks into a row count, column stats and a bounded view."""
+
+    def __init__(self, *, keep: Keep = "sample", sample_rows: int = 10_000, head_rows: int = 5, seed: int = 0):
+        self.keep = keep
+        self.sample_rows = sample_rows
+        self.head_rows = head_rows
+        self.rows = 0
+        self.chunks = 0
+        self.head: pd.DataFrame | None = None
+        self._nulls: dict[str, int] = {}
+        self._dtypes: dict[str, str] = {}
+        self._moments: dict[str, _Moments] = {}
+        self._kept: list[pd.DataFrame] = []
+        self._sample: pd.DataFrame | None = None
+        self._rng = np.random.default_rng(seed)
+        self._started = time.perf_counter()
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        if self.head is None:
+            self.head = chunk.head(self.head_rows)
+        first_row = self.rows
+        self.rows += len(chunk)
+        self.chunks += 1
+        for name, column in chunk.items():
+            self._nulls[name] = self._nulls.get(name, 0) + int(column.isna().sum())
+            if pd.api.types.is_bool_dtype(column):
+                kind = "bool"
+            elif pd.api.types.is_numeric_dtype(column):
+                kind = "numeric"
+            else:
+                kind = "text"
+            previous = self._dtypes.setdefault(name, kind)
+            if previous != kind:  # Type drifted between chunks: numeric stats stop
+                self._dtypes[name] = "mixed"
+                self._moments.pop(name, None)
+            elif kind == "numeric":
+                values = column.to_numpy(dtype="float64", na_value=np.nan)
+                self._moments.setdefault(name, _Moments()).add(values[~np.isnan(values)])
+
+        if self.keep == "all":
+            self._kept.append(chunk)
+        elif self.keep == "sample":
+            keyed = chunk.assign(
+                __key=self._rng.random(len(chunk)),
+                __row=np.arange(first_row, self.rows),
+            )
+            pool = keyed if self._sample is None else pd.concat([self._sample, keyed], ignore_index=True)
+            self._sample = pool.nsmallest(self.sample_rows, "__key") if len(pool) > self.sample_rows else pool
+
+    @property
+    def seconds(self) -> float:
+        return time.perf_counter() - self._started
+
+    def stats(self) -> pd.DataFrame:
+        """One row per column: dtype, non-null count, nulls and numeric summary."""
+        rows = []
+        for name, nulls in self._nulls.items():
+            moments = self._moments.get(name)
+            row = {"column": name, "dtype": self._dtypes[name], "non_null": self.rows - nulls, "nulls": nulls}
+            if moments is not None and moments.count:
+                row.update(
+                    mean=moments.mean,
+                    std=(moments.m2 / (moments.count - 1)) ** 0.5 if moments.count > 1 else 0.0,
+                    min=moments.min,
+                    max=moments.max,
+                )
+            rows.append(row)
+        return pd.DataFrame(rows, columns=["column", "dtype", "non_null", "nulls", "mean", "std", "min", "max"])
+
+    def frame(self) -> pd.DataFrame | None:
+        """The rows kept under ``keep`` (``None`` for ``"aggregate"``)."""
+        if self.keep == "all":
+            return pd.concat(self._kept, ignore_index=True) if self._kept else self.head
+        if self.keep == "sample" and self._sample is not None:
+            ordered = self._sample.sort_values("__row")  # Back in file order
+            return ordered.drop(columns=["__key", "__row"]).reset_index(drop=True)
+        return None
+
+
+@dataclass
+class IngestResult:
+    rows: int
+    columns: int
+    head: pd.DataFrame
+    stats: pd.DataFrame
+    frame: pd.DataFrame | None
+    keep: Keep
+    seconds: float
+    cached: bool = False
+
+    @classmethod
+    def from_ingest(cls, ingest: CsvIngest) -> "IngestResult":
+        head = ingest.head if ingest.head is not None else pd.DataFrame()
+        return cls(ingest.rows, head.shape[1], head, ingest.stats(), ingest.frame(), ingest.keep, ingest.seconds)
+
+
+# ── parse cache ─────────────────────────────────────────────────────────────
+def parse_cache() -> TieredCache:
+    """Process-wide cache of parsed uploads: 256 MB in memory, 2 GB on disk.
+
+    Parquet files are written on a background thread, off the upload's rerun.
+    """
+    return get_cache("csv_parse", max_bytes=256 * 2**20, max_disk_bytes=2 * 2**30, write_behind=True)
+
+
+def parse_key(data: bytes | memoryview, *, keep: Keep, sample_rows: int, **read_csv_kwargs) -> CacheKey:
+    """Cache key for parsing ``data`` with these options (content, not file name)."""
+    return CacheKey.of(
+        "csv_parse", content_hash(data), PARSE_CACHE_VERSION,
+        keep=keep, sample_rows=sample_rows, **read_csv_kwargs,
+    )
+
+
+def load_parsed(key: CacheKey) -> IngestResult | None:
+    """The cached result for ``key``, or ``None`` if any part of it is missing."""
+    start = time.perf_counter()
+    cache = parse_cache()
+    head, stats = cache.get((key, "head")), cache.get((key, "stats"))
+    keep = dict(key.kwargs)["keep"]
+    frame = cache.get((key, "frame")) if keep != "aggregate" else None
+    if head is None or stats is None or (keep != "aggregate" and frame is None):
+        return None
+    rows = int(stats["non_null"].iloc[0] + stats["nulls"].iloc[0]) if len(stats) else 0
+    return IngestResult(rows, head.shape[1], head, stats, frame, keep,
+                        time.perf_counter() - start, cached=True)
+
+
+def store_parsed(key: CacheKey, result: IngestResult) -> IngestResult:
+    """Write ``result`` to the parse cache; returns it backed by the frozen frames.
+
+    The cache takes over ``result``'s frames rather than copying them (a
+    ``keep="all"`` frame would otherwise be held twice).
+    """
+    cache = parse_cache()
+    result.head = cache.put((key, "head"), result.head, copy=False)
+    result.stats = cache.put((key, "stats"), result.stats, copy=False)
+    if result.frame is not None:
+        result.frame = cache.put((key, "frame"), result.frame, copy=False)
+    return result
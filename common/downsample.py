@@ -0,0 +1,140 @@
+"""
+Time-series downsampling for charts
+====================================
+A line chart a few hundred pixels wide can't show millions of points, but
+``st.line_chart`` still ships all of them to the browser. These pick the
+points that matter, vectorized in NumPy:
+
+  • ``minmax_indices`` → the min and max of each bucket (one bucket per
+                         pixel column): spikes and envelopes survive exactly
+  • ``lttb_indices``   → Largest-Triangle-Three-Buckets: one point per
+                         bucket, the one spanning the largest triangle with
+                         its neighbours; candidates are preselected with
+                         min/max first (MinMaxLTTB), so the sequential pass
+                         only looks at ~4 points per bucket
+  • ``downsample_frame`` → slices a zoom range with ``searchsorted`` and
+                         downsamples every column to a budget derived from the
+                         chart's pixel width; results are cached per
+                         (series key, zoom range, width, method)
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Literal
+
+from common.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+Method = Literal["minmax", "lttb"]
+
+_CACHE: OrderedDict[Hashable, pd.DataFrame] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_CACHE_ENTRIES = 64
+
+
+def points_for_width(width_px: int, method: Method = "minmax") -> int:
+    """Point budget for a chart ``width_px`` wide: 2 per pixel for min/max, 1 for LTTB."""
+    return max(width_px * (2 if method == "minmax" else 1), 4)
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Sorted indices of each bucket's min and max (``n_out // 2`` buckets), plus the ends."""
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n <= n_out or n < 2 * buckets:
+        return np.arange(n)
+    size = n // buckets
+    body = y[: size * buckets].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    picked = [offsets + body.argmin(axis=1), offsets + body.argmax(axis=1), [0, n - 1]]
+    if size * buckets < n:  # Leftover tail becomes one more (short) bucket
+        tail = y[size * buckets:]
+        picked.append([size * buckets + tail.argmin(), size * buckets + tail.argmax()])
+    return np.unique(np.concatenate(picked))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int, *, preselect: bool = True) -> np.ndarray:
+    """Sorted indices of ``n_out`` points chosen by LTTB (first and last always kept)."""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    if preselect and n > 8 * n_out:  # MinMaxLTTB: shrink to ~4 candidates per output bucket first
+        candidates = minmax_indices(y, 4 * n_out)
+        return candidates[lttb_indices(x[candidates], y[candidates], n_out)]
+
+    x = x.astype(np.float64, copy=False)
+    y = y.astype(np.float64, copy=False)
+    # Buckets for the n - 2 interior points; first and last points are fixed.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+    # Mean of the *next* bucket for every bucket (the last one looks at the final point).
+    sums_x = np.add.reduceat(x[1:n - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], starts - 1)
+    counts = stops - starts
+    next_x = np.append(sums_x[1:] / counts[1:], x[-1])
+    next_y = np.append(sums_y[1:] / counts[1:], y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i, (lo, hi) in enumerate(zip(starts, stops)):
+        bx, by = x[lo:hi], y[lo:hi]
+        # Twice the triangle area (a, candidate, next-bucket mean); the constant factor doesn't matter.
+        area = np.abs((x[a] - next_x[i]) * (by - y[a]) - (x[a] - bx) * (next_y[i] - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def _as_float(index: pd.Index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    return np.asarray(index, dtype=np.float64)
+
+
+def downsample_frame(
+    df: pd.DataFrame,
+    *,
+    width_px: int = 1000,
+    method: Method = "minmax",
+    x_range: tuple | None = None,
+    series_key: Hashable | None = None,
+) -> pd.DataFrame:
+    """Rows of ``df`` (sorted index = x axis) worth drawing ``width_px`` wide.
+
+    Each column gets ``points_for_width(width_px) // n_columns`` points and the
+    union of the chosen rows is returned, so every column keeps its true
+    values. Pass ``series_key`` (anything that changes when the data does) to
+    cache the result per zoom range.
+    """
+    cache_key = (series_key, x_range, width_px, method) if series_key is not None else None
+    if cache_key is not None:
+        with _CACHE_LOCK:
+            cached = _CACHE.get(cache_key)
+            if cached is not None:
+                _CACHE.move_to_end(cache_key)
+                return cached
+
+    if x_range is not None:
+        lo, hi = df.index.searchsorted(x_range[0], "left"), df.index.searchsorted(x_range[1], "right")
+        df = df.iloc[lo:hi]
+    budget = max(points_for_width(width_px, method) // max(df.shape[1], 1), 4)
+    if len(df) > budget:
+        x = _as_float(df.index)
+        picked = [
+            minmax_indices(df[c].to_numpy(), budget) if method == "minmax"
+            else lttb_indices(x, df[c].to_numpy(), budget)
+            for c in df.columns
+        ]
+        df = df.iloc[np.unique(np.concatenate(picked))]
+
+    if cache_key is not None:
+        with _CACHE_LOCK:
+            _CACHE[cache_key] = df
+            if len(_CACHE) > _CACHE_ENTRIES:
+                _CACHE.popitem(last=False)
+    return df
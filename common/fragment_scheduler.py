@@ -0,0 +1,186 @@
+"""
+Adaptive fragment scheduler
+============================
+Live tiles that poll a data source without rerunning the whole script.
+
+  • One ``@st.fragment(run_every=…)`` drives every tile registered on the
+    scheduler, so tiles that fall due in the same run share one fragment rerun
+  • Each tile polls on its own interval; when the content hash of what it
+    polled is unchanged the interval backs off (× ``backoff``, up to
+    ``max_interval``), and it snaps back to ``min_interval`` on a change
+  • The fragment itself reruns every *shortest tile interval* (never faster
+    than ``tick``), so once every tile has backed off an idle session's reruns
+    back off too. ``run_every`` is fixed when the fragment is defined: when it
+    should change, a fragment run asks for one full rerun to redefine it
+  • Runs where a tile isn't due just re-emit its last value — no polling
+
+The timing logic lives in :class:`AdaptiveSchedule`, which knows nothing about
+Streamlit, so it can be driven with a simulated clock (see
+``benchmarks/bench_fragment_scheduler.py``).
+
+    scheduler = get_scheduler("live_tiles", tick=1.0)
+    scheduler.register("users", poll=read_users, render=show_users, max_interval=16)
+    scheduler.run()
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import streamlit as st
+
+from common.cache_keys import content_hash
+
+_STATE_PREFIX = "_fragment_scheduler_"
+
+
+@dataclass
+class Tile:
+    """One polled data source plus its adaptive timing state."""
+
+    name: str
+    poll: Callable[[], Any]
+    render: Callable[[Any], None]
+    min_interval: float = 1.0
+    max_interval: float = 30.0
+    backoff: float = 2.0
+    interval: float = 0.0
+    next_due: float = 0.0
+    last_hash: str | None = None
+    value: Any = None
+    polls: int = 0
+    changes: int = 0
+    last_change: float | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        self.interval = self.interval or self.min_interval
+
+
+class AdaptiveSchedule:
+    """Decides which tiles to poll at a given time and adapts their intervals."""
+
+    def __init__(self) -> None:
+        self.tiles: dict[str, Tile] = {}
+
+    def add(self, tile: Tile) -> Tile:
+        """Register ``tile``, or refresh the callables of an existing one by name.
+
+        Timing state survives re-registration, which happens on every full rerun.
+        """
+        existing = self.tiles.get(tile.name)
+        if existing is None:
+            self.tiles[tile.name] = tile
+            return tile
+        existing.poll, existing.render = tile.poll, tile.render
+        existing.min_interval, existing.max_interval = tile.min_interval, tile.max_interval
+        existing.backoff = tile.backoff
+        existing.interval = min(max(existing.interval, tile.min_interval), tile.max_interval)
+        return existing
+
+    def due(self, now: float) -> list[Tile]:
+        return [t for t in self.tiles.values() if t.next_due <= now]
+
+    def poll_due(self, now: float) -> list[Tile]:
+        """Poll every tile that is due at ``now`` (one batch) and return them."""
+        polled = self.due(now)
+        for tile in polled:
+            value = tile.poll()
+            digest = content_hash(value)
+            tile.polls += 1
+            if digest != tile.last_hash:
+                tile.changes += tile.last_hash is not None
+                tile.last_change = now
+                tile.last_hash, tile.value = digest, value
+                tile.interval = tile.min_interval
+            else:
+                tile.interval = min(tile.interval * tile.backoff, tile.max_interval)
+            tile.next_due = now + tile.interval
+        return polled
+
+    def next_due(self) -> float | None:
+        return min((t.next_due for t in self.tiles.values()), default=None)
+
+    def run_every(self, floor: float) -> float:
+        """How often to check for due tiles: the shortest tile interval, at least ``floor``.
+
+        A tile is polled on the first check at or after it falls due, so it may
+        poll up to one check late; only backed-off (unchanged) tiles run long checks.
+        """
+        return max(min((t.interval for t in self.tiles.values()), default=floor), floor)
+
+
+class FragmentScheduler:
+    """Per-session :class:`AdaptiveSchedule` rendered by one ticking fragment."""
+
+    def __init__(self, name: str, tick: float = 1.0):
+        self.name = name
+        self.tick = tick
+        self.schedule = AdaptiveSchedule()
+        self.ticks = 0
+        self.polls_last_tick = 0
+        self.run_every = tick
+        self.full_reruns = 0  # Requested to change run_every
+        self._inline = False
+
+    def register(
+        self,
+        name: str,
+        *,
+        poll: Callable[[], Any],
+        render: Callable[[Any], None],
+        min_interval: float | None = None,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+    ) -> Tile:
+        """Add a tile; ``min_interval`` defaults to (and can't beat) the tick."""
+        min_interval = max(min_interval or self.tick, self.tick)
+        return self.schedule.add(Tile(
+            name, poll, render,
+            min_interval=min_interval, max_interval=max(max_interval, min_interval),
+            backoff=backoff,
+        ))
+
+    def run(self, columns: int | None = None, show_timing: bool = True) -> None:
+        """Define and call the fragment that renders all tiles, ``columns`` per row."""
+        run_every = self.run_every = self.schedule.run_every(self.tick)
+
+        @st.fragment(run_every=run_every)
+        def _tick() -> None:
+            now = time.time()
+            self.ticks += 1
+            self.polls_last_tick = len(self.schedule.poll_due(now))
+            tiles = list(self.schedule.tiles.values())
+            if tiles:
+                per_row = columns or len(tiles)
+                for row in range(0, len(tiles), per_row):  # Wrap into rows of ``columns`` tiles
+                    for col, tile in zip(st.columns(per_row), tiles[row:row + per_row]):
+                        with col:
+                            tile.render(tile.value)
+                            if show_timing:
+                                st.caption(
+                                    f"every {tile.interval:g}s · next in "
+                                    f"{max(tile.next_due - now, 0):.0f}s · {tile.polls} polls"
+                                )
+            # The browser keeps rerunning this fragment every ``run_every`` s;
+            # only a full run can define it again with another interval.
+            if not self._inline and self.schedule.run_every(self.tick) != run_every:
+                self.full_reruns += 1
+                st.rerun()
+
+        self._inline = True  # Part of a full run: it picks up the new interval itself next time
+        try:
+            _tick()
+        finally:
+            self._inline = False
+
+
+def get_scheduler(name: str, tick: float = 1.0) -> FragmentScheduler:
+    """The current session's scheduler called ``name`` (created on first use)."""
+    key = _STATE_PREFIX + name
+    if key not in st.session_state:
+        st.session_state[key] = FragmentScheduler(name, tick)
+    scheduler = st.session_state[key]
+    scheduler.tick = tick
+    return scheduler
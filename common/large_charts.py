@@ -0,0 +1,180 @@
+"""
+Large-data scatter charts for Vega-Lite / Altair
+=================================================
+``st.altair_chart`` serializes every point it is given: at a few hundred
+thousand points the chart costs megabytes per rerun and the browser stalls.
+``scatter_spec`` reduces the data on the server first, chosen by point count:
+
+  • ≤ ``SAMPLE_ABOVE``  → every point, as is
+  • ≤ ``BIN_ABOVE``     → a uniform random sample of ``SAMPLE_ABOVE`` points
+  • larger              → a 2D histogram (heatmap of counts), binned with one
+                          vectorized ``np.bincount`` over the flattened cell ids
+
+The reduced data is serialized to Arrow once per content hash and the Altair
+chart is compiled to a spec once per (data, encoding). The spec only
+references the payload by name (``{"data": {"name": …}}``), so specs that
+share data share one payload and a rerun sends the cached bytes as they are.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Literal
+
+from common.cache_keys import content_hash, key_digest
+from common.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+
+SAMPLE_ABOVE = 5_000
+BIN_ABOVE = 200_000
+
+Mode = Literal["points", "sample", "binned"]
+
+_PAYLOADS: OrderedDict[Hashable, "Payload"] = OrderedDict()
+_SPECS: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+_LOCK = threading.Lock()
+_MAX_ENTRIES = 16
+
+
+@dataclass
+class Payload:
+    name: str  # Dataset name the specs reference
+    mode: Mode
+    rows: int  # Points in the source data
+    frame: pd.DataFrame  # Reduced data
+    arrow: bytes  # ``frame`` serialized once
+    seconds: float  # Time to reduce + serialize
+
+
+def sample_indices(n: int, k: int, seed: int = 0) -> np.ndarray:
+    """Sorted positions of a uniform random sample of ``k`` out of ``n`` rows."""
+    if n <= k:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(seed).choice(n, k, replace=False))
+
+
+def bin_2d(x: np.ndarray, y: np.ndarray, bins: tuple[int, int] = (120, 80)) -> pd.DataFrame:
+    """Counts per cell of a ``bins`` grid over the data's extent (empty cells dropped).
+
+    Columns: ``x0``, ``x1``, ``y0``, ``y1`` (cell edges) and ``count``.
+    """
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    bx, by = bins
+    if not len(x):
+        return pd.DataFrame(columns=["x0", "x1", "y0", "y1", "count"])
+    x_lo, x_hi, y_lo, y_hi = x.min(), x.max(), y.min(), y.max()
+    x_step = (x_hi - x_lo) / bx or 1.0
+    y_step = (y_hi - y_lo) / by or 1.0
+    ix = np.minimum(((x - x_lo) / x_step).astype(np.int64), bx - 1)
+    iy = np.minimum(((y - y_lo) / y_step).astype(np.int64), by - 1)
+    counts = np.bincount(ix * by + iy, minlength=bx * by)
+    cells = np.flatnonzero(counts)
+    cx, cy = np.divmod(cells, by)
+    return pd.DataFrame({
+        "x0": x_lo + cx * x_step, "x1": x_lo + (cx + 1) * x_step,
+        "y0": y_lo + cy * y_step, "y1": y_lo + (cy + 1) * y_step,
+        "count": counts[cells],
+    })
+
+
+def arrow_bytes(frame: pd.DataFrame) -> bytes:
+    """``frame`` as an Arrow IPC stream, the format Vega-Lite datasets are sent in."""
+    table = pa.Table.from_pandas(frame)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _remember(store: OrderedDict, key: Hashable, value: Any) -> Any:
+    with _LOCK:
+        store[key] = value
+        if len(store) > _MAX_ENTRIES:
+            store.popitem(last=False)
+    return value
+
+
+def _cached(store: OrderedDict, key: Hashable) -> Any:
+    with _LOCK:
+        value = store.get(key)
+        if value is not None:
+            store.move_to_end(key)
+        return value
+
+
+def scatter_payload(df: pd.DataFrame, x: str, y: str, *, data_key: Hashable | None = None,
+                    bins: tuple[int, int] = (120, 80)) -> Payload:
+    """Reduced, Arrow-serialized data for a scatter of ``df[x]`` vs ``df[y]``.
+
+    Cached by content hash of the two columns, or by ``data_key`` when given
+    (skips hashing; it must change whenever the data does).
+    """
+    xs, ys = df[x].to_numpy(np.float64), df[y].to_numpy(np.float64)
+    digest = key_digest(data_key) if data_key is not None else content_hash(xs) + content_hash(ys)
+    key = (digest, x, y, bins)
+    payload = _cached(_PAYLOADS, key)
+    if payload is not None:
+        return payload
+
+    start = time.perf_counter()
+    n = len(xs)
+    if n <= SAMPLE_ABOVE:
+        mode, frame = "points", pd.DataFrame({x: xs, y: ys})
+    elif n <= BIN_ABOVE:
+        picked = sample_indices(n, SAMPLE_ABOVE)
+        mode, frame = "sample", pd.DataFrame({x: xs[picked], y: ys[picked]})
+    else:
+        mode, frame = "binned", bin_2d(xs, ys, bins)
+    arrow = arrow_bytes(frame)
+    name = f"data-{key_digest(key)[:16]}"
+    return _remember(_PAYLOADS, key, Payload(name, mode, n, frame, arrow, time.perf_counter() - start))
+
+
+def scatter_spec(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    *,
+    title: str = "",
+    color: str = "#00e5a0",
+    height: int = 350,
+    data_key: Hashable | None = None,
+) -> tuple[dict[str, Any], Payload]:
+    """Vega-Lite spec for ``st.vega_lite_chart`` plus the payload it references.
+
+    Points and samples are drawn as circles; binned data as a heatmap of
+    counts on the same axes.
+    """
+    payload = scatter_payload(df, x, y, data_key=data_key)
+    key = (payload.name, x, y, title, color, height)
+    spec = _cached(_SPECS, key)
+    if spec is not None:
+        return spec, payload
+
+    import altair as alt
+
+    base = alt.Chart(alt.NamedData(name=payload.name))
+    if payload.mode == "binned":
+        chart = base.mark_rect().encode(
+            x=alt.X("x0:Q", title=x), x2="x1:Q",
+            y=alt.Y("y0:Q", title=y), y2="y1:Q",
+            color=alt.Color("count:Q", scale=alt.Scale(type="log", range=["#123b32", color]),
+                            legend=alt.Legend(title="points")),
+            tooltip=["count:Q"],
+        )
+    else:
+        chart = base.mark_circle(size=60 if payload.mode == "points" else 20, opacity=0.6).encode(
+            x=f"{x}:Q", y=f"{y}:Q", color=alt.value(color)
+        )
+    spec = chart.properties(title=title, width="container", height=height).to_dict()
+    spec.pop("config", None)  # Altair's default theme sizes; Streamlit drops them for its own charts too
+    spec["datasets"] = {payload.name: payload.arrow}  # Same bytes object for every spec on this data
+    return _remember(_SPECS, key, spec), payload
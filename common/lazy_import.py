@@ -0,0 +1,70 @@
+"""
+Deferred imports
+=================
+``import pandas`` costs ~0.4 s and every topic page (and most of ``common/``)
+imported it before drawing anything. ``lazy_import`` returns a stand-in
+module instead; the real import happens on the first attribute access
+(``pd.DataFrame``), so a page's title is on screen before the heavy
+libraries load, and code paths that never touch them never pay for them.
+
+    pd = lazy_import("pandas")
+    np = lazy_import("numpy")
+
+After loading, the stand-in copies the module's namespace, so later attribute
+reads cost the same as on the real module. Type annotations don't trigger a
+load in modules using ``from __future__ import annotations``.
+
+Set ``LABS_LAZY_IMPORTS=0`` to import eagerly (the benchmark baseline).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for module ``name``, imported on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            module = _import(self.__name__)
+            self.__dict__.update(module.__dict__)
+            self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        # Only reached for names not (yet) in our namespace.
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def _import(name: str) -> types.ModuleType:
+    # ``__import__`` rather than ``importlib.import_module``: only the former is
+    # reported by ``python -X importtime``, which ``bench_startup`` reads.
+    __import__(name)
+    return sys.modules[name]
+
+
+def lazy_enabled() -> bool:
+    return os.environ.get("LABS_LAZY_IMPORTS", "1") != "0"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Module ``name``, imported when first used (or right away if already imported)."""
+    if not lazy_enabled():
+        return _import(name)
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
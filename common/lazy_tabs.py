@@ -0,0 +1,59 @@
+"""
+Lazy tabs
+==========
+Plain ``st.tabs`` runs the body of every tab on every rerun, including the
+chart imports and builds of tabs nobody has opened. ``lazy_tabs`` takes one
+callable per tab instead:
+
+  • state    → the tabs get a ``key`` and ``on_change="rerun"``, so the
+               selected label lives in ``st.session_state[key]`` and
+               switching tabs reruns the page
+  • bodies   → only the open tab's callable runs, wrapped in a fragment:
+               a widget inside the tab reruns that tab alone
+  • prefetch → optional ``{label: warm}``; from the session's first
+               interaction on (not on its first run, so a cold load imports
+               only what the open tab needs), the ``warm`` callables of the
+               open tab's neighbours start on a background thread
+               (``common.preloader``, once per process) after it has
+               rendered. They must not call Streamlit: use them for imports
+               and process-wide caches
+
+    lazy_tabs({"📊 Plotly": plotly_tab, "📈 Altair": altair_tab}, key="charts",
+              prefetch={"📈 Altair": lambda: import_module("altair")})
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Mapping
+
+import streamlit as st
+
+from common.preloader import preload
+
+
+def lazy_tabs(
+    tabs: Mapping[str, Callable[[], None]],
+    *,
+    key: str,
+    default: str | None = None,
+    prefetch: Mapping[str, Callable[[], Any]] | None = None,
+) -> str:
+    """Render ``tabs`` ({label: body}) running only the open body; returns its label."""
+    labels = list(tabs)
+    containers = st.tabs(labels, key=key, default=default, on_change="rerun")
+    selected = labels[0]
+    for label, container in zip(labels, containers):
+        if container.open:
+            selected = label
+            with container:
+                st.fragment(tabs[label])()
+
+    first_run_key = f"_{key}_rendered"
+    first_run = first_run_key not in st.session_state
+    st.session_state[first_run_key] = True
+    if prefetch and not first_run:
+        i = labels.index(selected)
+        for neighbour in (labels[i - 1] if i else None, labels[i + 1] if i + 1 < len(labels) else None):
+            if neighbour in prefetch:
+                preload(prefetch[neighbour], name=f"lazy_tabs:{key}:{neighbour}")
+    return selected
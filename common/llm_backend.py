@@ -0,0 +1,113 @@
+"""
+Streaming response backends for the chat apps
+==============================================
+A backend is anything with ``stream(prompt, history) -> Iterator[str]``. The
+chat pages hand that iterator to ``st.write_stream`` so the assistant bubble
+fills in token by token, and ``MeteredStream`` records what users feel:
+
+  • time to first token (TTFT)
+  • tokens / second over the whole reply
+
+``FakeLLM`` is the offline stand-in: it streams a templated reply word by word
+with configurable first-token and per-token latency. Swap in a real client by
+implementing the same ``stream`` method.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Iterator, Mapping, Protocol, Sequence
+
+import streamlit as st
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+
+
+class ResponseBackend(Protocol):
+    def stream(self, prompt: str, history: Sequence[Mapping[str, str]]) -> Iterator[str]: ...
+
+
+def tokenize(text: str) -> list[str]:
+    """Whitespace-preserving word pieces: ``"".join(tokenize(t)) == t``."""
+    return _TOKEN.findall(text)
+
+
+class FakeLLM:
+    """Streams ``reply(prompt)`` word by word with simulated model latency."""
+
+    def __init__(
+        self,
+        reply: Callable[[str], str],
+        *,
+        first_token_latency: float = 0.35,
+        token_latency: float = 0.03,
+    ):
+        self.reply = reply
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+
+    def stream(self, prompt: str, history: Sequence[Mapping[str, str]] = ()) -> Iterator[str]:
+        time.sleep(self.first_token_latency)  # "Prompt processing"
+        for i, token in enumerate(tokenize(self.reply(prompt))):
+            if i:
+                time.sleep(self.token_latency)
+            yield token
+
+
+@dataclass
+class StreamMetrics:
+    ttft_s: float
+    total_s: float
+    tokens: int
+
+    @property
+    def tokens_per_s(self) -> float:
+        return self.tokens / self.total_s if self.total_s else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {**asdict(self), "tokens_per_s": self.tokens_per_s}
+
+
+class MeteredStream:
+    """Iterator wrapper that timestamps the first token and counts tokens."""
+
+    def __init__(self, tokens: Iterable[str]):
+        self._tokens = iter(tokens)
+        self._start = time.perf_counter()
+        self._first: float | None = None
+        self._end: float | None = None
+        self._count = 0
+
+    def __iter__(self) -> Iterator[str]:
+        for token in self._tokens:
+            if self._first is None:
+                self._first = time.perf_counter()
+            self._count += 1
+            yield token
+        self._end = time.perf_counter()
+
+    @property
+    def metrics(self) -> StreamMetrics:
+        end = self._end or time.perf_counter()
+        first = self._first or end
+        return StreamMetrics(first - self._start, end - self._start, self._count)
+
+
+def stream_reply(
+    backend: ResponseBackend,
+    prompt: str,
+    history: Sequence[Mapping[str, str]] = (),
+    *,
+    metrics_key: str = "response_metrics",
+) -> str:
+    """Stream ``backend``'s reply into the current container and return the text.
+
+    The reply's :class:`StreamMetrics` are appended to
+    ``st.session_state[metrics_key]``.
+    """
+    metered = MeteredStream(backend.stream(prompt, history))
+    text = st.write_stream(metered)
+    st.session_state.setdefault(metrics_key, []).append(metered.metrics.as_dict())
+    return text if isinstance(text, str) else "".join(map(str, text))
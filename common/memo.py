@@ -0,0 +1,59 @@
+"""
+Memoized section rendering
+===========================
+Every widget interaction reruns the whole script, so every section rebuilds
+its figures, frames and chart specs even when nothing it depends on changed.
+``memo_section`` keeps a section's heavy objects in ``st.session_state`` and
+only calls ``build()`` again when the content hash of ``deps`` changes; the
+page then re-emits its elements from the cached objects.
+
+    fig = memo_section("sales_bar", deps=[theme], build=lambda: make_figure(theme))
+    st.plotly_chart(fig)
+
+Set ``LABS_MEMO_SECTIONS=0`` to turn memoization off (used by
+``benchmarks/bench_memo_sections.py`` for the baseline).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Sequence, TypeVar
+
+import streamlit as st
+
+from common.cache_keys import content_hash
+
+T = TypeVar("T")
+
+_STATE_KEY = "_memo_sections"
+
+
+def memo_enabled() -> bool:
+    return os.environ.get("LABS_MEMO_SECTIONS", "1") != "0"
+
+
+def memo_section(key: str, deps: Sequence[Any] = (), *, build: Callable[[], T]) -> T:
+    """Return the cached result of ``build()`` for ``key`` while ``deps`` are unchanged.
+
+    Cached per session. ``deps`` should list every widget value or input the
+    section's objects are built from; an empty list means "build once".
+    """
+    if not memo_enabled():
+        return build()
+    store: dict[str, tuple[str, Any]] = st.session_state.setdefault(_STATE_KEY, {})
+    digest = content_hash(tuple(deps))
+    entry = store.get(key)
+    if entry is not None and entry[0] == digest:
+        return entry[1]
+    value = build()
+    store[key] = (digest, value)
+    return value
+
+
+def clear_memo(key: str | None = None) -> None:
+    """Forget one memoized section (or all of them) for this session."""
+    store = st.session_state.get(_STATE_KEY, {})
+    if key is None:
+        store.clear()
+    else:
+        store.pop(key, None)
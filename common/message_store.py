@@ -0,0 +1,181 @@
+"""
+Columnar chat message store
+============================
+A drop-in for the ``[{"role": ..., "content": ...}, ...]`` list the chat apps
+keep in ``st.session_state``, without a dict and two string objects per turn:
+
+  • roles    → one ``uint8`` per message (``array("B")``)
+  • contents → one append-only UTF-8 ``bytearray`` plus ``uint64`` end offsets
+
+Reading a message decodes just that slice and returns a small ``Message``
+record that still supports ``message["role"]`` / ``message["content"]``, so
+existing loops keep working:
+
+    store = MessageStore()
+    store.append({"role": "user", "content": "hi"})
+    for message in store[-20:]:
+        st.markdown(message["content"])
+"""
+
+from __future__ import annotations
+
+import struct
+from array import array
+from typing import Iterable, Iterator, Mapping, overload
+
+ROLES = ("user", "assistant", "system", "tool")
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+_HEADER = struct.Struct("<4sQ")  # magic, message count
+_MAGIC = b"MSG1"
+
+
+class Message:
+    """One message, readable like the dicts the store replaces."""
+
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: str, content: str):
+        self.role = role
+        self.content = content
+
+    def __getitem__(self, key: str) -> str:
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self) -> tuple[str, str]:
+        return self.__slots__
+
+    def as_dict(self) -> dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Message):
+            return (self.role, self.content) == (other.role, other.content)
+        if isinstance(other, Mapping):
+            return self.as_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content!r})"
+
+
+class MessageStore:
+    """Append-only, array-backed sequence of chat messages."""
+
+    __slots__ = ("_roles", "_ends", "_buffer")
+
+    def __init__(self, messages: Iterable[Mapping[str, str] | Message] = ()):
+        self._roles = array("B")
+        self._ends = array("Q")
+        self._buffer = bytearray()
+        self.extend(messages)
+
+    # ── writes ──────────────────────────────────────────────────────────────
+    def append(self, message: Mapping[str, str] | Message) -> None:
+        role = message["role"]
+        try:
+            code = _ROLE_CODES[role]
+        except KeyError:
+            raise ValueError(f"Unknown role {role!r}; expected one of {ROLES}") from None
+        self._buffer += message["content"].encode("utf-8")
+        self._roles.append(code)
+        self._ends.append(len(self._buffer))
+
+    def extend(self, messages: Iterable[Mapping[str, str] | Message]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def clear(self) -> None:
+        self._roles = array("B")
+        self._ends = array("Q")
+        self._buffer = bytearray()
+
+    # ── reads ───────────────────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self._roles)
+
+    def _span(self, i: int) -> tuple[int, int]:
+        return (self._ends[i - 1] if i else 0), self._ends[i]
+
+    def _message(self, i: int) -> Message:
+        start, end = self._span(i)
+        return Message(ROLES[self._roles[i]], self._buffer[start:end].decode("utf-8"))
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+    @overload
+    def __getitem__(self, index: slice) -> "MessageStore": ...
+
+    def __getitem__(self, index: int | slice) -> Message | "MessageStore":
+        if isinstance(index, slice):
+            first, stop, step = index.indices(len(self))
+            if step != 1:
+                return MessageStore(self._message(i) for i in range(first, stop, step))
+            part = MessageStore()
+            if stop > first:
+                base = self._span(first)[0]
+                part._roles = self._roles[first:stop]
+                part._ends = array("Q", (end - base for end in self._ends[first:stop]))
+                part._buffer = self._buffer[base:self._ends[stop - 1]]
+            return part
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        return self._message(index)
+
+    def __iter__(self) -> Iterator[Message]:
+        buffer, roles, start = self._buffer, self._roles, 0
+        for i, end in enumerate(self._ends):
+            yield Message(ROLES[roles[i]], buffer[start:end].decode("utf-8"))
+            start = end
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @property
+    def nbytes(self) -> int:
+        """Payload bytes held in the three columns."""
+        return (
+            self._roles.itemsize * len(self._roles)
+            + self._ends.itemsize * len(self._ends)
+            + len(self._buffer)
+        )
+
+    # ── serialization ───────────────────────────────────────────────────────
+    def to_bytes(self) -> bytes:
+        """Compact binary form: header, roles, offsets, UTF-8 contents."""
+        return b"".join((
+            _HEADER.pack(_MAGIC, len(self)),
+            self._roles.tobytes(),
+            self._ends.tobytes(),
+            bytes(self._buffer),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MessageStore":
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized MessageStore")
+        store = cls()
+        offset = _HEADER.size
+        store._roles.frombytes(data[offset:offset + count])
+        offset += count
+        store._ends.frombytes(data[offset:offset + 8 * count])
+        offset += 8 * count
+        store._buffer = bytearray(data[offset:])
+        return store
+
+    def to_records(self) -> list[dict[str, str]]:
+        """The equivalent list of dicts (e.g. for JSON or an LLM API call)."""
+        return [m.as_dict() for m in self]
+
+    def __reduce__(self):
+        return (MessageStore.from_bytes, (self.to_bytes(),))
+
+    def __repr__(self) -> str:
+        return f"MessageStore({len(self)} messages, {self.nbytes:,} bytes)"
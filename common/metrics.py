@@ -0,0 +1,301 @@
+"""
+Pre-aggregated KPI metrics
+===========================
+KPI cards usually sit on top of an aggregation over a large event table, and
+recomputing ``df[df.ts >= cutoff].groupby(...)`` on every rerun costs as much
+as the table is big. Here each KPI is declared once as a ``Metric`` (source,
+aggregation, window, comparison period) and ``MetricsEngine`` keeps its
+aggregates up to date as rows arrive:
+
+  • ingest   → new rows are bucketed by time (``bucket``, default one day)
+               and folded into per-bucket partials: sum + count, or the set of
+               distinct values; a batch costs O(rows in the batch)
+  • windows  → the current window and the comparison window keep running
+               totals; when time advances, buckets slide from one to the next
+               and fall off the end, so nothing is ever rescanned
+  • serving  → ``value(name)`` reads the two running totals: O(1) per card,
+               whatever the table size
+
+``metrics_engine()`` is the process-wide store (``st.cache_resource``) with
+the demo KPIs used across the topic pages; ``metric_card`` renders one.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable, Literal
+
+import streamlit as st
+
+from common.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+Aggregation = Literal["sum", "count", "mean", "distinct"]
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A KPI: ``agg`` of ``column`` in ``source`` over the last ``window``.
+
+    The delta compares against the same-length window ending ``compare`` earlier
+    (default: the window immediately before). ``window`` and ``compare`` must be
+    whole multiples of ``bucket``.
+    """
+
+    name: str
+    label: str
+    source: str
+    agg: Aggregation
+    column: str | None = None  # Not needed for "count"
+    window: str = "30D"
+    compare: str | None = None
+    bucket: str = "1D"
+    time_column: str = "ts"
+    format: str = "{:,.0f}"
+    delta: Literal["relative", "absolute"] = "relative"
+    delta_format: str = "{:+.1%}"
+
+    def _buckets(self, span: str) -> int:
+        count, rest = divmod(pd.Timedelta(span), pd.Timedelta(self.bucket))
+        if rest or count < 1:
+            raise ValueError(f"{self.name}: {span!r} is not a multiple of bucket {self.bucket!r}")
+        return int(count)
+
+
+@dataclass
+class MetricValue:
+    label: str
+    value: float | None
+    previous: float | None
+    text: str
+    delta_text: str | None
+
+    @property
+    def delta(self) -> float | None:
+        if self.value is None or self.previous is None:
+            return None
+        return self.value - self.previous
+
+
+class _Window:
+    """Running totals over buckets ``(latest - offset - size, latest - offset]``."""
+
+    __slots__ = ("offset", "size", "sum", "count", "values")
+
+    def __init__(self, offset: int, size: int, distinct: bool):
+        self.offset, self.size = offset, size
+        self.sum, self.count = 0.0, 0
+        self.values: Counter | None = Counter() if distinct else None
+
+    def covers(self, bucket: int, latest: int) -> bool:
+        return latest - self.offset - self.size < bucket <= latest - self.offset
+
+    def add(self, partial: Any, sign: int = 1) -> None:
+        if self.values is None:
+            self.sum += sign * partial[0]
+            self.count += sign * partial[1]
+            return
+        for value in partial:  # Distinct: how many buckets in the window hold each value
+            if sign > 0:
+                self.values[value] += 1
+            elif self.values[value] <= 1:
+                del self.values[value]
+            else:
+                self.values[value] -= 1
+
+
+class _State:
+    """Per-bucket partials and the two windows for one metric."""
+
+    def __init__(self, metric: Metric):
+        self.metric = metric
+        self.bucket_ns = pd.Timedelta(metric.bucket).value
+        size = metric._buckets(metric.window)
+        offset = metric._buckets(metric.compare) if metric.compare else size
+        distinct = metric.agg == "distinct"
+        self.current = _Window(0, size, distinct)
+        self.previous = _Window(offset, size, distinct)
+        self.horizon = offset + size  # Buckets at or before latest - horizon are dropped
+        self.buckets: dict[int, Any] = {}
+        self.latest: int | None = None
+
+    def _advance(self, latest: int) -> None:
+        if self.latest is not None and latest <= self.latest:
+            return
+        old, self.latest = self.latest, latest
+        for window in (self.current, self.previous):
+            if old is None or latest - old >= window.size:
+                window.sum, window.count = 0.0, 0
+                if window.values is not None:
+                    window.values.clear()
+                for b, partial in self.buckets.items():
+                    if window.covers(b, latest):
+                        window.add(partial)
+                continue
+            for b in range(old - window.offset - window.size + 1, latest - window.offset - window.size + 1):
+                if b in self.buckets:  # Slid out of the window
+                    window.add(self.buckets[b], -1)
+            for b in range(old - window.offset + 1, latest - window.offset + 1):
+                if b in self.buckets:  # Slid into the window
+                    window.add(self.buckets[b])
+        for b in [b for b in self.buckets if b <= latest - self.horizon]:
+            del self.buckets[b]
+
+    def ingest(self, times: np.ndarray, values: np.ndarray | None) -> None:
+        buckets = times // self.bucket_ns
+        self._advance(int(buckets.max()))
+        keep = buckets > self.latest - self.horizon  # Older rows can't reach either window
+        if values is not None and self.metric.agg != "distinct":
+            keep &= ~np.isnan(values)
+        codes, inverse = np.unique(buckets[keep], return_inverse=True)
+        if not len(codes):
+            return
+        if self.metric.agg == "distinct":
+            pairs = pd.DataFrame({"b": inverse, "v": values[keep]}).drop_duplicates()
+            partials = {codes[i]: set(group) for i, group in pairs.groupby("b")["v"]}
+        else:
+            sums = np.bincount(inverse, weights=values[keep]) if values is not None else np.zeros(len(codes))
+            counts = np.bincount(inverse, minlength=len(codes))
+            partials = {b: (float(s), int(c)) for b, s, c in zip(codes, sums, counts)}
+
+        for b, partial in partials.items():
+            b = int(b)
+            if self.metric.agg == "distinct":
+                held = self.buckets.setdefault(b, set())
+                partial = partial - held  # Only values new to this bucket change the windows
+                held |= partial
+            else:
+                s, c = self.buckets.get(b, (0.0, 0))
+                self.buckets[b] = (s + partial[0], c + partial[1])
+            for window in (self.current, self.previous):
+                if window.covers(b, self.latest):
+                    window.add(partial)
+
+    def result(self, window: _Window) -> float | None:
+        agg = self.metric.agg
+        if agg == "distinct":
+            return float(len(window.values))
+        if agg == "count":
+            return float(window.count)
+        if agg == "sum":
+            return window.sum
+        return window.sum / window.count if window.count else None
+
+
+class MetricsEngine:
+    """Declared metrics kept up to date incrementally; thread-safe.
+
+    Define metrics before feeding their source: rows ingested earlier are not
+    replayed into a metric defined later.
+    """
+
+    def __init__(self, metrics: Iterable[Metric] = ()):
+        self._states: dict[str, _State] = {}
+        self._sources: dict[str, list[_State]] = {}
+        self._rows: Counter = Counter()
+        self._lock = threading.Lock()
+        for metric in metrics:
+            self.define(metric)
+
+    def define(self, metric: Metric) -> None:
+        with self._lock:
+            existing = self._states.get(metric.name)
+            if existing is not None:
+                if existing.metric != metric:
+                    raise ValueError(f"metric {metric.name!r} is already defined differently")
+                return
+            state = self._states[metric.name] = _State(metric)
+            self._sources.setdefault(metric.source, []).append(state)
+
+    def ingest(self, source: str, rows: pd.DataFrame) -> int:
+        """Fold new ``rows`` of ``source`` into every metric defined on it."""
+        if rows.empty:
+            return 0
+        with self._lock:
+            for state in self._sources.get(source, []):
+                metric = state.metric
+                times = rows[metric.time_column].to_numpy("datetime64[ns]").view(np.int64)
+                values = None
+                if metric.column is not None:
+                    column = rows[metric.column]
+                    values = column.to_numpy() if metric.agg == "distinct" else column.to_numpy("float64", na_value=np.nan)
+                state.ingest(times, values)
+            self._rows[source] += len(rows)
+        return len(rows)
+
+    def rows(self, source: str) -> int:
+        """Rows ingested for ``source`` so far."""
+        return self._rows[source]
+
+    def value(self, name: str) -> MetricValue:
+        """Current value and delta of metric ``name``, from the running totals."""
+        with self._lock:
+            state = self._states[name]
+            if state.latest is None:
+                current = previous = None
+            else:
+                current, previous = state.result(state.current), state.result(state.previous)
+        metric = state.metric
+        text = metric.format.format(current) if current is not None else "—"
+        delta_text = None
+        if current is not None and previous is not None:
+            if metric.delta == "absolute":
+                delta_text = metric.delta_format.format(current - previous)
+            elif previous:
+                delta_text = metric.delta_format.format(current / previous - 1)
+        return MetricValue(metric.label, current, previous, text, delta_text)
+
+
+# ── demo store shared by the topic pages ────────────────────────────────────
+DEMO_METRICS = (
+    Metric("revenue", "Revenue", "orders", "sum", "amount", format="${:,.0f}"),
+    Metric("users", "Users", "orders", "distinct", "user_id"),
+    Metric("conversion", "Conversion", "orders", "mean", "converted",
+           format="{:.1%}", delta="absolute"),
+    Metric("retention", "Retention", "orders", "mean", "returning",
+           format="{:.0%}", delta="absolute"),
+    Metric("uptime", "Uptime", "health_checks", "mean", "ok",
+           format="{:.2%}", delta="absolute", delta_format="{:+.2%}"),
+)
+
+
+def demo_orders(rows: int, *, end: pd.Timestamp, days: int = 90, seed: int = 0) -> pd.DataFrame:
+    """Synthetic order events spread over the ``days`` before ``end`` (time-sorted)."""
+    rng = np.random.default_rng(seed)
+    span = pd.Timedelta(days=days).value
+    offsets = np.sort(rng.integers(0, span, rows))
+    # A slow upward drift in traffic and basket size keeps the deltas interesting.
+    growth = 1 + 0.3 * offsets / span
+    return pd.DataFrame({
+        "ts": pd.to_datetime(end.value - span + offsets),
+        "user_id": (rng.pareto(1.2, rows) * 2_000 * growth).astype(np.int64) % 200_000,
+        "amount": np.round(rng.gamma(2.0, 12.0, rows) * growth, 2),
+        "converted": rng.random(rows) < 0.045 * growth,
+        "returning": rng.random(rows) < 0.62 + 0.1 * offsets / span,
+    })
+
+
+def demo_health_checks(*, end: pd.Timestamp, days: int = 90, seed: int = 0) -> pd.DataFrame:
+    """One synthetic health check per minute, ~0.1% of them failing."""
+    ts = pd.date_range(end=end, periods=days * 1440, freq="min")
+    return pd.DataFrame({"ts": ts, "ok": np.random.default_rng(seed).random(len(ts)) > 0.001})
+
+
+@st.cache_resource(show_spinner="Aggregating KPIs…")
+def metrics_engine() -> MetricsEngine:
+    """Process-wide engine with ``DEMO_METRICS`` and 90 days of demo events."""
+    engine = MetricsEngine(DEMO_METRICS)
+    end = pd.Timestamp.now().floor("min")
+    engine.ingest("orders", demo_orders(1_000_000, end=end))
+    engine.ingest("health_checks", demo_health_checks(end=end))
+    return engine
+
+
+def metric_card(name: str, *, label: str | None = None, engine: MetricsEngine | None = None, container=st) -> None:
+    """``st.metric`` for metric ``name`` (``container`` may be a column)."""
+    value = (engine or metrics_engine()).value(name)
+    container.metric(label or value.label, value.text, value.delta_text)
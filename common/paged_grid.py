@@ -0,0 +1,284 @@
+"""
+Server-side paged table viewer
+===============================
+``st.dataframe(df)`` ships every cell to the browser. ``paged_dataframe``
+keeps the data in the Python process and sends one page at a time:
+
+  • ``PagedTable``   → an Arrow table, in memory (``from_pandas``) or
+                       memory-mapped from an Arrow IPC / Feather v2 file
+                       (``open``), so a 50M-row file costs no RAM to open
+  • sorting          → one argsort index per (column, direction), built once
+                       with ``pyarrow.compute`` and cached; for file-backed
+                       tables it is also saved as ``.npy`` next to the cache
+                       and memory-mapped back on the next run
+  • filtering        → a single ``column op value`` predicate evaluated in
+                       Arrow; matching row positions are cached per predicate
+                       (and per sort order)
+  • ``paged_table``  → one ``PagedTable`` per distinct frame *content*, shared
+                       by every session in a small process-wide LRU
+  • a page turn      → slicing the cached positions + ``take`` of at most
+                       ``page_size`` rows; the grid is a fragment, so turning
+                       a page reruns the grid and nothing else
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable
+
+import streamlit as st
+
+from common.cache_keys import content_hash, key_digest
+from common.lazy_import import lazy_import
+from common.tiered_cache import DEFAULT_CACHE_ROOT
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+
+FILTER_OPS = {
+    "=": "equal",
+    "≠": "not_equal",
+    "<": "less",
+    "≤": "less_equal",
+    ">": "greater",
+    "≥": "greater_equal",
+    "contains": "match_substring",
+}
+
+Filter = tuple[str, str, str]  # (column, op, raw value)
+
+
+class PagedTable:
+    """An Arrow table with cached sort indexes and filter results."""
+
+    def __init__(self, table: pa.Table, *, index_dir: Path | None = None, max_orders: int = 8):
+        self.table = table
+        self.num_rows = table.num_rows
+        self.columns = table.column_names
+        self.index_dir = index_dir
+        self.max_orders = max_orders
+        # Per-batch takes: Table.take on a multi-chunk table concatenates the
+        # chunks first, which makes every sorted page turn O(rows).
+        self._batches = table.to_batches()
+        self._batch_starts = np.cumsum([0] + [b.num_rows for b in self._batches])[:-1]
+        self._sort_indexes: dict[tuple[str, bool], np.ndarray] = {}
+        self._orders: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_pandas(cls, df: pd.DataFrame) -> "PagedTable":
+        return cls(pa.Table.from_pandas(df, preserve_index=False))
+
+    @classmethod
+    def open(cls, path: str | Path, *, index_dir: str | Path | None = None) -> "PagedTable":
+        """Memory-map an Arrow IPC (Feather v2) file.
+
+        Sort indexes are saved under ``index_dir`` (default: one folder per file
+        version in the repo cache) and reused by later processes.
+        """
+        path = Path(path)
+        table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        if index_dir is None:
+            stat = path.stat()
+            index_dir = DEFAULT_CACHE_ROOT / "sort_indexes" / f"{path.stem}-{stat.st_size}-{int(stat.st_mtime)}"
+        return cls(table, index_dir=Path(index_dir))
+
+    # ── indexes ─────────────────────────────────────────────────────────────
+    def sort_index(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Row positions in sorted order (nulls last), built once per column + direction."""
+        key = (column, ascending)
+        index = self._sort_indexes.get(key)
+        if index is not None:
+            return index
+        # Column names can hold "/" or other characters a file name can't.
+        name = f"{key_digest(column)}.{'asc' if ascending else 'desc'}.npy"
+        path = self.index_dir / name if self.index_dir else None
+        if path is not None and path.exists():
+            index = np.load(path, mmap_mode="r")
+        else:
+            index = pc.array_sort_indices(
+                self.table[column],
+                order="ascending" if ascending else "descending",
+                null_placement="at_end",
+            ).to_numpy()
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp.npy")
+                np.save(tmp, index)
+                tmp.replace(path)
+        self._sort_indexes[key] = index
+        return index
+
+    def _mask(self, where: Filter) -> np.ndarray:
+        column, op, raw = where
+        values = self.table[column]
+        if op == "contains":
+            if not pa.types.is_string(values.type) and not pa.types.is_large_string(values.type):
+                values = pc.cast(values, pa.string())
+            result = pc.match_substring(values, raw)
+        else:
+            scalar = float(raw) if (pa.types.is_integer(values.type) or pa.types.is_floating(values.type)) else raw
+            result = getattr(pc, FILTER_OPS[op])(values, scalar)
+        return pc.fill_null(result, False).to_numpy(zero_copy_only=False)
+
+    def positions(self, sort: tuple[str, bool] | None = None, where: Filter | None = None) -> np.ndarray | None:
+        """Row positions to show, or ``None`` for "all rows in file order"."""
+        if sort is None and where is None:
+            return None
+        key = (sort, where)
+        with self._lock:
+            order = self._orders.get(key)
+            if order is not None:
+                self._orders.move_to_end(key)
+                return order
+            index = self.sort_index(*sort) if sort is not None else None
+            if where is None:
+                order = index
+            else:
+                mask = self._mask(where)
+                order = np.flatnonzero(mask) if index is None else index[mask[index]]
+            self._orders[key] = order
+            if len(self._orders) > self.max_orders:
+                self._orders.popitem(last=False)
+            return order
+
+    # ── pages ───────────────────────────────────────────────────────────────
+    def page(
+        self,
+        number: int,
+        size: int,
+        *,
+        sort: tuple[str, bool] | None = None,
+        where: Filter | None = None,
+    ) -> tuple[pd.DataFrame, int]:
+        """Rows of page ``number`` (0-based) and the total row count after filtering.
+
+        The returned frame's index holds the rows' positions in the table.
+        """
+        order = self.positions(sort, where)
+        total = self.num_rows if order is None else len(order)
+        start = min(number * size, max(total - 1, 0))
+        stop = min(start + size, total)
+        if order is None:
+            rows = np.arange(start, stop)
+            df = self.table.slice(start, stop - start).to_pandas()
+        else:
+            rows = np.asarray(order[start:stop], dtype=np.int64)
+            df = self._take(rows)
+        df.index = pd.Index(rows, name="row")
+        return df, total
+
+    def _take(self, rows: np.ndarray) -> pd.DataFrame:
+        """Rows at these positions, in this order, reading only the batches they live in."""
+        batch_ids = np.searchsorted(self._batch_starts, rows, side="right") - 1
+        parts, placed = [], []
+        for b in np.unique(batch_ids):
+            in_batch = np.flatnonzero(batch_ids == b)
+            parts.append(self._batches[b].take(pa.array(rows[in_batch] - self._batch_starts[b])))
+            placed.append(in_batch)
+        if not parts:
+            return self.table.schema.empty_table().to_pandas()
+        df = pa.Table.from_batches(parts, schema=self.table.schema).to_pandas()
+        return df.iloc[np.argsort(np.concatenate(placed))].reset_index(drop=True)
+
+
+# Content key → PagedTable, shared by all sessions. A rerun that returns a new
+# DataFrame object over the same data (e.g. a cached frame's view) still finds
+# its table and sort indexes here.
+_TABLES: OrderedDict[Hashable, PagedTable] = OrderedDict()
+_TABLES_LOCK = threading.Lock()
+MAX_TABLES = 8
+
+
+def paged_table(df: pd.DataFrame, key: Hashable | None = None) -> PagedTable:
+    """The ``PagedTable`` for this frame's content, converted to Arrow once.
+
+    ``key`` names the content when the caller already has a key for it (a
+    cache key, a file hash); otherwise the frame is hashed.
+    """
+    key = ("content", content_hash(df)) if key is None else key
+    with _TABLES_LOCK:
+        table = _TABLES.get(key)
+        if table is not None:
+            _TABLES.move_to_end(key)
+            return table
+    table = PagedTable.from_pandas(df)
+    with _TABLES_LOCK:
+        table = _TABLES.setdefault(key, table)  # Another session may have built it meanwhile
+        _TABLES.move_to_end(key)
+        while len(_TABLES) > MAX_TABLES:
+            _TABLES.popitem(last=False)
+    return table
+
+
+def _step(page_key: str, delta: int, pages: int) -> None:
+    st.session_state[page_key] = min(max(st.session_state[page_key] + delta, 1), pages)
+
+
+@st.fragment
+def paged_dataframe(
+    data: pd.DataFrame | PagedTable,
+    *,
+    key: str,
+    page_size: int = 50,
+    filters: bool = True,
+    table_key: Hashable | None = None,
+) -> None:
+    """Sortable, filterable, paginated grid; only the visible page reaches the browser.
+
+    A DataFrame is looked up by content (or by ``table_key``) in the shared
+    table cache, so its Arrow copy and indexes survive reruns and are reused
+    by other sessions. For a large fixed frame, build the ``PagedTable`` once
+    with ``st.cache_resource`` and pass that instead.
+    """
+    table = data if isinstance(data, PagedTable) else paged_table(data, table_key)
+
+    sort_col, direction, *filter_cols = st.columns([2, 1, 2, 1, 2] if filters else [2, 1])
+    sort_by = sort_col.selectbox("Sort by", ["(file order)", *table.columns], key=f"{key}_sort")
+    descending = direction.toggle("Descending", key=f"{key}_desc", disabled=sort_by == "(file order)")
+    sort = None if sort_by == "(file order)" else (sort_by, not descending)
+
+    where = None
+    if filters:
+        f_col, f_op, f_value = filter_cols
+        column = f_col.selectbox("Filter column", ["(none)", *table.columns], key=f"{key}_fcol")
+        op = f_op.selectbox("Op", list(FILTER_OPS), key=f"{key}_fop", disabled=column == "(none)")
+        value = f_value.text_input("Value", key=f"{key}_fval", disabled=column == "(none)")
+        if column != "(none)" and value:
+            where = (column, op, value)
+
+    try:
+        order = table.positions(sort, where)
+    except (ValueError, pa.ArrowException) as exc:
+        st.warning(f"Can't apply that filter: {exc}")
+        where, order = None, table.positions(sort, None)
+    total = table.num_rows if order is None else len(order)
+    pages = max((total + page_size - 1) // page_size, 1)
+
+    # Page number lives in the number_input's state; ◀ / ▶ step it in callbacks.
+    # A new sort or filter starts again at page 1.
+    page_key, view_key = f"{key}_page", f"_{key}_view"
+    if st.session_state.get(view_key) != (sort, where):
+        st.session_state[view_key] = (sort, where)
+        st.session_state[page_key] = 1
+    st.session_state[page_key] = min(max(st.session_state.get(page_key, 1), 1), pages)
+
+    nav_prev, nav_page, nav_next, info = st.columns([1, 2, 1, 4])
+    nav_prev.button("◀", key=f"{key}_prev", on_click=_step, args=(page_key, -1, pages),
+                    disabled=st.session_state[page_key] <= 1, use_container_width=True)
+    nav_next.button("▶", key=f"{key}_next", on_click=_step, args=(page_key, 1, pages),
+                    disabled=st.session_state[page_key] >= pages, use_container_width=True)
+    page = nav_page.number_input("Page", 1, pages, key=page_key, label_visibility="collapsed")
+
+    df, total = table.page(page - 1, page_size, sort=sort, where=where)
+    first = (page - 1) * page_size + 1
+    info.caption(
+        (f"Rows {first:,}–{first + len(df) - 1:,} of {total:,}" if total else "No matching rows")
+        + (f" (filtered from {table.num_rows:,})" if where else "")
+        + f" · page {page:,} / {pages:,}"
+    )
+    st.dataframe(df, use_container_width=True)
@@ -0,0 +1,85 @@
+"""
+Plotly figure cache
+====================
+Building a figure with ``plotly.express`` takes tens of milliseconds (the
+first one in a process, with the template load, half a second), and the page
+paid that on every rerun and in every session. ``cached_figure`` builds each
+distinct figure once per process:
+
+  • key      → name + content hash of the input data + the styling args, so
+               identical figures are shared by every session and rerun
+  • entry    → the Figure and how long it took to build. Only construction is
+               saved: ``st.plotly_chart`` serializes the figure itself on every
+               call (a dict skips nothing either, Streamlit re-validates it into
+               a Figure first), so no JSON is kept
+  • template → a template name in the styling args is resolved to a
+               ``Template`` object once per process (``resolved_template``)
+               and handed to the builder
+
+Cached figures are shared: treat them as read-only. Set
+``LABS_FIGURE_CACHE=0`` to build every time (the benchmark baseline).
+Plotly is imported only when a figure is actually built.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from common.cache_keys import content_hash
+
+_FIGURES: OrderedDict[Hashable, "CachedFigure"] = OrderedDict()
+_LOCK = threading.Lock()
+_MAX_ENTRIES = 64
+
+
+@dataclass
+class CachedFigure:
+    figure: Any  # plotly.graph_objects.Figure
+    build_ms: float
+    hits: int = 0
+
+
+def figure_cache_enabled() -> bool:
+    return os.environ.get("LABS_FIGURE_CACHE", "1") != "0"
+
+
+@functools.lru_cache(maxsize=None)
+def resolved_template(name: str):
+    """``plotly.io.templates[name]``, loaded from disk and merged once per process."""
+    import plotly.io as pio
+
+    return pio.templates[name]
+
+
+def cached_figure(name: str, build: Callable[..., Any], data: Any = (), **style: Any) -> CachedFigure:
+    """The figure ``build(data, **style)``, built once per (name, data, style).
+
+    A string ``template`` in ``style`` reaches ``build`` as the resolved
+    template object.
+    """
+    key = (name, content_hash(data), content_hash(tuple(sorted(style.items()))))
+    if figure_cache_enabled():
+        with _LOCK:
+            entry = _FIGURES.get(key)
+            if entry is not None:
+                _FIGURES.move_to_end(key)
+                entry.hits += 1
+                return entry
+
+    if isinstance(style.get("template"), str):
+        style["template"] = resolved_template(style["template"])
+    start = time.perf_counter()
+    figure = build(data, **style)
+    entry = CachedFigure(figure, (time.perf_counter() - start) * 1e3)
+    if figure_cache_enabled():
+        with _LOCK:
+            _FIGURES[key] = entry
+            if len(_FIGURES) > _MAX_ENTRIES:
+                _FIGURES.popitem(last=False)
+    return entry
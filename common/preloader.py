@@ -0,0 +1,83 @@
+"""
+Background resource preloader
+==============================
+Starts slow ``@st.cache_resource`` factories (models, clients, …) on a worker
+thread the first time any session runs the script, so the page can render
+straight away and fill a placeholder once the resource is ready.
+
+  • ``preload(factory)``        → returns a ``Future``; every caller of the same
+                                  factory shares one in-flight load
+  • ``render_when_ready(...)``  → shows an ``st.empty`` placeholder polled by a
+                                  ``run_every`` fragment until the future
+                                  resolves, then renders into it; the script
+                                  thread never waits on the load
+
+Because the factory is still an ``@st.cache_resource`` function, a script that
+calls it directly while the preload is running simply waits on Streamlit's own
+per-key lock instead of building a second copy.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+import streamlit as st
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="preload")
+_FUTURES: dict[str, Future] = {}
+_LOCK = threading.Lock()
+
+
+def preload(factory: Callable[[], Any], name: str | None = None) -> Future:
+    """Start ``factory()`` in the background once per process and return its future.
+
+    Later calls with the same ``name`` (default: the factory's qualified name)
+    get the same future. A failed load is retried on the next call.
+    """
+    name = name or f"{factory.__module__}.{factory.__qualname__}"
+    with _LOCK:
+        future = _FUTURES.get(name)
+        if future is None or (future.done() and future.exception() is not None):
+            future = _FUTURES[name] = _EXECUTOR.submit(factory)
+        return future
+
+
+def is_ready(future: Future) -> bool:
+    return future.done() and future.exception() is None
+
+
+def render_when_ready(
+    future: Future,
+    render: Callable[[Any], None],
+    *,
+    message: str = "⏳ Loading in the background…",
+    placeholder: Any = None,
+    poll: float = 0.5,
+) -> None:
+    """Render ``render(result)`` into a placeholder without waiting for it.
+
+    While the future is pending, a fragment shows ``message`` and checks it
+    every ``poll`` seconds; once it resolves, the fragment triggers one full
+    rerun, which renders the result in place and stops the polling.
+    """
+    placeholder = placeholder if placeholder is not None else st.empty()
+    if future.done():
+        try:
+            result = future.result()
+        except Exception as exc:  # Surface the load error in place of the content.
+            placeholder.error(f"Failed to load: {exc}")
+            return
+        with placeholder.container():
+            render(result)
+        return
+
+    @st.fragment(run_every=poll)
+    def _wait() -> None:
+        if future.done():
+            st.rerun()
+        st.info(message)
+
+    with placeholder.container():
+        _wait()
@@ -0,0 +1,220 @@
+"""
+Per-rerun profiler
+===================
+Times what each script rerun actually costs, per section and per fragment:
+
+  • wall time     → ``time.perf_counter``
+  • CPU time      → ``time.thread_time`` (this session's script thread only)
+  • allocations   → ``tracemalloc`` net / peak bytes, opt-in per process with
+                    ``LABS_TRACEMALLOC=1`` (tracing slows every allocation in
+                    every session). The tracer is process-wide, so with
+                    concurrent sessions the figures are approximate: the net
+                    bytes include other threads' allocations, and the peak is
+                    reset only when no other section is being measured
+
+Samples live in a rolling window per section in ``st.session_state``, so each
+session gets its own histogram. ``render_panel()`` shows p50/p95 per section
+and offers the raw samples as JSON lines.
+
+    begin_rerun()                      # top of the script
+    with section("1 · Charts"): ...    # or @profiled("fragment") on a function
+    render_panel()                     # bottom of the script
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator
+
+import streamlit as st
+
+from common.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+_STATE_KEY = "_rerun_profiler"
+TOTAL = "⟳ whole rerun"
+
+_TRACED_SECTIONS = 0  # Sections measuring allocations right now, across sessions
+_TRACED_LOCK = threading.Lock()
+
+
+def allocation_tracing() -> bool:
+    """Whether ``tracemalloc`` runs in this process (``LABS_TRACEMALLOC=1``); starts it if asked."""
+    if os.environ.get("LABS_TRACEMALLOC", "0") == "1" and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return tracemalloc.is_tracing()
+
+
+@dataclass
+class Sample:
+    section: str
+    kind: str  # "section", "fragment" or "rerun"
+    rerun: int
+    ts: float
+    wall_ms: float
+    cpu_ms: float
+    alloc_kib: float | None = None
+    peak_kib: float | None = None
+
+
+class RerunProfiler:
+    """Rolling per-section samples for one session."""
+
+    def __init__(self, window: int = 200, track_allocations: bool = False):
+        self.window = window
+        self.track_allocations = track_allocations
+        self.samples: dict[str, deque[Sample]] = {}
+        self.rerun = 0
+        self._rerun_start: float | None = None
+        self._rerun_cpu: float = 0.0
+
+    def begin_rerun(self) -> None:
+        self.rerun += 1
+        self._rerun_start = time.perf_counter()
+        self._rerun_cpu = time.thread_time()
+
+    def end_rerun(self) -> None:
+        if self._rerun_start is None:
+            return
+        self._add(Sample(
+            TOTAL, "rerun", self.rerun, time.time(),
+            (time.perf_counter() - self._rerun_start) * 1e3,
+            (time.thread_time() - self._rerun_cpu) * 1e3,
+        ))
+        self._rerun_start = None
+
+    @contextmanager
+    def section(self, name: str, kind: str = "section") -> Iterator[None]:
+        global _TRACED_SECTIONS
+        tracing = self.track_allocations and tracemalloc.is_tracing()
+        if tracing:
+            with _TRACED_LOCK:
+                if not _TRACED_SECTIONS:  # Don't clobber the peak another section is measuring
+                    tracemalloc.reset_peak()
+                _TRACED_SECTIONS += 1
+                mem_before, _ = tracemalloc.get_traced_memory()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            sample = Sample(
+                name, kind, self.rerun, time.time(),
+                (time.perf_counter() - wall) * 1e3,
+                (time.thread_time() - cpu) * 1e3,
+            )
+            if tracing:
+                with _TRACED_LOCK:
+                    _TRACED_SECTIONS -= 1
+                mem_after, peak = tracemalloc.get_traced_memory()
+                sample.alloc_kib = (mem_after - mem_before) / 1024
+                sample.peak_kib = max(peak - mem_before, 0) / 1024
+            self._add(sample)
+
+    def _add(self, sample: Sample) -> None:
+        self.samples.setdefault(sample.section, deque(maxlen=self.window)).append(sample)
+
+    def summary(self) -> pd.DataFrame:
+        """p50/p95 per section over the rolling window."""
+        rows = []
+        for name, samples in self.samples.items():
+            wall = np.array([s.wall_ms for s in samples])
+            cpu = np.array([s.cpu_ms for s in samples])
+            peaks = [s.peak_kib for s in samples if s.peak_kib is not None]
+            rows.append({
+                "section": name,
+                "kind": samples[-1].kind,
+                "samples": len(samples),
+                "wall p50 ms": np.percentile(wall, 50),
+                "wall p95 ms": np.percentile(wall, 95),
+                "cpu p50 ms": np.percentile(cpu, 50),
+                "cpu p95 ms": np.percentile(cpu, 95),
+                "peak alloc p50 KiB": np.percentile(peaks, 50) if peaks else None,
+            })
+        return pd.DataFrame(rows)
+
+    def to_jsonl(self) -> str:
+        """All samples in the window, one JSON object per line, oldest first."""
+        ordered = sorted((s for d in self.samples.values() for s in d), key=lambda s: s.ts)
+        return "\n".join(json.dumps(asdict(s), ensure_ascii=False) for s in ordered) + "\n"
+
+
+def get_profiler() -> RerunProfiler:
+    """The current session's profiler (created on first use)."""
+    if _STATE_KEY not in st.session_state:
+        st.session_state[_STATE_KEY] = RerunProfiler()
+    return st.session_state[_STATE_KEY]
+
+
+def begin_rerun() -> None:
+    get_profiler().begin_rerun()
+
+
+@contextmanager
+def section(name: str) -> Iterator[None]:
+    """Profile the enclosed block as one section of the rerun."""
+    with get_profiler().section(name):
+        yield
+
+
+def profiled(name: str | None = None, kind: str = "fragment") -> Callable:
+    """Decorator form of :func:`section`; apply it *under* ``@st.fragment``
+    so fragment-only reruns are recorded too."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with get_profiler().section(label, kind=kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def render_panel(title: str = "⏱ Rerun profiler") -> None:
+    """Close the current rerun's sample and show the collapsible profiler panel."""
+    profiler = get_profiler()
+    profiler.end_rerun()
+    with st.expander(title):
+        tracing = allocation_tracing()
+        profiler.track_allocations = st.toggle(
+            "Track allocations (tracemalloc)",
+            value=profiler.track_allocations and tracing,
+            disabled=not tracing,
+            help="Records this session's net / peak allocations (approximate with concurrent "
+                 "sessions). Tracing is process-wide and slows every allocation, so it is "
+                 "switched on for the server with LABS_TRACEMALLOC=1, not from here.",
+            key=f"{_STATE_KEY}_alloc",
+        )
+        summary = profiler.summary()
+        if summary.empty:
+            st.caption("No samples yet.")
+            return
+        st.dataframe(summary.round(2), hide_index=True, use_container_width=True)
+
+        chosen = st.selectbox("Histogram for", summary["section"], key=f"{_STATE_KEY}_hist")
+        wall = np.array([s.wall_ms for s in profiler.samples[chosen]])
+        counts, edges = np.histogram(wall, bins=min(20, max(len(wall), 1)))
+        st.bar_chart(
+            pd.DataFrame({"reruns": counts}, index=[f"{e:.2f}" for e in edges[:-1]]),
+            x_label="wall ms", y_label="reruns",
+        )
+        st.download_button(
+            "⬇️ Export samples (JSON lines)",
+            data=profiler.to_jsonl(),
+            file_name="rerun_profile.jsonl",
+            mime="application/x-ndjson",
+            key=f"{_STATE_KEY}_export",
+        )
@@ -0,0 +1,147 @@
+"""
+Row-range (prefix) cache
+=========================
+For loaders whose result for ``n_rows`` is just the first ``n_rows`` rows of a
+longer result — paged APIs, ``LIMIT`` queries, generated data. Only the longest
+frame per :class:`~common.cache_keys.CacheKey` is kept (in a
+:class:`~common.tiered_cache.TieredCache`):
+
+  • request ≤ cached length → zero-copy ``iloc[:n]`` view, no loader call
+  • request > cached length → loader is asked for the missing tail only
+  • short tail              → the source has ended; its length is recorded
+                              and longer requests are served from the cache
+
+The loader signature is ``loader(start, stop, *args, **kwargs) -> DataFrame``,
+returning rows ``[start, stop)``. A default ``RangeIndex`` on the tail is
+shifted to ``start`` so the stitched frame keeps positional labels.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from common.cache_keys import CacheKey
+from common.lazy_import import lazy_import
+from common.tiered_cache import get_cache, shared_view
+
+pd = lazy_import("pandas")
+
+RangeLoader = Callable[..., "pd.DataFrame"]
+
+
+@dataclass
+class RangeStats:
+    """Counters reported by :meth:`RangeCache.stats`."""
+
+    prefix_hits: int = 0
+    extensions: int = 0
+    cold_misses: int = 0
+    rows_loaded: int = 0
+    exhausted: int = 0  # Keys whose source returned fewer rows than asked for
+
+
+class RangeCache:
+    """Serves ``n_rows`` requests from the longest cached prefix."""
+
+    def __init__(
+        self,
+        name: str,
+        loader: RangeLoader,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int | None = None,
+        ttl: float | None = None,
+        persist: bool = True,
+    ):
+        self.name = name
+        self.loader = loader
+        self.cache = get_cache(name, max_bytes=max_bytes, max_entries=max_entries, ttl=ttl, persist=persist)
+        self._stats = RangeStats()
+        self._ends: dict[CacheKey, int] = {}  # Total length of sources that ran out
+        self._locks: dict[CacheKey, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def load(self, n_rows: int, *args: Any, **kwargs: Any) -> pd.DataFrame:
+        """First ``n_rows`` rows as a read-only view over the cached frame."""
+        key = CacheKey.of(self.name, *args, **kwargs)
+        with self._key_lock(key):
+            df = self.cache.get(key)
+            have = 0 if df is None else len(df)
+            end = self._ends.get(key)
+            if have >= n_rows or (end is not None and have >= end):
+                self._stats.prefix_hits += 1
+            else:
+                tail = self.loader(have, n_rows, *args, **kwargs)
+                self._stats.rows_loaded += len(tail)
+                if len(tail) < n_rows - have:
+                    self._ends[key] = have + len(tail)
+                    self._stats.exhausted = len(self._ends)
+                if isinstance(tail.index, pd.RangeIndex):
+                    tail.index = pd.RangeIndex(have, have + len(tail))
+                if df is None:
+                    self._stats.cold_misses += 1
+                else:
+                    self._stats.extensions += 1
+                    tail = pd.concat([df, tail])
+                df = self.cache.put(key, tail)
+        return shared_view(df.iloc[:n_rows])
+
+    def stats(self) -> RangeStats:
+        return RangeStats(**vars(self._stats))
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self._ends.clear()
+        self._stats.exhausted = 0
+
+    def _key_lock(self, key: CacheKey) -> threading.Lock:
+        # One lock per key so concurrent sessions extend a frame only once,
+        # while unrelated keys still load in parallel.
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+
+_RANGE_CACHES: dict[str, RangeCache] = {}
+_RANGE_CACHES_LOCK = threading.Lock()
+
+
+def range_cached(
+    name: str | None = None,
+    *,
+    max_bytes: int = 64 * 1024 * 1024,
+    max_entries: int | None = None,
+    ttl: float | None = None,
+    persist: bool = True,
+) -> Callable[[RangeLoader], Callable[..., pd.DataFrame]]:
+    """Turn ``loader(start, stop, ...)`` into a cached ``fn(n_rows, ...)``.
+
+    Like a ``tiered_cache`` wrapper it exposes ``.clear()``, ``.stats()``
+    (:class:`~common.tiered_cache.CacheStats`) and ``.cache``; the prefix
+    counters are in ``.range_stats()`` (:class:`RangeStats`).
+    """
+
+    def decorator(loader: RangeLoader) -> Callable[..., pd.DataFrame]:
+        cache_name = name or f"{loader.__module__}.{loader.__qualname__}"
+        with _RANGE_CACHES_LOCK:
+            range_cache = _RANGE_CACHES.get(cache_name)
+            if range_cache is None:
+                range_cache = _RANGE_CACHES[cache_name] = RangeCache(
+                    cache_name, loader, max_bytes=max_bytes, max_entries=max_entries, ttl=ttl, persist=persist
+                )
+            # Streamlit redefines the loader on every rerun; use the latest one.
+            range_cache.loader = loader
+
+        @functools.wraps(loader)
+        def wrapper(n_rows: int, *args: Any, **kwargs: Any) -> pd.DataFrame:
+            return range_cache.load(n_rows, *args, **kwargs)
+
+        wrapper.cache = range_cache.cache
+        wrapper.clear = range_cache.clear
+        wrapper.stats = range_cache.cache.stats
+        wrapper.range_stats = range_cache.stats
+        return wrapper
+
+    return decorator
@@ -0,0 +1,215 @@
+"""
+Chat response cache
+====================
+Sits in front of the model call so repeated prompts ("hi", "what can you
+do?") don't each cost a generation:
+
+  • exact tier      → key = (model, hash of the conversation so far,
+                      normalized prompt); case, spacing and trailing
+                      sentence punctuation don't split the cache, while
+                      punctuation inside the prompt ("2+2" vs "2*2",
+                      "C" vs "C++") does
+  • similarity tier → optional; every cached prompt also gets a hashed
+                      character n-gram vector (one row of a fixed NumPy
+                      matrix), and a miss is answered by the most similar
+                      prompt with the same model and conversation if its
+                      cosine similarity reaches the threshold (per call, so
+                      each session can pick its own)
+  • eviction        → entries expire after ``ttl`` seconds; past
+                      ``max_entries`` the least recently used one goes
+
+Everything is computed locally (NumPy + stdlib), so it works offline.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+from common.cache_keys import content_hash
+from common.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+_TRAILING = re.compile(r"[\s.!?,;:…]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """Casefold, collapse whitespace, trim trailing ``.!?,;:…``: ``" Hi!! "`` → ``"hi"``.
+
+    Punctuation inside the prompt is kept; it can change the question.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _TRAILING.sub("", _WHITESPACE.sub(" ", text)).strip()
+
+
+def ngram_vector(text: str, dim: int = 1024, n: int = 3) -> np.ndarray:
+    """Unit-length bag of hashed character ``n``-grams (stable across processes)."""
+    padded = f" {text} "
+    vector = np.zeros(dim, dtype=np.float32)
+    for i in range(max(len(padded) - n + 1, 1)):
+        vector[zlib.crc32(padded[i:i + n].encode("utf-8")) % dim] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def conversation_hash(history: Sequence[Mapping[str, str]]) -> str:
+    """Hash of the turns a reply depends on (everything before the prompt).
+
+    System messages, such as a rolling summary that is updated in the
+    background, are left out so the same turns always give the same key.
+    """
+    return content_hash(tuple((m["role"], m["content"]) for m in history if m["role"] != "system"))
+
+
+@dataclass
+class ResponseCacheStats:
+    exact_hits: int
+    similar_hits: int
+    misses: int
+    entries: int
+    expired: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return (self.exact_hits + self.similar_hits) / lookups if lookups else 0.0
+
+
+@dataclass
+class CachedResponse:
+    text: str
+    tier: str  # "exact" or "similar"
+    similarity: float
+    prompt: str  # The (normalized) prompt the reply was generated for
+
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache of model replies with an optional similarity tier."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2048,
+        ttl: float = 3600.0,
+        threshold: float = 0.8,
+        top_k: int = 5,
+        dim: int = 1024,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.top_k = top_k
+        self.dim = dim
+        # key → (reply, stored_at, matrix row)
+        self._entries: OrderedDict[tuple[str, str, str], tuple[str, float, int]] = OrderedDict()
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._scopes = np.zeros(max_entries, dtype=np.int64)  # 0 = free row
+        self._row_keys: list[tuple[str, str, str] | None] = [None] * max_entries
+        self._free = list(range(max_entries - 1, -1, -1))
+        self._lock = threading.Lock()
+        self._exact_hits = self._similar_hits = self._misses = 0
+        self._expired = self._evictions = 0
+
+    @staticmethod
+    def _scope(model: str, context: str) -> int:
+        return zlib.crc32(f"{model}\x00{context}".encode("utf-8")) + 1  # 0 marks a free row
+
+    def get(
+        self, model: str, context: str, prompt: str, *, similar: bool = False, threshold: float | None = None
+    ) -> CachedResponse | None:
+        """The cached reply, exact or (with ``similar``) the nearest above ``threshold``.
+
+        ``threshold`` defaults to the cache-wide one given at construction.
+        """
+        normalized = normalize_prompt(prompt)
+        key = (model, context, normalized)
+        now = time.time()
+        with self._lock:
+            hit = self._live(key, now)
+            if hit is not None:
+                self._exact_hits += 1
+                return CachedResponse(hit, "exact", 1.0, normalized)
+            if similar and self._entries:
+                found = self._nearest(
+                    model, context, ngram_vector(normalized, self.dim), now,
+                    self.threshold if threshold is None else threshold,
+                )
+                if found is not None:
+                    self._similar_hits += 1
+                    return found
+            self._misses += 1
+            return None
+
+    def put(self, model: str, context: str, prompt: str, reply: str) -> None:
+        normalized = normalize_prompt(prompt)
+        key = (model, context, normalized)
+        vector = ngram_vector(normalized, self.dim)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if not self._free:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+            row = self._free.pop()
+            self._vectors[row] = vector
+            self._scopes[row] = self._scope(model, context)
+            self._row_keys[row] = key
+            self._entries[key] = (reply, time.time(), row)
+
+    def _live(self, key: tuple[str, str, str], now: float) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry[1] > self.ttl:
+            self._drop(key)
+            self._expired += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _nearest(
+        self, model: str, context: str, query: np.ndarray, now: float, threshold: float
+    ) -> CachedResponse | None:
+        candidates = np.flatnonzero(self._scopes == self._scope(model, context))
+        if candidates.size == 0:
+            return None
+        scores = self._vectors[candidates] @ query
+        k = min(self.top_k, candidates.size)
+        best = np.argpartition(scores, -k)[-k:]
+        for i in best[np.argsort(scores[best])[::-1]]:
+            if scores[i] < threshold:
+                break
+            key = self._row_keys[candidates[i]]
+            if key[:2] != (model, context):
+                continue  # crc32 scope collision: another model or conversation
+            reply = self._live(key, now)
+            if reply is not None:  # Skip candidates that just expired
+                return CachedResponse(reply, "similar", float(scores[i]), key[2])
+        return None
+
+    def _drop(self, key: tuple[str, str, str]) -> None:
+        _, _, row = self._entries.pop(key)
+        self._scopes[row] = 0
+        self._row_keys[row] = None
+        self._free.append(row)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def stats(self) -> ResponseCacheStats:
+        with self._lock:
+            return ResponseCacheStats(
+                self._exact_hits, self._similar_hits, self._misses,
+                len(self._entries), self._expired, self._evictions,
+            )
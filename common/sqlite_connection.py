@@ -0,0 +1,301 @@
+"""
+Pooled SQLite connection for ``st.connection()``
+=================================================
+  • ``SQLitePool``        → bounded pool of WAL-mode connections shared by all
+                            sessions (readers don't block the writer)
+  • ``SQLiteConnection``  → ``st.connection(name, type=SQLiteConnection, database=…)``
+                            with a per-query result cache (normalized SQL +
+                            params, TTL), streaming chunked reads and
+                            latency / pool / cache statistics
+
+Writes through ``execute`` / ``executemany`` bump a per-database version, so
+every ``SQLiteConnection`` on that file in this process stops serving results
+read before the write (including reads that were still running). Writes from
+other processes are only seen once the TTL expires.
+
+Each pooled connection keeps SQLite's prepared-statement cache
+(``cached_statements``), so repeated queries skip re-parsing SQL as well.
+"""
+
+from __future__ import annotations
+
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from streamlit.connections import BaseConnection
+
+from common.cache_keys import CacheKey
+from common.lazy_import import lazy_import
+from common.tiered_cache import freeze_frame, shared_view
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Database → writes so far through any SQLiteConnection in this process.
+_WRITE_VERSIONS: dict[str, int] = {}
+_WRITE_LOCK = threading.Lock()
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and drop a trailing ``;`` so formatting doesn't split the cache.
+
+    Whitespace inside string literals is left alone.
+    """
+    parts = re.split(r"('(?:[^']|'')*')", sql.strip().rstrip(";").strip())
+    return "".join(p if p.startswith("'") else _WHITESPACE.sub(" ", p) for p in parts)
+
+
+@dataclass
+class PoolStats:
+    size: int
+    open: int
+    in_use: int
+    peak_in_use: int
+    waits: int
+
+    @property
+    def utilization(self) -> float:
+        return self.in_use / self.size if self.size else 0.0
+
+
+class SQLitePool:
+    """A fixed-size pool of ``sqlite3`` connections opened lazily in WAL mode.
+
+    ``":memory:"`` gets a single connection: every connection to it opens a
+    separate, empty database.
+    """
+
+    def __init__(self, database: str | Path, *, size: int = 4, timeout: float = 10.0):
+        self.database = str(database)
+        self.size = 1 if self.database == ":memory:" else size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._open = 0
+        self._in_use = 0
+        self._peak = 0
+        self._waits = 0
+        self._lock = threading.Lock()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.timeout,
+            check_same_thread=False,  # Connections move between session threads.
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection; waits up to ``timeout`` when all are in use."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            opening = self._idle.empty() and self._open < self.size
+            if opening:
+                self._open += 1
+            elif self._idle.empty():
+                self._waits += 1
+        if opening:
+            try:
+                conn = self._open_connection()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+        else:
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No SQLite connection free after {self.timeout}s") from None
+        with self._lock:
+            self._in_use += 1
+            self._peak = max(self._peak, self._in_use)
+        return conn
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(self.size, self._open, self._in_use, self._peak, self._waits)
+
+    def close(self) -> None:
+        """Close idle connections; borrowed ones are closed when returned and reopened lazily."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._open -= 1
+
+
+@dataclass
+class QueryStats:
+    queries: int
+    cache_hits: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cache_hits / self.queries if self.queries else 0.0
+
+
+class SQLiteConnection(BaseConnection[SQLitePool]):
+    """``st.connection()`` connector for a local SQLite file.
+
+    Options come from ``st.connection(..., database=…, pool_size=…)`` or the
+    ``[connections.<name>]`` section of ``secrets.toml``.
+    """
+
+    def _connect(self, **kwargs: Any) -> SQLitePool:
+        options = {**self._secrets.to_dict(), **kwargs}
+        database = options.get("database", ":memory:")
+        if database != ":memory:":
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+        # Each in-memory database is private to its pool; a file is shared by path.
+        self._database_key = f":memory:{id(self)}" if database == ":memory:" else str(Path(database).resolve())
+        self._results: OrderedDict[CacheKey, tuple[pd.DataFrame, float, int]] = OrderedDict()
+        self._max_results = int(options.get("max_cached_results", 256))
+        self._latencies: deque[float] = deque(maxlen=2048)
+        self._queries = 0
+        self._cache_hits = 0
+        self._stats_lock = threading.Lock()
+        return SQLitePool(database, size=int(options.get("pool_size", 4)))
+
+    @property
+    def pool(self) -> SQLitePool:
+        return self._instance
+
+    # ── reads ───────────────────────────────────────────────────────────────
+    def query(
+        self, sql: str, params: Sequence[Any] = (), *, ttl: float | None = 60.0
+    ) -> pd.DataFrame:
+        """Run a ``SELECT`` and return a read-only DataFrame.
+
+        Results are cached per normalized SQL + params for ``ttl`` seconds
+        (``ttl=0`` bypasses the cache).
+        """
+        start = time.perf_counter()
+        key = CacheKey.of("sql", normalize_sql(sql), tuple(params))
+        version = self._write_version()
+        if ttl:
+            cached = self._cached_result(key, ttl, version)
+            if cached is not None:
+                self._record(time.perf_counter() - start, hit=True)
+                return shared_view(cached)
+        with self.pool.connection() as conn:
+            df = freeze_frame(pd.read_sql_query(sql, conn, params=tuple(params)))
+        if ttl:
+            with self._stats_lock:
+                if self._write_version() == version:  # Not if a write landed while reading
+                    self._results[key] = (df, time.time(), version)
+                    self._results.move_to_end(key)
+                    while len(self._results) > self._max_results:
+                        self._results.popitem(last=False)
+        self._record(time.perf_counter() - start, hit=False)
+        return shared_view(df)
+
+    def query_chunks(
+        self, sql: str, params: Sequence[Any] = (), *, chunksize: int = 50_000
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a large ``SELECT`` as DataFrames of at most ``chunksize`` rows.
+
+        Only one chunk is materialized at a time; nothing is cached. The pooled
+        connection is held until the iterator is exhausted or closed. The
+        recorded latency is the time spent fetching, not the caller's time
+        with each chunk.
+        """
+        fetching = 0.0
+        try:
+            with self.pool.connection() as conn:
+                start = time.perf_counter()
+                cursor = conn.execute(sql, tuple(params))
+                columns = [d[0] for d in cursor.description]
+                try:
+                    while rows := cursor.fetchmany(chunksize):
+                        chunk = pd.DataFrame.from_records(rows, columns=columns)
+                        fetching += time.perf_counter() - start
+                        yield chunk
+                        start = time.perf_counter()
+                    fetching += time.perf_counter() - start
+                finally:
+                    cursor.close()
+        finally:
+            self._record(fetching, hit=False)
+
+    # ── writes ──────────────────────────────────────────────────────────────
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run one write statement in its own transaction; returns the row count."""
+        with self.pool.connection() as conn, conn:
+            rowcount = conn.execute(sql, tuple(params)).rowcount
+        self._wrote()
+        return rowcount
+
+    def executemany(self, sql: str, rows: Sequence[Sequence[Any]]) -> int:
+        with self.pool.connection() as conn, conn:
+            rowcount = conn.executemany(sql, rows).rowcount
+        self._wrote()
+        return rowcount
+
+    # ── bookkeeping ─────────────────────────────────────────────────────────
+    def clear_cache(self) -> None:
+        with self._stats_lock:
+            self._results.clear()
+
+    def stats(self) -> QueryStats:
+        with self._stats_lock:
+            latencies = np.array(self._latencies) * 1e3
+            queries, hits = self._queries, self._cache_hits
+        if latencies.size:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        else:
+            p50 = p95 = p99 = 0.0
+        return QueryStats(queries, hits, float(p50), float(p95), float(p99))
+
+    def _write_version(self) -> int:
+        with _WRITE_LOCK:
+            return _WRITE_VERSIONS.get(self._database_key, 0)
+
+    def _wrote(self) -> None:
+        """Invalidate cached reads of this database, for every connection to it."""
+        with _WRITE_LOCK:
+            _WRITE_VERSIONS[self._database_key] = _WRITE_VERSIONS.get(self._database_key, 0) + 1
+        self.clear_cache()
+
+    def _cached_result(self, key: CacheKey, ttl: float, version: int) -> pd.DataFrame | None:
+        with self._stats_lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            df, stored_at, stored_version = entry
+            if stored_version != version or time.time() - stored_at > ttl:
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+            return df
+
+    def _record(self, seconds: float, *, hit: bool) -> None:
+        with self._stats_lock:
+            self._latencies.append(seconds)
+            self._queries += 1
+            self._cache_hits += hit
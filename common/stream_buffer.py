@@ -0,0 +1,115 @@
+"""
+Streaming series buffer
+========================
+For charts fed a few points per second. Rebuilding the whole series on every
+update ships all of it again; here the recent points live in a fixed-size
+ring, so each update is bounded by the window rather than by how long the
+feed has been running:
+
+  • ``SeriesRing``      → NumPy ring of (timestamp, values) rows with a running
+                          row counter; ``delta(cursor)`` returns the rows added
+                          since ``cursor``, or ``None`` once they've been
+                          overwritten (the reader must resync)
+  • ``live_line_chart`` → a ``run_every`` fragment: each run polls the feed
+                          once and draws the window once, then returns, so
+                          the rest of the page renders and stays interactive
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Sequence
+
+import streamlit as st
+
+from common.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+class SeriesRing:
+    """The last ``capacity`` rows of a multi-column time series."""
+
+    def __init__(self, columns: Sequence[str], capacity: int):
+        self.columns = list(columns)
+        self.capacity = capacity
+        self.total = 0  # Rows ever appended; doubles as the cursor readers hold
+        self._ts = np.empty(capacity, dtype="datetime64[ns]")
+        self._values = np.empty((capacity, len(self.columns)), dtype=np.float64)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def extend(self, ts: np.ndarray, values: np.ndarray) -> None:
+        """Append rows (``values`` shaped ``(len(ts), len(columns))``), oldest first."""
+        ts = np.asarray(ts, dtype="datetime64[ns]")
+        values = np.asarray(values, dtype=np.float64).reshape(len(ts), len(self.columns))
+        skipped = max(len(ts) - self.capacity, 0)  # Rows that would be overwritten in this same call
+        ts, values = ts[skipped:], values[skipped:]
+        with self._lock:
+            slots = (self.total + skipped + np.arange(len(ts))) % self.capacity
+            self._ts[slots] = ts
+            self._values[slots] = values
+            self.total += skipped + len(ts)
+
+    def last(self) -> tuple[np.datetime64, np.ndarray] | None:
+        """Timestamp and values of the newest row, if any."""
+        with self._lock:
+            if not self.total:
+                return None
+            slot = (self.total - 1) % self.capacity
+            return self._ts[slot], self._values[slot].copy()
+
+    def _rows(self, start: int) -> pd.DataFrame:
+        slots = np.arange(start, self.total) % self.capacity
+        return pd.DataFrame(self._values[slots], index=pd.DatetimeIndex(self._ts[slots]), columns=self.columns)
+
+    def frame(self) -> tuple[pd.DataFrame, int]:
+        """The whole window, oldest first, and the cursor it is current to."""
+        with self._lock:
+            return self._rows(self.total - len(self)), self.total
+
+    def delta(self, cursor: int) -> tuple[pd.DataFrame | None, int]:
+        """Rows added after ``cursor`` and the new cursor.
+
+        ``None`` means some of those rows were already overwritten; read
+        ``frame()`` instead.
+        """
+        with self._lock:
+            if cursor < self.total - self.capacity:
+                return None, self.total
+            return self._rows(cursor), self.total
+
+
+def live_line_chart(
+    ring: SeriesRing,
+    poll: Callable[[SeriesRing], None],
+    *,
+    key: str,
+    interval: float = 1.0,
+    live: bool = True,
+) -> None:
+    """Line chart of ``ring``, kept current by calling ``poll(ring)`` every ``interval`` s.
+
+    When ``live``, the chart is a fragment rerun every ``interval`` s; otherwise
+    it draws the window once. Per-session send counters are kept in
+    ``st.session_state[key]``.
+    """
+    stats = st.session_state.setdefault(key, {"draws": 0, "rows_sent": 0})
+
+    @st.fragment(run_every=interval if live else None)
+    def _tick() -> None:
+        if live:
+            poll(ring)
+        window, _ = ring.frame()
+        st.line_chart(window)
+        stats["draws"] += 1
+        stats["rows_sent"] += len(window)
+        st.caption(
+            f"{ring.total:,} points received · {stats['draws']:,} draws · "
+            f"{stats['rows_sent']:,} rows sent"
+        )
+
+    _tick()
@@ -0,0 +1,425 @@
+"""
+Persistent chat threads
+========================
+A SQLite (WAL) store of chat threads keyed by ``session_id``:
+
+  • ``append()`` is O(1) and never touches the disk on the caller's thread —
+    it assigns the next sequence number and queues the row
+  • a single writer thread **group-commits** whatever queued up in the last
+    ``commit_window`` seconds as one transaction (``synchronous=NORMAL``: no
+    fsync per message; a crash can lose at most the last window)
+  • a failed group commit is retried one thread at a time, so one bad
+    thread can't lose the others' messages. A thread whose own commit still
+    fails is rolled back to what is on disk; its next ``append`` raises
+    :class:`ThreadWriteError` so the caller can reload it
+  • threads are read back lazily, one page at a time (``load_page``), via
+    :class:`PersistentThread`, a drop-in for the chat apps' ``MessageStore``
+  • "Delete" only tombstones a thread; the writer purges tombstoned rows and
+    checkpoints the WAL in the background while it is idle. A deleted id is
+    never reused: appending to it raises :class:`ThreadDeletedError` (a stale
+    link or a second tab should start a new thread instead)
+  • every thread records the ``owner`` key of whoever started it;
+    ``recent_threads`` lists one owner's threads only, and ``can_access``
+    tells a page whether a thread id it was handed (e.g. from a link)
+    belongs to the visitor. ``delete`` with an owner refuses anyone else's
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Mapping, Sequence
+
+from common.message_store import ROLES, Message, MessageStore
+from common.sqlite_connection import SQLitePool
+
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+_log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id     TEXT PRIMARY KEY,
+    title         TEXT,
+    created_at    REAL NOT NULL,
+    updated_at    REAL NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    deleted       INTEGER NOT NULL DEFAULT 0,
+    owner         TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    thread_id  TEXT NOT NULL,
+    seq        INTEGER NOT NULL,
+    role       INTEGER NOT NULL,
+    content    TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, seq)
+) WITHOUT ROWID;
+"""
+# After the owner column exists (databases from before owners get it added).
+INDEXES = """
+DROP INDEX IF EXISTS threads_recent;
+CREATE INDEX IF NOT EXISTS threads_owner_recent ON threads (owner, deleted, updated_at DESC);
+"""
+
+
+class ThreadDeletedError(LookupError):
+    """The thread was deleted; its id can't take new messages."""
+
+
+class ThreadAccessError(PermissionError):
+    """The thread was started by another owner."""
+
+
+class ThreadWriteError(RuntimeError):
+    """Queued messages for this thread couldn't be committed and were dropped."""
+
+
+@dataclass
+class ThreadInfo:
+    thread_id: str
+    title: str | None
+    updated_at: float
+    message_count: int
+
+
+class ThreadStore:
+    """Append-only chat log with a group-committing writer thread."""
+
+    def __init__(
+        self,
+        database: str | Path,
+        *,
+        commit_window: float = 0.005,
+        max_batch: int = 1024,
+        compact_every: float = 60.0,
+        pool_size: int = 4,
+    ):
+        Path(database).parent.mkdir(parents=True, exist_ok=True)
+        self.pool = SQLitePool(database, size=pool_size)
+        self.commit_window = commit_window
+        self.max_batch = max_batch
+        self.compact_every = compact_every
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            if "owner" not in {row[1] for row in conn.execute("PRAGMA table_info(threads)")}:
+                conn.execute("ALTER TABLE threads ADD COLUMN owner TEXT")
+            conn.executescript(INDEXES)
+        self._queue: queue.SimpleQueue[tuple] = queue.SimpleQueue()
+        self._next_seq: dict[str, int] = {}
+        self._deleted: set[str] = set()  # Deleted in this process; older tombstones are read from disk
+        self._owners: dict[str, str | None] = {}  # Threads started in this process, committed or not
+        # A failed commit bumps the thread's epoch: rows queued under the old
+        # one carry sequence numbers the rollback hands out again, so they're dropped.
+        self._epochs: dict[str, int] = {}
+        self._failed: dict[str, BaseException] = {}
+        self._seq_lock = threading.Lock()
+        self._last_compaction = time.monotonic()
+        self.commits = 0
+        self.committed_rows = 0
+        self._writer = threading.Thread(target=self._run, name="thread-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush, 1.0)  # Commit the last window on a clean shutdown
+
+    # ── hot path ────────────────────────────────────────────────────────────
+    def append(self, thread_id: str, role: str, content: str, *, owner: str | None = None) -> int:
+        """Queue one message and return its sequence number within the thread.
+
+        ``owner`` is recorded when this message starts the thread. Raises
+        :class:`ThreadWriteError` (once) if earlier messages of the thread failed
+        to commit; the thread then continues from what is on disk.
+        """
+        code = _ROLE_CODES[role]
+        with self._seq_lock:
+            error = self._failed.pop(thread_id, None)
+            if error is not None:
+                raise ThreadWriteError(thread_id) from error
+            seq = self._next_seq.get(thread_id)
+            if seq is None:
+                if thread_id not in self._deleted:
+                    seq, deleted = self._committed(thread_id)
+                    if deleted:
+                        self._deleted.add(thread_id)
+                if thread_id in self._deleted:
+                    raise ThreadDeletedError(thread_id)
+                if seq == 0:
+                    self._owners.setdefault(thread_id, owner)
+            self._next_seq[thread_id] = seq + 1
+            epoch = self._epochs.get(thread_id, 0)
+        self._queue.put(("append", thread_id, seq, code, content, time.time(), owner, epoch))
+        return seq
+
+    def delete(self, thread_id: str, *, owner: str | None = None) -> None:
+        """Hide a thread (waits for the commit); its rows are purged by the next compaction.
+
+        With ``owner``, raises :class:`ThreadAccessError` for a thread started by
+        anyone else.
+        """
+        if owner is not None and not self.can_access(thread_id, owner):
+            raise ThreadAccessError(thread_id)
+        with self._seq_lock:
+            self._next_seq.pop(thread_id, None)
+            self._deleted.add(thread_id)
+        self._queue.put(("delete", thread_id))
+        self.flush()
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until everything queued so far is committed."""
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    # ── reads ───────────────────────────────────────────────────────────────
+    def message_count(self, thread_id: str) -> int:
+        """Messages appended so far, including queued ones not committed yet."""
+        with self._seq_lock:
+            seq = self._next_seq.get(thread_id)
+        return seq if seq is not None else self.committed_count(thread_id)
+
+    def committed_count(self, thread_id: str) -> int:
+        """Messages ``load_page`` can read (0 for a deleted or unknown thread)."""
+        count, deleted = self._committed(thread_id)
+        return 0 if deleted else count
+
+    def is_deleted(self, thread_id: str) -> bool:
+        with self._seq_lock:
+            if thread_id in self._deleted:
+                return True
+        return self._committed(thread_id)[1]
+
+    def load_page(self, thread_id: str, start: int, stop: int) -> MessageStore:
+        """Committed messages with ``start <= seq < stop``, oldest first."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT role, content FROM messages "
+                "WHERE thread_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (thread_id, start, stop),
+            ).fetchall()
+        return MessageStore({"role": ROLES[role], "content": content} for role, content in rows)
+
+    def recent_threads(self, owner: str, limit: int = 10) -> list[ThreadInfo]:
+        """``owner``'s most recently updated threads (committed ones)."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT thread_id, title, updated_at, message_count FROM threads "
+                "WHERE owner = ? AND deleted = 0 ORDER BY updated_at DESC LIMIT ?",
+                (owner, limit),
+            ).fetchall()
+        return [ThreadInfo(*row) for row in rows]
+
+    def can_access(self, thread_id: str, owner: str) -> bool:
+        """Whether ``owner`` may open ``thread_id``: its own thread, or an unused id.
+
+        Threads without a recorded owner (from before owners) belong to no one.
+        """
+        with self._seq_lock:
+            if thread_id in self._owners:
+                return self._owners[thread_id] == owner
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT owner FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+        return row is None or row[0] == owner
+
+    def _committed(self, thread_id: str) -> tuple[int, bool]:
+        """Committed message count and tombstone flag; ``(0, False)`` for an unknown thread."""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT message_count, deleted FROM threads WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+        return (row[0], bool(row[1])) if row else (0, False)
+
+    # ── writer thread ───────────────────────────────────────────────────────
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.compact_every / 4)]
+            except queue.Empty:
+                self._maybe_compact()
+                continue
+            deadline = time.perf_counter() + self.commit_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._commit(batch)
+            except Exception:
+                _log.warning("Thread store group commit failed (%d queued items); retrying per thread",
+                             len(batch), exc_info=True)
+                self._commit_per_thread(batch)
+            finally:
+                for item in batch:
+                    if item[0] == "flush":
+                        item[1].set()
+
+    def _commit_per_thread(self, batch: list[tuple]) -> None:
+        """Commit each thread's items on their own; roll back the threads that still fail."""
+        by_thread: dict[str, list[tuple]] = {}
+        for item in batch:
+            if item[0] in ("append", "delete"):
+                by_thread.setdefault(item[1], []).append(item)
+        for thread_id, items in by_thread.items():
+            try:
+                self._commit(items)
+            except Exception as exc:
+                _log.exception("Thread store commit failed for thread %s (%d items)", thread_id, len(items))
+                with self._seq_lock:
+                    # The next append re-reads the committed count, so the
+                    # in-memory sequence agrees with the database again.
+                    self._next_seq.pop(thread_id, None)
+                    self._epochs[thread_id] = self._epochs.get(thread_id, 0) + 1
+                    self._failed[thread_id] = exc
+
+    def _commit(self, batch: list[tuple]) -> None:
+        messages, thread_updates, deletes = [], {}, []
+        with self._seq_lock:
+            epochs = dict(self._epochs)
+        for item in batch:
+            if item[0] == "append":
+                _, thread_id, seq, code, content, ts, owner, epoch = item
+                if epoch != epochs.get(thread_id, 0):
+                    continue  # Queued before a failed commit of this thread rolled it back
+                messages.append((thread_id, seq, code, content, ts))
+                first, _, count, title, owner = thread_updates.get(thread_id, (ts, ts, 0, None, owner))
+                if title is None and code == _ROLE_CODES["user"]:
+                    title = content[:60]
+                thread_updates[thread_id] = (first, ts, count + 1, title, owner)
+            elif item[0] == "delete":
+                deletes.append((item[1],))
+        if not (messages or deletes):
+            return
+        with self.pool.connection() as conn, conn:
+            # Plain INSERT: a reused (thread_id, seq) fails the batch loudly
+            # instead of overwriting an older message.
+            conn.executemany(
+                "INSERT INTO messages (thread_id, seq, role, content, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                messages,
+            )
+            # message_count adds the rows inserted above; a committed append
+            # also makes the thread visible again rather than leaving its new
+            # messages to be purged with the tombstone.
+            conn.executemany(
+                """
+                INSERT INTO threads (thread_id, title, created_at, updated_at, message_count, owner)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (thread_id) DO UPDATE SET
+                    title = COALESCE(threads.title, excluded.title),
+                    updated_at = excluded.updated_at,
+                    message_count = threads.message_count + excluded.message_count,
+                    deleted = 0
+                """,
+                [(tid, title, first, last, count, owner)
+                 for tid, (first, last, count, title, owner) in thread_updates.items()],
+            )
+            conn.executemany("UPDATE threads SET deleted = 1 WHERE thread_id = ?", deletes)
+        self.commits += 1
+        self.committed_rows += len(messages)
+
+    def _maybe_compact(self) -> None:
+        if time.monotonic() - self._last_compaction < self.compact_every:
+            return
+        try:
+            self.compact()
+        except Exception:
+            _log.exception("Thread store compaction failed")
+            self._last_compaction = time.monotonic()
+
+    def compact(self, batch_size: int = 5000) -> int:
+        """Purge tombstoned threads in short transactions and truncate the WAL."""
+        purged = 0
+        with self.pool.connection() as conn:
+            doomed = conn.execute(
+                "SELECT thread_id, message_count FROM threads WHERE deleted = 1"
+            ).fetchall()
+            for thread_id, count in doomed:
+                # Primary-key ranges keep each transaction short, so appends
+                # queued meanwhile wait at most one batch.
+                for start in range(0, count + 1, batch_size):
+                    with conn:
+                        purged += conn.execute(
+                            "DELETE FROM messages WHERE thread_id = ? AND seq >= ? AND seq < ?",
+                            (thread_id, start, start + batch_size),
+                        ).rowcount
+                with conn:
+                    conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._last_compaction = time.monotonic()
+        return purged
+
+
+class PersistentThread(Sequence):
+    """A chat thread that reads like ``MessageStore`` but lives in a ``ThreadStore``.
+
+    The newest ``tail`` messages are loaded up front; older ones are fetched a
+    page at a time on first access (``render_history`` only touches what it
+    shows) and kept in a small LRU. ``append`` writes through to the store.
+    """
+
+    def __init__(
+        self,
+        store: ThreadStore,
+        thread_id: str,
+        *,
+        owner: str | None = None,
+        tail: int = 100,
+        page_size: int = 100,
+    ):
+        self.store = store
+        self.thread_id = thread_id
+        self.owner = owner
+        self.page_size = page_size
+        # Size the tail from committed rows, the ones load_page can return;
+        # commit this process's queued appends to the thread first.
+        total = store.committed_count(thread_id)
+        if store.message_count(thread_id) != total:
+            store.flush()
+            total = store.committed_count(thread_id)
+        self._offset = max(total - tail, 0)
+        self._tail = store.load_page(thread_id, self._offset, total) if total else MessageStore()
+        self._pages: OrderedDict[int, MessageStore] = OrderedDict()
+
+    def append(self, message: Mapping[str, str] | Message) -> None:
+        self.store.append(self.thread_id, message["role"], message["content"], owner=self.owner)
+        self._tail.append(message)
+
+    def __len__(self) -> int:
+        return self._offset + len(self._tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MessageStore(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        if index >= self._offset:
+            return self._tail[index - self._offset]
+        page_start = index // self.page_size * self.page_size
+        page = self._pages.get(page_start)
+        if page is None:
+            page = self.store.load_page(
+                self.thread_id, page_start, min(page_start + self.page_size, self._offset)
+            )
+            self._pages[page_start] = page
+            if len(self._pages) > 8:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_start)
+        return page[index - page_start]
+
+    def __iter__(self) -> Iterator[Message]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
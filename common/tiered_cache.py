@@ -0,0 +1,330 @@
+"""
+Two-tier DataFrame cache
+=========================
+  • Tier 1 → in-memory LRU, bounded by bytes (``DataFrame.memory_usage(deep=True)``)
+    and optionally by entry count
+  • Tier 2 → Parquet files on disk, written through on every store so a
+    restarted server serves warm frames without recomputing them; optionally
+    bounded by bytes too (``max_disk_bytes``, oldest files go first). With
+    ``write_behind=True`` the write happens on a background thread instead of
+    the caller's. A frame Parquet can't store (e.g. an object column of mixed
+    types) stays memory-only: the failure is logged and counted in
+    ``CacheStats.disk_write_errors``
+
+Instances are kept in a process-wide registry keyed by name, so redefining a
+decorated function on every Streamlit rerun keeps using the same cache.
+
+Stored frames are frozen (their NumPy buffers are marked read-only), so the
+decorator can hand out either a private copy, like ``@st.cache_data``, or, with
+``shared=True``, a shallow view over the cached buffers with no copy at all.
+Freezing copies the frame once; a caller that gives up its frame can skip the
+copy with ``put(key, df, copy=False)``.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+from common.cache_keys import CacheKey, key_digest
+from common.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+DEFAULT_CACHE_ROOT = Path(__file__).resolve().parents[1] / ".cache"
+
+_REGISTRY: dict[str, "TieredCache"] = {}
+_REGISTRY_LOCK = threading.Lock()
+_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tiered-cache-writer")
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Counters reported by :meth:`TieredCache.stats`."""
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+    disk_write_errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Deep in-memory size of a DataFrame, including object payloads."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def freeze_frame(df: pd.DataFrame, *, copy: bool = True) -> pd.DataFrame:
+    """Copy ``df`` once into column arrays that are flagged read-only.
+
+    Extension columns (Arrow, categorical, …) are kept as they are; Arrow
+    buffers are immutable already. ``copy=False`` reuses ``df``'s buffers:
+    only for a frame the caller won't modify afterwards.
+    """
+    columns = []
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        values = column.array
+        if isinstance(column.dtype, np.dtype):  # ``.array`` wraps these in a NumpyExtensionArray
+            values = np.array(column.to_numpy(), copy=copy)
+            values.flags.writeable = False
+        columns.append(values)
+    frozen = pd.DataFrame(dict(enumerate(columns)), index=df.index, copy=False)
+    frozen.columns = df.columns
+    return frozen
+
+
+def shared_view(df: pd.DataFrame) -> pd.DataFrame:
+    """A new DataFrame object over the same (read-only) buffers.
+
+    Adding or dropping columns only touches the view. Writing values either
+    raises (read-only buffer) or, under pandas Copy-on-Write, copies the column
+    first, so the cached frame is never modified.
+    """
+    return df.copy(deep=False)
+
+
+class TieredCache:
+    """Byte-bounded in-memory LRU that writes through to a Parquet store."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int | None = None,
+        ttl: float | None = None,
+        disk_dir: str | Path | None = None,
+        persist: bool = True,
+        max_disk_bytes: int | None = None,
+        write_behind: bool = False,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persist = persist
+        self.write_behind = write_behind
+        self.disk_dir = Path(disk_dir) if disk_dir else DEFAULT_CACHE_ROOT / name
+        # key → (frame, nbytes, stored_at)
+        self._memory: OrderedDict[Hashable, tuple[pd.DataFrame, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.RLock()
+        self._generation = 0  # Bumped by clear(), so queued writes from before it are dropped
+
+    # ── lookups ─────────────────────────────────────────────────────────────
+    def get(self, key: Hashable) -> pd.DataFrame | None:
+        """Return the cached frame for ``key`` or ``None`` on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                df, _, stored_at = entry
+                if not self._expired(stored_at, now):
+                    self._memory.move_to_end(key)
+                    self._stats.hits += 1
+                    return df
+                self._drop(key)
+
+            df = self._read_disk(key, now)
+            if df is None:
+                self._stats.misses += 1
+                return None
+            self._stats.disk_hits += 1
+            self._remember(key, df, now)
+            return df
+
+    def put(self, key: Hashable, df: pd.DataFrame, *, copy: bool = True) -> pd.DataFrame:
+        """Store a frozen copy of ``df`` in memory and (if enabled) on disk.
+
+        Returns the frozen frame that was stored. With ``copy=False`` it shares
+        ``df``'s buffers, so the caller must not modify ``df`` afterwards.
+        """
+        now = time.time()
+        with self._lock:
+            if key in self._memory:
+                self._drop(key)
+            df = freeze_frame(df, copy=copy)
+            self._remember(key, df, now)
+            if self.persist:
+                if self.write_behind:
+                    _WRITER.submit(self._write_disk, key, df, self._generation)
+                else:
+                    self._write_disk(key, df, self._generation)
+            return df
+
+    def clear(self) -> None:
+        """Empty both tiers. Counters are kept so the effect stays visible."""
+        with self._lock:
+            self._generation += 1
+            self._memory.clear()
+            self._bytes = 0
+            if self.disk_dir.exists():
+                shutil.rmtree(self.disk_dir, ignore_errors=True)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                disk_hits=self._stats.disk_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._memory),
+                bytes=self._bytes,
+                disk_write_errors=self._stats.disk_write_errors,
+            )
+
+    # ── memory tier ─────────────────────────────────────────────────────────
+    def _remember(self, key: Hashable, df: pd.DataFrame, stored_at: float) -> None:
+        nbytes = frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            return  # Too big for the memory tier; the disk tier still holds it.
+        self._memory[key] = (df, nbytes, stored_at)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes or (
+            self.max_entries is not None and len(self._memory) > self.max_entries
+        ):
+            oldest = next(iter(self._memory))
+            self._drop(oldest)
+            self._stats.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        _, nbytes, _ = self._memory.pop(key)
+        self._bytes -= nbytes
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    # ── disk tier ───────────────────────────────────────────────────────────
+    def _path(self, key: Hashable) -> Path:
+        return self.disk_dir / f"{key_digest(key)}.parquet"
+
+    def _read_disk(self, key: Hashable, now: float) -> pd.DataFrame | None:
+        if not self.persist:
+            return None
+        path = self._path(key)
+        try:
+            stored_at = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if self._expired(stored_at, now):
+            path.unlink(missing_ok=True)
+            self._stats.evictions += 1
+            return None
+        try:
+            return freeze_frame(pd.read_parquet(path))
+        except Exception:
+            # A half-written or incompatible file is just a miss.
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, key: Hashable, df: pd.DataFrame, generation: int) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp)
+            with self._lock:
+                if generation != self._generation:  # Cleared while this write was queued
+                    tmp.unlink(missing_ok=True)
+                    return
+                tmp.replace(path)  # Atomic, so readers never see a partial file.
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            with self._lock:
+                if generation != self._generation:
+                    return  # The directory went away with clear(); nothing was lost
+                self._stats.disk_write_errors += 1
+            _log.warning("%s: frame not written to the disk tier (%s)", self.name, path.name, exc_info=True)
+            return
+        if self.max_disk_bytes is not None:
+            with self._lock:
+                self._trim_disk(keep=path)
+
+    def _trim_disk(self, keep: Path) -> None:
+        """Delete the oldest Parquet files until the directory fits ``max_disk_bytes``."""
+        files = []
+        for path in self.disk_dir.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Removed by another process meanwhile
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            self._stats.evictions += 1
+
+
+def get_cache(name: str, **options: Any) -> TieredCache:
+    """Return the process-wide cache called ``name``, creating it on first use."""
+    with _REGISTRY_LOCK:
+        cache = _REGISTRY.get(name)
+        if cache is None:
+            cache = _REGISTRY[name] = TieredCache(name, **options)
+        return cache
+
+
+def tiered_cache(
+    name: str | None = None,
+    *,
+    max_bytes: int = 64 * 1024 * 1024,
+    max_entries: int | None = None,
+    ttl: float | None = None,
+    persist: bool = True,
+    shared: bool = False,
+) -> Callable[[Callable[..., pd.DataFrame]], Callable[..., pd.DataFrame]]:
+    """Decorator counterpart of ``@st.cache_data`` for DataFrame loaders.
+
+    Like ``st.cache_data``, every call returns a copy of the cached frame.
+    With ``shared=True`` it returns a read-only :func:`shared_view` instead,
+    skipping the copy. The wrapper exposes ``.clear()`` and ``.stats()``.
+    """
+
+    def decorator(func: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+        cache = get_cache(
+            name or f"{func.__module__}.{func.__qualname__}",
+            max_bytes=max_bytes,
+            max_entries=max_entries,
+            ttl=ttl,
+            persist=persist,
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> pd.DataFrame:
+            key = CacheKey.of(cache.name, *args, **kwargs)
+            df = cache.get(key)
+            if df is None:
+                df = cache.put(key, func(*args, **kwargs))
+            return shared_view(df) if shared else df.copy()
+
+        wrapper.cache = cache
+        wrapper.clear = cache.clear
+        wrapper.stats = cache.stats
+        return wrapper
+
+    return decorator